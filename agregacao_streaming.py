@@ -0,0 +1,164 @@
+"""Agregação fora da memória para os microdados completos da PNS.
+
+Uso:
+    python agregacao_streaming.py PNS_2019.txt                      # largura fixa do IBGE
+    python agregacao_streaming.py microdados.csv --tamanho-parte 200000
+    python agregacao_streaming.py microdados.parquet --edicao 2013 --armazem armazem_pns
+
+Os microdados completos têm mais de mil variáveis e não cabem em memória com um
+``pd.read_csv``. Aqui a fonte é lida em partes (``chunksize`` para CSV e
+largura fixa, lotes de row groups para Parquet), só com as colunas que os
+agregados usam; cada parte é padronizada, agregada e somada ao acumulado, como
+na ingestão de um delta. A memória usada depende do tamanho da parte, não do
+arquivo. O arquivo de largura fixa (``.txt``) é lido com as posições do
+Dicionário.xlsx.
+
+As mesmas partes, com as colunas da partição, substituem a partição da edição,
+que precisa existir no armazém, e os agregados (dos gráficos e o cubo do
+Panorama) substituem os dela, na mesma troca de manifesto: as páginas que leem
+os microdados da partição e as que leem os agregados (API, Panorama Nacional
+com o índice de idades montado do cubo) mostram as mesmas linhas. A versão do
+manifesto é incrementada para invalidar os caches.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from agregados import (COLUNAS_VIOLENCIA, agregados_da_particao, calcular_agregados, salvar_agregados,
+                       somar_agregados)
+from dados import (DIRETORIO_ARMAZEM, EDICAO_ATUAL, ler_manifesto, ler_posicoes, nomes_padronizados,
+                   normalizar_tipos, validar_esquema)
+from ingestao import ErroIngestao, gravar_parte, trava, trocar_manifesto
+
+try:
+    import resource
+except ImportError:  # Windows: o pico de memória não é informado
+    resource = None
+
+TAMANHO_PARTE = 100_000
+
+# Colunas (esquema comum) lidas da fonte: as usadas por algum agregado
+COLUNAS_AGREGADOS = [
+    'Unidade_Federacao', 'Sexo', 'Idade_Morador', 'Cor_Raca', 'Estado_Civil', 'Horas_Trabalho_Semana',
+    'Diagnostico_Depressao', 'Medicamento_Depressao', 'Uso_Medicamento_Depressao_Ultimas_Semanas',
+    'Frequencia_Visita_Medico_Depressao', 'Motivo_Nao_Visitar_Medico_Depressao', *COLUNAS_VIOLENCIA,
+]
+
+
+def _colunas_da_fonte(colunas_fonte, edicao, colunas=COLUNAS_AGREGADOS):
+    """{coluna na fonte: nome no esquema comum} só para as colunas necessárias."""
+    nomes = nomes_padronizados(colunas_fonte, edicao)
+    return {col: nomes.get(col, col) for col in colunas_fonte if nomes.get(col, col) in colunas}
+
+
+def ler_partes(caminho, edicao=EDICAO_ATUAL, tamanho_parte=TAMANHO_PARTE, colunas=COLUNAS_AGREGADOS):
+    """Gera DataFrames de até ``tamanho_parte`` linhas, já no esquema comum e com tipos normalizados."""
+    caminho = Path(caminho)
+    if caminho.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(caminho)
+        nomes = _colunas_da_fonte(arquivo.schema_arrow.names, edicao, colunas)
+        lotes = (lote.to_pandas() for lote in arquivo.iter_batches(tamanho_parte, columns=list(nomes)))
+    elif caminho.suffix == '.csv':
+        cabecalho = pd.read_csv(caminho, sep=';', encoding='utf-8', nrows=0).columns
+        nomes = _colunas_da_fonte(cabecalho, edicao, colunas)
+        lotes = pd.read_csv(caminho, sep=';', encoding='utf-8', usecols=list(nomes), chunksize=tamanho_parte)
+    else:
+        # Largura fixa: posição inicial (a partir de 1) e tamanho de cada código no dicionário
+        posicoes = ler_posicoes()
+        nomes = _colunas_da_fonte(list(posicoes), edicao, colunas)
+        especificacoes = [(posicoes[codigo][0] - 1, posicoes[codigo][0] - 1 + posicoes[codigo][1])
+                          for codigo in nomes]
+        lotes = pd.read_fwf(caminho, colspecs=especificacoes, names=list(nomes), header=None,
+                            chunksize=tamanho_parte)
+    for lote in lotes:
+        yield normalizar_tipos(lote.rename(columns=nomes))
+
+
+def agregar(caminho, edicao=EDICAO_ATUAL, tamanho_parte=TAMANHO_PARTE):
+    """Soma os agregados de todas as partes; retorna (agregados, linhas lidas)."""
+    agregados, linhas = {}, 0
+    for parte in ler_partes(caminho, edicao, tamanho_parte):
+        agregados = somar_agregados(agregados, calcular_agregados(parte))
+        linhas += len(parte)
+    return agregados, linhas
+
+
+def ingerir(caminho, edicao=EDICAO_ATUAL, diretorio=DIRETORIO_ARMAZEM, tamanho_parte=TAMANHO_PARTE):
+    """Substitui a partição da edição pelas linhas de ``caminho`` e os agregados calculados nelas.
+
+    Cada parte lida é validada, gravada como parte Parquet da partição (só com as colunas
+    da partição) e somada aos agregados; a troca do manifesto publica as duas coisas na
+    mesma versão, de modo que as páginas que leem a partição (``load_data``) e as que leem
+    o cubo mostram as mesmas linhas. Exige o armazém com a edição inicializada: é a versão
+    do manifesto que invalida os caches dos dashboards e da API. Retorna (agregados, linhas).
+    """
+    diretorio = Path(diretorio)
+    with trava(diretorio):
+        manifesto = ler_manifesto(diretorio)
+        particao = (manifesto or {}).get('edicoes', {}).get(str(edicao))
+        if particao is None:
+            raise ErroIngestao(f"Edição {edicao} não inicializada em {diretorio}. "
+                               "Use 'python ingestao.py inicializar' primeiro.")
+        colunas = particao['colunas']
+        versao = manifesto['versao'] + 1
+        agregados, linhas, partes = {}, 0, []
+        try:
+            lidas = list(dict.fromkeys([*colunas, *COLUNAS_AGREGADOS]))
+            for numero, parte in enumerate(ler_partes(caminho, edicao, tamanho_parte, lidas)):
+                erros = validar_esquema(parte[[col for col in colunas if col in parte.columns]], colunas)
+                if erros:
+                    raise ErroIngestao(f"Linhas {linhas} a {linhas + len(parte) - 1}:\n" + "\n".join(erros))
+                partes.append(gravar_parte(parte[colunas], diretorio, edicao, versao, numero))
+                agregados = somar_agregados(agregados, calcular_agregados(parte))
+                linhas += len(parte)
+        except BaseException:
+            # Partes ainda não registradas no manifesto: ninguém as lê
+            for nome in partes:
+                (diretorio / nome).unlink(missing_ok=True)
+            raise
+        trocar_manifesto({
+            **manifesto,
+            'versao': versao,
+            'edicoes': {
+                **manifesto['edicoes'],
+                str(edicao): {**particao, 'partes': partes, 'linhas': linhas,
+                              'agregados': salvar_agregados(agregados, edicao, diretorio, versao)},
+            },
+        }, diretorio, partes=particao['partes'], agregados=agregados_da_particao(particao, edicao))
+    return agregados, linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('arquivo', help='Microdados em CSV (;), Parquet ou largura fixa (.txt)')
+    parser.add_argument('--edicao', default=EDICAO_ATUAL, type=int)
+    parser.add_argument('--tamanho-parte', default=TAMANHO_PARTE, type=int)
+    parser.add_argument('--armazem', default=DIRETORIO_ARMAZEM, type=Path)
+    args = parser.parse_args()
+
+    if str(args.edicao) not in (ler_manifesto(args.armazem) or {}).get('edicoes', {}):
+        print(f"Edição {args.edicao} não inicializada em {args.armazem}. "
+              "Use 'python ingestao.py inicializar' primeiro.", file=sys.stderr)
+        sys.exit(1)
+
+    inicio = time.perf_counter()
+    try:
+        agregados, linhas = ingerir(args.arquivo, args.edicao, args.armazem, args.tamanho_parte)
+    except ErroIngestao as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    pico = (f" (pico de memória {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB)"
+            if resource else "")
+    print(f"{linhas} linhas ingeridas e agregadas na edição {args.edicao} "
+          f"em {time.perf_counter() - inicio:.1f} s{pico}")
+    for nome, tabela in sorted(agregados.items()):
+        print(f"  {nome:<22}{len(tabela):>6} linhas")
+
+
+if __name__ == '__main__':
+    main()
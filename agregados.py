@@ -0,0 +1,196 @@
+"""Agregados pré-calculados por trás dos gráficos dos dashboards.
+
+Cada agregado é uma tabela de contagens (dimensões codificadas + ``Quantidade``)
+calculada sobre os dados codificados. Como contagens são aditivas, a ingestão de
+um arquivo delta só precisa calcular os agregados do delta e somá-los aos já
+gravados, sem reler o conjunto completo. Os agregados são gravados por edição da
+pesquisa, e comparações entre edições leem apenas as tabelas de contagem.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from dados import (BINS_HORAS, DIRETORIO_ARMAZEM, EDICAO_ATUAL, LABELS_HORAS, carregar_dataset, ler_manifesto,
+                   versao_dados)
+
+COLUNAS_VIOLENCIA = ['Violencia_Verbal', 'Violencia_Fisica_Tapa', 'Violencia_Psicologica']
+
+# Dimensões do cubo do Panorama Nacional: as do índice de idades (indice_idade.py), de todos os
+# entrevistados, para que o Panorama seja servido só pelos agregados
+DIMENSOES_CUBO = ['Idade_Morador', 'Sexo', 'Unidade_Federacao', 'Cor_Raca', 'Diagnostico_Depressao']
+
+
+def _contar(df, colunas):
+    if any(col not in df.columns for col in colunas):
+        return None
+    return df.groupby(colunas, observed=True).size().rename('Quantidade').reset_index()
+
+
+def _depressao(df):
+    return df[df['Diagnostico_Depressao'] == 1]
+
+
+def _faixa_horas(df):
+    if 'Horas_Trabalho_Semana' not in df.columns:
+        return None
+    faixas = pd.cut(df['Horas_Trabalho_Semana'], bins=BINS_HORAS, labels=LABELS_HORAS, right=False)
+    base = pd.DataFrame({
+        'Faixa_Horas_Trabalho': faixas.astype(object),
+        'Diagnostico_Depressao': df['Diagnostico_Depressao'],
+    })
+    return _contar(base, ['Faixa_Horas_Trabalho', 'Diagnostico_Depressao'])
+
+
+def _violencia(df):
+    tabelas = []
+    for col in COLUNAS_VIOLENCIA:
+        contagem = _contar(df, [col, 'Diagnostico_Depressao'])
+        if contagem is not None:
+            tabelas.append(contagem.rename(columns={col: 'Exposicao'}).assign(Tipo=col))
+    if not tabelas:
+        return None
+    return pd.concat(tabelas, ignore_index=True)[['Tipo', 'Exposicao', 'Diagnostico_Depressao', 'Quantidade']]
+
+
+def _cubo_panorama(df):
+    if any(col not in df.columns for col in DIMENSOES_CUBO):
+        return None
+    return df.groupby(DIMENSOES_CUBO, dropna=False).size().rename('Quantidade').reset_index()
+
+
+# Nome do agregado -> função que o calcula a partir dos dados codificados
+AGREGADOS = {
+    'totais': lambda df: _contar(df, ['Diagnostico_Depressao']),
+    'contagem_estados': lambda df: _contar(_depressao(df), ['Unidade_Federacao']),
+    'depressao_por_sexo': lambda df: _contar(_depressao(df), ['Sexo']),
+    'depressao_por_raca': lambda df: _contar(_depressao(df), ['Cor_Raca']),
+    'estado_civil': lambda df: _contar(_depressao(df), ['Estado_Civil']),
+    'medicamento': lambda df: _contar(_depressao(df), ['Medicamento_Depressao']),
+    'uso_recente': lambda df: _contar(_depressao(df), ['Uso_Medicamento_Depressao_Ultimas_Semanas']),
+    'visitas': lambda df: _contar(_depressao(df), ['Frequencia_Visita_Medico_Depressao']),
+    'motivos': lambda df: _contar(_depressao(df), ['Motivo_Nao_Visitar_Medico_Depressao']),
+    'faixa_horas': _faixa_horas,
+    'violencia': _violencia,
+    'cubo_panorama': _cubo_panorama,
+}
+
+
+def calcular_agregados(df):
+    """Calcula todos os agregados disponíveis para as colunas presentes em ``df``."""
+    resultado = {}
+    for nome, funcao in AGREGADOS.items():
+        tabela = funcao(df)
+        if tabela is not None:
+            resultado[nome] = tabela
+    return resultado
+
+
+def somar(tabela_a, tabela_b):
+    """Soma duas tabelas de contagem com as mesmas dimensões."""
+    if tabela_a is None:
+        return tabela_b
+    if tabela_b is None:
+        return tabela_a
+    dimensoes = [col for col in tabela_a.columns if col != 'Quantidade']
+    return (pd.concat([tabela_a, tabela_b], ignore_index=True)
+            .groupby(dimensoes, dropna=False).Quantidade.sum().reset_index())
+
+
+def somar_agregados(agregados, delta):
+    """Incorpora os agregados de um delta aos agregados existentes."""
+    nomes = set(agregados) | set(delta)
+    return {nome: somar(agregados.get(nome), delta.get(nome)) for nome in nomes}
+
+
+def agregados_da_particao(particao, edicao):
+    """Caminho relativo dos agregados registrado na partição do manifesto."""
+    # Armazéns anteriores aos diretórios por versão gravavam direto em agregados/edicao=<ano>
+    return particao.get('agregados', f"agregados/edicao={edicao}")
+
+
+def _diretorio_agregados(edicao, diretorio=None):
+    """Diretório registrado no manifesto; sem manifesto ou sem a edição, não há agregados gravados."""
+    particao = ((ler_manifesto(diretorio) or {}).get('edicoes') or {}).get(str(edicao))
+    if particao is None:
+        return None
+    return Path(diretorio or DIRETORIO_ARMAZEM) / agregados_da_particao(particao, edicao)
+
+
+def salvar_agregados(agregados, edicao=EDICAO_ATUAL, diretorio=None, versao=None):
+    """Grava os agregados num diretório novo da ``versao`` do manifesto; retorna o caminho relativo.
+
+    O diretório só passa a ser lido quando o manifesto que o registra é gravado, de modo
+    que leitores nunca veem agregados de versões diferentes misturados.
+    """
+    nome = f"agregados/edicao={edicao}" + (f"/v{versao:05d}" if versao is not None else "")
+    destino = Path(diretorio or DIRETORIO_ARMAZEM) / nome
+    destino.mkdir(parents=True, exist_ok=True)
+    for nome_tabela, tabela in agregados.items():
+        temporario = destino / f"{nome_tabela}.parquet.tmp"
+        tabela.to_parquet(temporario, index=False)
+        temporario.replace(destino / f"{nome_tabela}.parquet")
+    return nome
+
+
+def remover_agregados(nome, diretorio=None):
+    """Apaga as tabelas de um diretório de agregados que o manifesto deixou de registrar."""
+    origem = Path(diretorio or DIRETORIO_ARMAZEM) / nome
+    for arquivo in origem.glob('*.parquet'):
+        arquivo.unlink(missing_ok=True)
+    try:
+        origem.rmdir()
+    except OSError:
+        pass  # ainda contém diretórios de outras versões
+
+
+def carregar_agregados(nomes=None, edicao=EDICAO_ATUAL, diretorio=None):
+    """Lê os agregados gravados de uma edição (dicionário vazio se não houver)."""
+    origem = _diretorio_agregados(edicao, diretorio)
+    if origem is None or not origem.exists():
+        return {}
+    arquivos = {arquivo.name[:-len('.parquet')]: arquivo for arquivo in origem.glob('*.parquet')}
+    if nomes is not None:
+        arquivos = {nome: arquivo for nome, arquivo in arquivos.items() if nome in nomes}
+    return {nome: pd.read_parquet(arquivo) for nome, arquivo in arquivos.items()}
+
+
+@lru_cache(maxsize=8)
+def _agregados_da_versao(versao, edicao, diretorio):
+    gravados = carregar_agregados(edicao=edicao, diretorio=diretorio)
+    if gravados:
+        return gravados
+    return calcular_agregados(carregar_dataset(edicoes=(edicao,), diretorio=diretorio))
+
+
+def obter_agregados(edicao=EDICAO_ATUAL, diretorio=None):
+    """Agregados de uma edição, do armazém ou (sem armazém) calculados do CSV.
+
+    O resultado fica em memória com a versão dos dados como chave; as tabelas
+    devolvidas são compartilhadas e não devem ser alteradas.
+    """
+    return _agregados_da_versao(versao_dados(diretorio), edicao, diretorio)
+
+
+def comparar_edicoes(nome, edicoes, diretorio=None):
+    """Empilha um agregado de várias edições (coluna ``Edicao``), lendo só esse agregado."""
+    tabelas = []
+    for edicao in edicoes:
+        tabela = carregar_agregados([nome], edicao, diretorio).get(nome)
+        if tabela is not None:
+            tabelas.append(tabela.assign(Edicao=edicao))
+    if not tabelas:
+        return None
+    return pd.concat(tabelas, ignore_index=True)
+
+
+def prevalencia_por_edicao(edicoes, diretorio=None):
+    """Prevalência de diagnóstico de depressão (%) por edição, a partir de ``totais``."""
+    totais = comparar_edicoes('totais', edicoes, diretorio)
+    if totais is None:
+        return {}
+    validos = totais[totais['Diagnostico_Depressao'].isin([1, 2])]
+    por_edicao = validos.pivot_table(index='Edicao', columns='Diagnostico_Depressao',
+                                     values='Quantidade', aggfunc='sum', fill_value=0)
+    prevalencia = por_edicao[1] / por_edicao.sum(axis=1) * 100
+    return {int(edicao): float(valor) for edicao, valor in prevalencia.items()}
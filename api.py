@@ -0,0 +1,203 @@
+"""API HTTP (ASGI) com os agregados por trás dos gráficos dos dashboards.
+
+Uso:
+    uvicorn api:app --port 8000
+    python api.py --porta 8000
+
+Rotas:
+    GET /agregados                          nomes disponíveis e versão dos dados
+    GET /agregados/{nome}?edicao=2019       tabela de contagens em JSON
+    GET /agregados/{nome}?formato=arrow     mesma tabela em Arrow IPC (stream)
+    POST /prever                            probabilidade de depressão (ver servico_predicao.py)
+    GET /saude                              processo no ar (liveness)
+    GET /pronto                             200 só depois do aquecimento (readiness)
+    GET /metricas                           tempos por seção no formato do Prometheus
+
+As tabelas são as mesmas de ``agregados.py`` (dimensões codificadas +
+``Quantidade``) e vêm do mesmo cache por versão usado pelos dashboards. Cada
+resposta leva um ETag derivado da versão dos dados; requisições com
+``If-None-Match`` igual (forte ou ``W/``) recebem 304 sem corpo. Edições e
+agregados inexistentes dão 404 e parâmetros inválidos, 400.
+"""
+import argparse
+import json
+from contextlib import asynccontextmanager
+
+import pyarrow as pa
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import aquecimento
+from agregados import obter_agregados
+from avaliacao import carregar_modelo
+from dados import EDICAO_ATUAL, edicoes_disponiveis, versao_dados
+from instrumentacao import exportar_prometheus, secao
+from servico_predicao import RespostasInvalidas, ServicoPredicao
+
+TIPO_ARROW = 'application/vnd.apache.arrow.stream'
+TIPO_JSON = 'application/json'
+
+
+def _etag(*partes):
+    return '"' + '-'.join(str(parte) for parte in partes) + '"'
+
+
+def _nao_modificado(request, etag):
+    # If-None-Match usa comparação fraca: W/"x" equivale a "x"
+    enviados = [valor.strip() for valor in request.headers.get('if-none-match', '').split(',')]
+    return '*' in enviados or etag in [valor[2:] if valor.startswith('W/') else valor for valor in enviados]
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def _edicao(request):
+    valor = request.query_params.get('edicao', EDICAO_ATUAL)
+    try:
+        return int(valor)
+    except ValueError:
+        raise ParametroInvalido(f"Edição inválida: {valor!r} (esperado o ano, como {EDICAO_ATUAL})")
+
+
+def _formato(request):
+    formato = request.query_params.get('formato')
+    if formato:
+        return formato
+    return 'arrow' if TIPO_ARROW in request.headers.get('accept', '') else 'json'
+
+
+def para_arrow(tabela):
+    """Serializa um DataFrame em Arrow IPC (formato stream)."""
+    tabela_arrow = pa.Table.from_pandas(tabela, preserve_index=False)
+    destino = pa.BufferOutputStream()
+    with pa.ipc.new_stream(destino, tabela_arrow.schema) as escritor:
+        escritor.write_table(tabela_arrow)
+    return destino.getvalue().to_pybytes()
+
+
+async def _carregar(edicao):
+    """Agregados da edição, ou None se ela não está disponível."""
+    if edicao not in edicoes_disponiveis():
+        return None
+    # A leitura dos Parquet/CSV é bloqueante: roda fora do laço de eventos
+    try:
+        with secao('api carregar_agregados'):
+            return await run_in_threadpool(obter_agregados, edicao)
+    except FileNotFoundError:
+        return None
+
+
+async def listar_agregados(request):
+    try:
+        edicao = _edicao(request)
+    except ParametroInvalido as e:
+        return JSONResponse({'erro': str(e)}, status_code=400)
+    versao = versao_dados()
+    # A existência é conferida antes do ETag: um recurso ausente nunca recebe 304
+    tabelas = await _carregar(edicao)
+    if tabelas is None:
+        return JSONResponse({'erro': f"Edição {edicao} não disponível"}, status_code=404)
+    etag = _etag(versao, edicao)
+    if _nao_modificado(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    return JSONResponse({'versao': versao, 'edicao': edicao, 'agregados': sorted(tabelas)},
+                        headers={'ETag': etag})
+
+
+async def obter_agregado(request):
+    nome = request.path_params['nome']
+    formato = _formato(request)
+    try:
+        edicao = _edicao(request)
+    except ParametroInvalido as e:
+        return JSONResponse({'erro': str(e)}, status_code=400)
+    if formato not in ('json', 'arrow'):
+        return JSONResponse({'erro': f"Formato desconhecido: {formato}"}, status_code=400)
+
+    versao = versao_dados()
+    tabela = (await _carregar(edicao) or {}).get(nome)
+    if tabela is None:
+        return JSONResponse({'erro': f"Agregado '{nome}' não disponível para {edicao}"}, status_code=404)
+
+    etag = _etag(versao, edicao, nome, formato)
+    if _nao_modificado(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+
+    cabecalhos = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if formato == 'arrow':
+        return Response(para_arrow(tabela), media_type=TIPO_ARROW, headers=cabecalhos)
+    return Response(tabela.to_json(orient='records'), media_type=TIPO_JSON, headers=cabecalhos)
+
+
+async def prever(request):
+    """Recebe ``{"respostas": {sintoma: código PNS}}`` e devolve a probabilidade."""
+    servico = request.app.state.servico
+    if servico is None:
+        return JSONResponse({'erro': "Nenhum modelo treinado. Rode 'python avaliacao.py'."}, status_code=503)
+    try:
+        corpo = await request.json()
+        probabilidade = await servico.prever(corpo['respostas'])
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return JSONResponse({'erro': "Corpo esperado: {\"respostas\": {sintoma: código}}"}, status_code=400)
+    except RespostasInvalidas as e:
+        return JSONResponse({'erro': str(e)}, status_code=422)
+    return JSONResponse({'probabilidade': probabilidade})
+
+
+async def saude(request):
+    return JSONResponse({'status': 'ok'})
+
+
+async def pronto(request):
+    """Estado do aquecimento; o balanceador só deve enviar tráfego quando for 200."""
+    componentes = request.app.state.componentes
+    return JSONResponse({'pronto': aquecimento.pronto(componentes), 'versao_dados': versao_dados(),
+                         'componentes': aquecimento.ESTADO},
+                        status_code=200 if aquecimento.pronto(componentes) else 503)
+
+
+async def metricas(request):
+    return Response(exportar_prometheus(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app):
+    # O servidor só aceita conexões depois do aquecimento
+    app.state.componentes = ['agregados', 'modelo']
+    await run_in_threadpool(aquecimento.aquecer, app.state.componentes)
+    app.state.servico = None
+    if aquecimento.pronto(['modelo']):
+        app.state.servico = ServicoPredicao(carregar_modelo())
+        await app.state.servico.iniciar()
+    try:
+        yield
+    finally:
+        if app.state.servico is not None:
+            await app.state.servico.parar()
+
+
+app = Starlette(routes=[
+    Route('/agregados', listar_agregados),
+    Route('/agregados/{nome}', obter_agregado),
+    Route('/prever', prever, methods=['POST']),
+    Route('/saude', saude),
+    Route('/pronto', pronto),
+    Route('/metricas', metricas),
+], lifespan=ciclo_de_vida)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servidor HTTP dos agregados da PNS.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', default=8000, type=int)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.porta)
+
+
+if __name__ == '__main__':
+    main()
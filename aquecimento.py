@@ -0,0 +1,170 @@
+"""Aquecimento de uma réplica antes de ela receber tráfego.
+
+Uso:
+    python aquecimento.py && streamlit run dashboard_depressao_backup.py
+    python aquecimento.py --componentes dados agregados modelo
+    python aquecimento.py --verificar        # prontidão da réplica (código 0 só depois do aquecimento)
+
+Aquece o que o servidor do Streamlit reaproveita de outro processo: o conjunto
+de dados publicado em memória compartilhada (com ``DADOS_COMPARTILHADOS=1``;
+sem ele, cada processo do Streamlit carrega os próprios dados e não há o que
+aquecer aqui), os agregados, o artefato do modelo (treinando-o se ainda não
+existir para a versão atual dos dados) e, ao executar cada página do dashboard
+uma vez, o cache em disco (``cache_disco.py``), além de garantir que as páginas
+renderizam sem erro. A etapa mais cara do primeiro acesso, a busca em grade do
+Teste Pessoal, passa a ser feita aqui: a página usa o artefato gravado quando
+ele corresponde aos dados atuais.
+
+O estado de cada componente é gravado em ``aquecimento.json``, marcado como não
+pronto desde o início do aquecimento; o código de saída é 1 se algum falhar, e
+o servidor não deve ser iniciado. ``--verificar`` lê esse arquivo e serve de
+verificação de prontidão do dashboard para o balanceador ou orquestrador
+(ex.: ``readinessProbe`` do tipo ``exec``), o mesmo sinal que a API dá em ``/pronto``.
+
+A API (``api.py``) executa o mesmo aquecimento ao iniciar e expõe o estado em
+``/pronto``.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cache_disco
+import compartilhado
+import dados
+from agregados import obter_agregados
+from avaliacao import carregar_metricas, salvar_artefato, treinar_e_avaliar
+from modelo import ESTRATEGIA_PADRAO
+
+ARQUIVO_ESTADO = Path('aquecimento.json')
+DASHBOARD = Path(__file__).with_name('dashboard_depressao_backup.py')
+PAGINAS = [
+    "🏠 Introdução",
+    "🌎 Panorama Nacional",
+    "📊 Fatores Associados",
+    "💊 Tratamento e Saúde",
+    "📝 Teste Pessoal",
+]
+
+# Estado do aquecimento neste processo: componente -> {pronto, segundos, detalhe, erro}
+ESTADO = {}
+
+
+def _aquecer_dados():
+    # Sem memória compartilhada, um DataFrame carregado aqui seria descartado ao fim do processo
+    if not compartilhado.ATIVO:
+        return "ignorado: sem DADOS_COMPARTILHADOS=1, cada processo do Streamlit carrega os dados"
+    df = compartilhado.carregar_compartilhado(dados.versao_dados())
+    return f"{len(df)} linhas em {compartilhado.caminho_publicado(dados.versao_dados())}"
+
+
+def _aquecer_agregados():
+    tabelas = obter_agregados()
+    return f"{len(tabelas)} agregados"
+
+
+def _aquecer_modelo():
+    versao = dados.versao_dados()
+    metricas = carregar_metricas()
+    if (metricas is not None and metricas['estrategia'] == ESTRATEGIA_PADRAO
+            and metricas.get('versao_dados') == versao):
+        return f"artefato existente ({metricas['gerado_em'][:19]})"
+    modelo, metricas = treinar_e_avaliar(dados.carregar_dataset(), ESTRATEGIA_PADRAO, versao)
+    salvar_artefato(modelo, metricas)
+    return f"treinado (ROC-AUC {metricas['roc_auc']:.3f})"
+
+
+def _aquecer_paginas():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(DASHBOARD), default_timeout=600)
+    app.run()
+    for pagina in PAGINAS:
+        app.sidebar.radio[0].set_value(pagina).run()
+        if app.exception:
+            raise RuntimeError(f"{pagina}: {app.exception[0].value}")
+    if not cache_disco.ATIVO:
+        return f"{len(PAGINAS)} páginas (cache em disco desativado)"
+    versao = dados.versao_dados()
+    entradas = sum(linha['entradas'] for linha in cache_disco.CACHE.estatisticas() if linha['versao'] == versao)
+    return f"{len(PAGINAS)} páginas, {entradas} resultados no cache em disco"
+
+
+COMPONENTES = {
+    'dados': _aquecer_dados,
+    'agregados': _aquecer_agregados,
+    'modelo': _aquecer_modelo,
+    'paginas': _aquecer_paginas,
+}
+
+
+def aquecer(componentes=None):
+    """Aquece os componentes pedidos (todos por padrão) e retorna o estado de cada um."""
+    for nome in componentes or COMPONENTES:
+        inicio = time.perf_counter()
+        try:
+            detalhe, erro = COMPONENTES[nome](), None
+        except Exception as e:
+            detalhe, erro = None, f"{type(e).__name__}: {e}"
+        ESTADO[nome] = {
+            'pronto': erro is None,
+            'segundos': round(time.perf_counter() - inicio, 3),
+            'detalhe': detalhe,
+            'erro': erro,
+        }
+    return ESTADO
+
+
+def pronto(componentes=None):
+    return all(ESTADO.get(nome, {}).get('pronto') for nome in componentes or COMPONENTES)
+
+
+def gravar_estado(caminho=ARQUIVO_ESTADO, componentes=None, concluido=True):
+    """Grava o estado em ``caminho`` (troca atômica); antes da conclusão, a réplica não está pronta."""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f"{caminho.name}.tmp")
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'gerado_em': datetime.now(timezone.utc).isoformat(),
+                   'versao_dados': dados.versao_dados(),
+                   'pronto': concluido and pronto(componentes),
+                   'componentes': ESTADO if concluido else {}},
+                  f, ensure_ascii=False, indent=2)
+    temporario.replace(caminho)
+
+
+def estado_gravado(caminho=ARQUIVO_ESTADO):
+    """Estado gravado pelo último aquecimento desta réplica (None se não houver ou estiver ilegível)."""
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aquece dados, agregados, modelo e páginas da réplica.")
+    parser.add_argument('--componentes', nargs='*', choices=list(COMPONENTES), default=list(COMPONENTES))
+    parser.add_argument('--saida', default=ARQUIVO_ESTADO, type=Path)
+    parser.add_argument('--verificar', action='store_true',
+                        help='Só lê o estado gravado: código 0 se a réplica estiver pronta')
+    args = parser.parse_args()
+
+    if args.verificar:
+        gravado = estado_gravado(args.saida)
+        print(json.dumps(gravado, ensure_ascii=False) if gravado else f"{args.saida} não encontrado")
+        sys.exit(0 if gravado and gravado.get('pronto') else 1)
+
+    gravar_estado(args.saida, args.componentes, concluido=False)
+    estado = aquecer(args.componentes)
+    gravar_estado(args.saida, args.componentes)
+
+    for nome, info in estado.items():
+        situacao = info['detalhe'] if info['pronto'] else f"FALHOU: {info['erro']}"
+        print(f"{nome:<10} {info['segundos']:>8.2f}s  {situacao}")
+    sys.exit(0 if pronto(args.componentes) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Treino e avaliação do classificador de depressão.
+
+As métricas (matriz de confusão, curvas ROC, precisão-revocação e calibração,
+desempenho por subgrupo) são calculadas uma única vez no treino e gravadas junto
+do artefato do modelo. A página de avaliação apenas lê o JSON gerado, sem
+repetir as predições sobre o conjunto de teste a cada interação.
+
+Uso:
+    python avaliacao.py --estrategia smote
+
+Ler métricas e carregar o artefato não depende do sklearn em tempo de
+importação; ele só é importado por quem treina ou calcula métricas.
+"""
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dados import ESTADOS, RACA, SEXO, carregar_dataset, faixa_etaria, versao_dados
+from modelo import ESTRATEGIA_PADRAO, PARAM_GRID_ARVORE, construir_pipeline, preparar_dados_modelo
+from subgrupos import analisar_subgrupos
+
+ARQUIVO_MODELO = Path('modelo_depressao.joblib')
+ARQUIVO_METRICAS = Path('modelo_depressao.metricas.json')
+
+# Agrupamentos demográficos usados na quebra por subgrupo (nome -> colunas)
+SUBGRUPOS = {
+    'Sexo': ['Sexo'],
+    'Cor_Raca': ['Cor_Raca'],
+    'Unidade_Federacao': ['Unidade_Federacao'],
+    'Faixa_Etaria': ['Faixa_Etaria'],
+    'Estado_Sexo_Faixa': ['Unidade_Federacao', 'Sexo', 'Faixa_Etaria'],
+}
+
+# Limite de pontos guardados por curva (o suficiente para desenhar o gráfico)
+MAX_PONTOS_CURVA = 200
+
+
+def _reduzir(*arrays):
+    """Subamostra pontos de curva mantendo o primeiro e o último."""
+    n = len(arrays[0])
+    if n <= MAX_PONTOS_CURVA:
+        return [np.asarray(a).tolist() for a in arrays]
+    indices = np.unique(np.linspace(0, n - 1, MAX_PONTOS_CURVA).astype(int))
+    return [np.asarray(a)[indices].tolist() for a in arrays]
+
+
+def probabilidade_depressao(modelo, X):
+    """Probabilidade prevista da classe 1 (diagnóstico de depressão = Sim)."""
+    indice = list(modelo.classes_).index(1)
+    return modelo.predict_proba(X)[:, indice]
+
+
+def grupos_demograficos(df, indices):
+    """Sexo, raça/cor, estado e faixa etária (rotulados) das linhas do conjunto de teste."""
+    demografia = df.loc[indices, ['Sexo', 'Cor_Raca', 'Unidade_Federacao', 'Idade_Morador']]
+    return pd.DataFrame({
+        'Sexo': demografia['Sexo'].map(SEXO),
+        'Cor_Raca': demografia['Cor_Raca'].map(RACA),
+        'Unidade_Federacao': demografia['Unidade_Federacao'].map(ESTADOS),
+        'Faixa_Etaria': faixa_etaria(demografia['Idade_Morador']).astype(object),
+    }, index=indices)
+
+
+def metricas_por_subgrupo(y_real, y_pred, probabilidades, grupos):
+    """AUC, TPR, FPR, acurácia e prevalência de cada categoria de cada agrupamento."""
+    tabelas = analisar_subgrupos(grupos, probabilidades, y_real, y_pred, SUBGRUPOS)
+    # to_json converte NaN (grupos sem as duas classes) em null
+    return {nome: json.loads(tabela.to_json(orient='records')) for nome, tabela in tabelas.items()}
+
+
+def calcular_metricas(modelo, X_test, y_test, grupos):
+    """Calcula todas as métricas exibidas na página de avaliação."""
+    from sklearn.calibration import calibration_curve
+    from sklearn.metrics import (accuracy_score, average_precision_score, confusion_matrix,
+                                 precision_recall_curve, roc_auc_score, roc_curve)
+
+    probabilidades = probabilidade_depressao(modelo, X_test)
+    y_pred = modelo.predict(X_test)
+    real = (y_test == 1).to_numpy()
+    previsto = (y_pred == 1)
+
+    fpr, tpr, _ = roc_curve(real, probabilidades)
+    precisao, revocacao, _ = precision_recall_curve(real, probabilidades)
+    prob_real, prob_prevista = calibration_curve(real, probabilidades, n_bins=10, strategy='quantile')
+    fpr, tpr = _reduzir(fpr, tpr)
+    precisao, revocacao = _reduzir(precisao, revocacao)
+
+    return {
+        'acuracia': float(accuracy_score(y_test, y_pred)),
+        'roc_auc': float(roc_auc_score(real, probabilidades)),
+        'precisao_media': float(average_precision_score(real, probabilidades)),
+        'matriz_confusao': {
+            'rotulos': ['Sim', 'Não'],
+            'valores': confusion_matrix(y_test, y_pred, labels=[1, 2]).tolist(),
+        },
+        'curva_roc': {'fpr': fpr, 'tpr': tpr},
+        'curva_pr': {'precisao': precisao, 'revocacao': revocacao},
+        'calibracao': {'prob_prevista': prob_prevista.tolist(), 'prob_real': prob_real.tolist()},
+        'subgrupos': metricas_por_subgrupo(real, previsto, probabilidades, grupos),
+    }
+
+
+def treinar_e_avaliar(df, estrategia=ESTRATEGIA_PADRAO, versao=None):
+    """Treina o modelo com busca em grade e calcula as métricas no conjunto de teste.
+
+    ``versao`` é a versão dos dados de ``df`` (ver ``dados.versao_dados``), registrada
+    nas métricas para que os dashboards saibam se o artefato corresponde aos dados atuais.
+    """
+    from sklearn.model_selection import GridSearchCV, train_test_split
+
+    X, y = preparar_dados_modelo(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    pipeline = construir_pipeline(estrategia=estrategia)
+    grid_search = GridSearchCV(pipeline, PARAM_GRID_ARVORE, cv=5, scoring='roc_auc', n_jobs=-1)
+    grid_search.fit(X_train, y_train)
+    modelo = grid_search.best_estimator_
+
+    metricas = calcular_metricas(modelo, X_test, y_test, grupos_demograficos(df, X_test.index))
+    metricas.update({
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'estrategia': estrategia,
+        'versao_dados': versao,
+        'melhores_parametros': dict(grid_search.best_params_),
+        'amostras_validas': int(X.shape[0]),
+        'amostras_treino': int(X_train.shape[0]),
+        'amostras_teste': int(X_test.shape[0]),
+    })
+    return modelo, metricas
+
+
+def salvar_artefato(modelo, metricas, caminho_modelo=ARQUIVO_MODELO, caminho_metricas=ARQUIVO_METRICAS):
+    joblib.dump(modelo, caminho_modelo)
+    with open(caminho_metricas, 'w', encoding='utf-8') as f:
+        json.dump(metricas, f, ensure_ascii=False, indent=2)
+
+
+def carregar_metricas(caminho_metricas=ARQUIVO_METRICAS):
+    """Lê as métricas gravadas no treino (None se ainda não existirem)."""
+    caminho_metricas = Path(caminho_metricas)
+    if not caminho_metricas.exists():
+        return None
+    with open(caminho_metricas, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def carregar_modelo(caminho_modelo=ARQUIVO_MODELO):
+    return joblib.load(caminho_modelo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina o modelo e grava o artefato com as métricas.")
+    parser.add_argument('--dados', help='CSV de entrada (padrão: armazém de dados ou pns2019_IA.csv)')
+    parser.add_argument('--estrategia', default=ESTRATEGIA_PADRAO)
+    args = parser.parse_args()
+
+    if args.dados:
+        df, versao = pd.read_csv(args.dados, sep=';', encoding='utf-8'), None
+    else:
+        df, versao = carregar_dataset(), versao_dados()
+    modelo, metricas = treinar_e_avaliar(df, args.estrategia, versao)
+    salvar_artefato(modelo, metricas)
+    print(f"Modelo salvo em {ARQUIVO_MODELO} | ROC-AUC: {metricas['roc_auc']:.3f} "
+          f"| Acurácia: {metricas['acuracia']:.2%}")
+
+
+if __name__ == '__main__':
+    main()
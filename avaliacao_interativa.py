@@ -1,91 +1,143 @@
 import streamlit as st
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score  # Importação adicionada aqui
-from imblearn.over_sampling import SMOTE
-from imblearn.pipeline import Pipeline as ImbPipeline
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.model_selection import GridSearchCV
+import plotly.express as px
+import plotly.graph_objects as go
+import dados
+from avaliacao import ARQUIVO_METRICAS, carregar_metricas, salvar_artefato, treinar_e_avaliar
+from modelo import ESTRATEGIA_PADRAO, ESTRATEGIAS_BALANCEAMENTO
 
 # Configuração inicial do Streamlit
 st.set_page_config(page_title="Dashboard Depressão", layout="wide")
 st.title("Análise de Depressão - PNS 2019")
 
 @st.cache_data
-def load_data():
-    caminho_arquivo = r"pns2019_IA.csv" 
-    return pd.read_csv(caminho_arquivo, sep=';', encoding='utf-8')
+def load_data(versao):
+    return dados.carregar_dataset()
+
+# As métricas são calculadas no treino e lidas do disco; nada é re-predito a cada interação.
+# A data de modificação do arquivo entra na chave: um retreino feito por outro processo
+# (aquecimento.py, avaliacao.py) é lido na próxima execução da página.
+@st.cache_data
+def load_metricas(modificado_em):
+    return carregar_metricas()
+
+def versao_metricas():
+    return ARQUIVO_METRICAS.stat().st_mtime_ns if ARQUIVO_METRICAS.exists() else None
+
+def treinar(estrategia):
+    versao = dados.versao_dados()
+    modelo, metricas = treinar_e_avaliar(load_data(versao), estrategia, versao)
+    salvar_artefato(modelo, metricas)
 
 try:
-    df = load_data()
-    
-    # Processamento dos dados (seção 1)
-    with st.expander("🔍 Pré-processamento dos Dados"):
-        X = df[["Frequencia_Problemas_Sono", "Frequencia_Problemas_Concentracao", 
-                "Frequencia_Problemas_Interesse", "Frequencia_Problemas_Alimentacao", 
-                "Frequencia_Sentimento_Deprimido", "Frequencia_Sentimento_Fracasso", 
-                "Frequencia_Pensamentos_Suicidio"]]
-        y = df["Diagnostico_Depressao"]
-
-        # Filtros
-        valid_values_y = [1, 2]
-        y = y[y.isin(valid_values_y)]
-        valid_values_x = {col: [1, 2] for col in X.columns}
-        valid_indices_x = X.apply(lambda col: col.isin(valid_values_x[col.name])).all(axis=1)
-        X = X[valid_indices_x]
-        y = y.loc[X.index]
-        X = X.apply(lambda col: col.map({1: 0, 2: 1}))
-
-        st.success(f"Dados pré-processados: {X.shape[0]} amostras válidas")
-
-    # Divisão dos dados (seção 2)
-    with st.expander("✂️ Divisão Treino/Teste"):
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        st.write(f"Treino: {X_train.shape[0]} amostras | Teste: {X_test.shape[0]} amostras")
-
-    # Modelagem (seção 3)
-    with st.expander("🤖 Treinamento do Modelo"):
-        pipeline = ImbPipeline([
-            ('smote', SMOTE(random_state=42)),
-            ('classifier', DecisionTreeClassifier(random_state=42))
-        ])
-
-        param_grid = {
-            'classifier__max_depth': [3, 4, 5, 6, None],
-            'classifier__min_samples_split': [2, 5, 10],
-            'classifier__min_samples_leaf': [1, 2, 4],
-            'classifier__criterion': ['gini', 'entropy']
-        }
-
-        grid_search = GridSearchCV(pipeline, param_grid, cv=5, scoring='roc_auc', n_jobs=-1)
-        with st.spinner('Otimizando hiperparâmetros...'):
-            grid_search.fit(X_train, y_train)
-        
-        final_model = grid_search.best_estimator_
-        
-        # Cálculo da acurácia
-        y_pred = final_model.predict(X_test)
-        acuracia = accuracy_score(y_test, y_pred)
-        
+    metricas = load_metricas(versao_metricas())
+
+    # Modelagem (seção 1)
+    with st.expander("🤖 Treinamento do Modelo", expanded=metricas is None):
+        estrategia = st.selectbox(
+            "Balanceamento das classes",
+            ESTRATEGIAS_BALANCEAMENTO,
+            index=ESTRATEGIAS_BALANCEAMENTO.index(ESTRATEGIA_PADRAO)
+        )
+        if metricas is None:
+            st.info("Nenhum modelo treinado encontrado. Treinando pela primeira vez.")
+        if metricas is None or st.button("Retreinar modelo"):
+            with st.spinner('Otimizando hiperparâmetros...'):
+                treinar(estrategia)
+            metricas = load_metricas(versao_metricas())
+
         st.success(f"""
-        Modelo treinado com sucesso!
-        - Melhores parâmetros: {grid_search.best_params_}
-        - Acurácia: {acuracia:.2%}
+        Modelo treinado em {metricas['gerado_em'][:19].replace('T', ' ')} (UTC)
+        - Balanceamento: {metricas['estrategia']}
+        - Melhores parâmetros: {metricas['melhores_parametros']}
+        - Acurácia: {metricas['acuracia']:.2%}
         """)
+        versao_atual = dados.versao_dados()
+        if metricas.get('versao_dados') != versao_atual:
+            st.warning(f"O modelo foi treinado com a versão {metricas.get('versao_dados')} dos dados, "
+                       f"mas a atual é {versao_atual}. Retreine para atualizar as métricas.")
 
-    # Função para carregar o modelo
-    def carregar_modelo():
-        return final_model
+    # Processamento e divisão dos dados (seção 2)
+    with st.expander("🔍 Pré-processamento e Divisão Treino/Teste"):
+        st.success(f"Dados pré-processados: {metricas['amostras_validas']} amostras válidas")
+        st.write(f"Treino: {metricas['amostras_treino']} amostras | Teste: {metricas['amostras_teste']} amostras")
 
 except Exception as e:
     st.error(f"🚨 Ocorreu um erro: {str(e)}")
     st.stop()
 
-# Seção de visualização (seção 4)
-with st.expander("📊 Métricas de Desempenho"):
-    st.subheader("Matriz de Confusão")
-    # Adicione aqui a visualização da matriz de confusão
-    # Exemplo: plot_confusion_matrix(final_model, X_test, y_test)
-    
-    st.subheader("Outras Métricas")
-    st.write(f"Acurácia no conjunto de teste: {acuracia:.2%}")
\ No newline at end of file
+# Seção de visualização (seção 3)
+with st.expander("📊 Métricas de Desempenho", expanded=True):
+    col_m1, col_m2, col_m3 = st.columns(3)
+    col_m1.metric("Acurácia", f"{metricas['acuracia']:.2%}")
+    col_m2.metric("ROC-AUC", f"{metricas['roc_auc']:.3f}")
+    col_m3.metric("Precisão média (PR-AUC)", f"{metricas['precisao_media']:.3f}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Matriz de Confusão")
+        rotulos = metricas['matriz_confusao']['rotulos']
+        fig_cm = px.imshow(
+            metricas['matriz_confusao']['valores'],
+            x=[f"Previsto: {r}" for r in rotulos],
+            y=[f"Real: {r}" for r in rotulos],
+            text_auto=True,
+            color_continuous_scale='Blues'
+        )
+        fig_cm.update_layout(coloraxis_showscale=False)
+        st.plotly_chart(fig_cm, use_container_width=True)
+
+        st.subheader("Curva de Calibração")
+        fig_cal = go.Figure()
+        fig_cal.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', name='Calibração perfeita',
+                                     line=dict(dash='dash', color='gray')))
+        fig_cal.add_trace(go.Scatter(x=metricas['calibracao']['prob_prevista'],
+                                     y=metricas['calibracao']['prob_real'],
+                                     mode='lines+markers', name='Modelo'))
+        fig_cal.update_layout(xaxis_title="Probabilidade prevista", yaxis_title="Fração observada")
+        st.plotly_chart(fig_cal, use_container_width=True)
+
+    with col2:
+        st.subheader("Curva ROC")
+        fig_roc = go.Figure()
+        fig_roc.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', name='Aleatório',
+                                     line=dict(dash='dash', color='gray')))
+        fig_roc.add_trace(go.Scatter(x=metricas['curva_roc']['fpr'], y=metricas['curva_roc']['tpr'],
+                                     mode='lines', name=f"AUC = {metricas['roc_auc']:.3f}"))
+        fig_roc.update_layout(xaxis_title="Taxa de falsos positivos", yaxis_title="Taxa de verdadeiros positivos")
+        st.plotly_chart(fig_roc, use_container_width=True)
+
+        st.subheader("Curva Precisão-Revocação")
+        fig_pr = go.Figure()
+        fig_pr.add_trace(go.Scatter(x=metricas['curva_pr']['revocacao'], y=metricas['curva_pr']['precisao'],
+                                    mode='lines', name=f"PR-AUC = {metricas['precisao_media']:.3f}"))
+        fig_pr.update_layout(xaxis_title="Revocação", yaxis_title="Precisão")
+        st.plotly_chart(fig_pr, use_container_width=True)
+
+    st.subheader("Desempenho por Subgrupo")
+    nomes_subgrupos = {
+        'Sexo': 'Sexo',
+        'Cor_Raca': 'Raça/Cor',
+        'Unidade_Federacao': 'Estado',
+        'Faixa_Etaria': 'Faixa Etária',
+        'Estado_Sexo_Faixa': 'Estado × Sexo × Faixa',
+    }
+    abas = st.tabs(list(nomes_subgrupos.values()))
+    for aba, coluna in zip(abas, nomes_subgrupos):
+        with aba:
+            df_grupo = pd.DataFrame(metricas['subgrupos'].get(coluna, []))
+            if df_grupo.empty:
+                st.info("Métricas deste subgrupo não disponíveis. Retreine o modelo.")
+                continue
+            # Agrupamentos cruzados têm células demais para um gráfico de barras
+            if coluna in df_grupo.columns:
+                fig_grupo = px.bar(
+                    df_grupo,
+                    x=coluna,
+                    y='auc',
+                    text_auto='.3f',
+                    labels={coluna: nomes_subgrupos[coluna], 'auc': 'ROC-AUC'}
+                )
+                st.plotly_chart(fig_grupo, use_container_width=True)
+            st.dataframe(df_grupo, use_container_width=True, hide_index=True)
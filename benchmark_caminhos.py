@@ -0,0 +1,288 @@
+"""Benchmark dos caminhos de dados do dashboard em dados sintéticos de vários tamanhos.
+
+Uso:
+    python benchmark_caminhos.py
+    python benchmark_caminhos.py --tamanhos 10000 100000 --caminhos load_data panorama
+    python benchmark_caminhos.py --tamanhos 10000 --caminhos train_model_completa
+
+Para cada tamanho (10 mil, 100 mil e 1 milhão de linhas por padrão) um
+conjunto sintético (``dados_sinteticos.py``) é gravado como CSV e ingerido em
+um armazém temporário. Cada caminho (carga, pré-processamento, agregações das
+páginas, construção de figuras e treino) é executado várias vezes, como no
+asv: a preparação fica fora da medição, e mínimo e mediana são registrados.
+
+Cada execução é acrescentada como uma linha JSON ao histórico, com o commit e
+as versões das bibliotecas, e comparada com a execução anterior para acompanhar
+a evolução de cada caminho ao longo do tempo.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import agregados
+import binagem
+import calculos
+import compartilhado
+import consultas
+import dados
+import ingestao
+from dados_sinteticos import gerar, gravar_csv
+from filtro_cruzado import FiltroCruzado
+from indice_idade import IndiceIdade
+from modelo import ESTRATEGIA_PADRAO, PARAM_GRID_ARVORE, buscar_arvore, preparar_dados_modelo
+
+TAMANHOS = (10_000, 100_000, 1_000_000)
+HISTORICO = Path('benchmark_caminhos.jsonl')
+
+# Perguntas contadas entre quem tem depressão (Tratamento e Saúde; atividades sociais em Fatores Associados)
+COLUNAS_TRATAMENTO = [
+    'Medicamento_Depressao', 'Frequencia_Visita_Medico_Depressao',
+    'Uso_Medicamento_Depressao_Ultimas_Semanas', 'Motivo_Nao_Visitar_Medico_Depressao',
+    'Frequencia_atividades_sociais',
+]
+# Sintomas comparados entre quem sofreu ou não o primeiro tipo de violência (Fatores Associados)
+SINTOMAS_VIOLENCIA = ['Frequencia_Sentimento_Deprimido', 'Frequencia_Problemas_Sono', 'Frequencia_Pensamentos_Suicidio']
+
+# train_model_minima usa uma combinação só; a grade completa do dashboard (90 combinações x 5 dobras)
+# repete 90 vezes o mesmo ajuste e fica em train_model_completa
+GRADES = {
+    'minima': {chave: valores[:1] for chave, valores in PARAM_GRID_ARVORE.items()},
+    'completa': PARAM_GRID_ARVORE,
+}
+
+
+def carregar_dados(diretorio):
+    """O que ``load_data`` faz sem o conjunto compartilhado: lê o armazém, rotula e congela."""
+    return compartilhado.somente_leitura(dados.preparar(dados.carregar_dataset(diretorio=diretorio)))
+
+
+def preparar_contexto(linhas, diretorio, semente=42):
+    """Gera os dados sintéticos e monta as entradas de cada caminho (fora da medição)."""
+    bruto = gerar(linhas, semente)
+    csv = diretorio / 'pns_sintetico.csv'
+    gravar_csv(bruto, csv)
+    armazem = diretorio / 'armazem'
+    ingestao.inicializar(csv, diretorio=armazem)
+    df = carregar_dados(armazem)
+    X, y = preparar_dados_modelo(bruto)
+    return {
+        'csv': csv, 'armazem': armazem, 'bruto': bruto, 'df': df, 'X': X, 'y': y,
+        'cubo': agregados.carregar_agregados(['cubo_panorama'], diretorio=armazem)['cubo_panorama'],
+        'indice': IndiceIdade(df), 'horas': binagem.histograma_unitario(df, 'Horas_Trabalho_Semana'),
+    }
+
+
+def _figura_faixas(contexto):
+    fig = calculos.figura_faixas_horas(*binagem.depressao_por_faixas(contexto['horas'], dados.BINS_HORAS,
+                                                                     dados.LABELS_HORAS))
+    # Serializar faz parte do custo: é o que st.plotly_chart envia ao navegador
+    return fig.to_json()
+
+
+def _panorama(contexto):
+    """Filtros do Panorama como no fragmento do dashboard: tabelas dos gráficos e níveis geográficos."""
+    filtro = FiltroCruzado()
+    for idade_min, idade_max in [(None, None), *dados.FAIXAS_ETARIAS.values()]:
+        for sexo in ([], ['Feminino']):
+            filtro.selecionar('Sexo', sexo)
+            filtro.tabelas(contexto['indice'], idade_min, idade_max)
+            filtro.niveis(contexto['indice'], idade_min, idade_max)
+
+
+def _filtro_cruzado(contexto):
+    """Sequência de cliques do Panorama: cada seleção recalcula só as tabelas dos outros gráficos."""
+    filtro = FiltroCruzado()
+    filtro.tabelas(contexto['indice'])
+    for dimensao, valores in [('Cor_Raca', ['Parda']), ('Unidade_Federacao', ['Bahia', 'São Paulo']),
+                              ('Sexo', ['Feminino']), ('Cor_Raca', []), ('Unidade_Federacao', [])]:
+        filtro.selecionar(dimensao, valores)
+        filtro.tabelas(contexto['indice'], 18, 65)
+
+
+def _violencia(motor=None):
+    """Consultas de violência de Fatores Associados: % com depressão e médias dos sintomas."""
+    def caminho(contexto):
+        referencia = agregados.COLUNAS_VIOLENCIA[0]
+        return ([consultas.depressao_por_violencia(coluna, diretorio=contexto['armazem'], motor=motor)
+                 for coluna in agregados.COLUNAS_VIOLENCIA]
+                + [consultas.media(sintoma, referencia, {referencia: [1, 2]}, diretorio=contexto['armazem'],
+                                   motor=motor) for sintoma in SINTOMAS_VIOLENCIA])
+    return caminho
+
+
+def _tratamento(motor=None):
+    """Respostas de quem tem depressão contadas nas páginas (Tratamento e Saúde, atividades sociais)."""
+    def caminho(contexto):
+        return [consultas.contar([coluna], {'Diagnostico_Depressao': 1}, diretorio=contexto['armazem'], motor=motor)
+                for coluna in COLUNAS_TRATAMENTO]
+    return caminho
+
+
+def _consultas_paginas(motor):
+    """Mesmas consultas de ``violencia`` e ``tratamento``, num motor de ``consultas``."""
+    violencia, tratamento = _violencia(motor), _tratamento(motor)
+    return lambda contexto: (violencia(contexto), tratamento(contexto))
+
+
+CAMINHOS = {
+    'ler_csv': lambda c: pd.read_csv(c['csv'], sep=';', encoding='utf-8'),
+    'load_data': lambda c: carregar_dados(c['armazem']),
+    'preparar': lambda c: dados.preparar(c['bruto']),
+    'subconjuntos': lambda c: c['df'][c['df']['Diagnostico_Depressao'] == 'Sim'],
+    # Montagem do índice de idades e as consultas do Panorama respondidas por ele
+    'indice_idade': lambda c: IndiceIdade(dados.rotular(c['cubo']), contagem='Quantidade'),
+    'panorama': _panorama,
+    'filtro_cruzado': _filtro_cruzado,
+    # Faixas de horas de várias larguras somadas do histograma unitário, sem pd.cut nos microdados
+    'histograma_horas': lambda c: binagem.histograma_unitario(c['df'], 'Horas_Trabalho_Semana'),
+    'rebinar_horas': lambda c: [binagem.depressao_por_faixas(c['horas'],
+                                                             binagem.limites_por_largura(0, 120, largura))
+                                for largura in (5, 10, 20, 30, 40, 60)],
+    'figura_faixas': _figura_faixas,
+    # Consultas das páginas com o motor padrão, da leitura do armazém ao resultado (como no dashboard)
+    'violencia': _violencia(),
+    'tratamento': _tratamento(),
+    'preparar_dados_modelo': lambda c: preparar_dados_modelo(c['bruto']),
+    # Treino com uma combinação só e com a grade completa do dashboard (fora da execução padrão)
+    **{f'train_model_{grade}': (lambda c, p=parametros: buscar_arvore(c['X'], c['y'], ESTRATEGIA_PADRAO, p))
+       for grade, parametros in GRADES.items()},
+    # Mesmas consultas de violência + tratamento em cada motor (consultas_pandas: carregar_dataset + groupby)
+    **{f'consultas_{motor}': _consultas_paginas(motor) for motor in consultas.MOTORES_DISPONIVEIS},
+}
+CAMINHOS_PADRAO = [nome for nome in CAMINHOS if nome != 'train_model_completa']
+
+
+def medir(funcao, contexto, repeticoes=5, tempo_max=30.0):
+    """Executa ``funcao`` até ``repeticoes`` vezes (ou até ``tempo_max`` segundos, ao menos uma)."""
+    tempos = []
+    inicio_total = time.perf_counter()
+    while len(tempos) < repeticoes:
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao(contexto)
+        tempos.append(time.perf_counter() - inicio)
+        if time.perf_counter() - inicio_total > tempo_max:
+            break
+    return {
+        'execucoes': len(tempos),
+        'min_s': min(tempos),
+        'mediana_s': float(np.median(tempos)),
+        'max_s': max(tempos),
+    }
+
+
+def commit_atual():
+    try:
+        processo = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=Path(__file__).parent)
+    except OSError:
+        return None
+    return processo.stdout.strip() or None
+
+
+def executar_benchmark(tamanhos=TAMANHOS, caminhos=None, repeticoes=5, tempo_max=30.0, semente=42):
+    import sklearn
+
+    resultados = []
+    for linhas in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            print(f"Gerando {linhas} linhas...")
+            contexto = preparar_contexto(linhas, Path(diretorio), semente)
+            for nome in caminhos or CAMINHOS_PADRAO:
+                medicao = medir(CAMINHOS[nome], contexto, repeticoes, tempo_max)
+                resultados.append({'caminho': nome, 'linhas': linhas, **medicao})
+                print(f"  {nome:<24}{medicao['mediana_s'] * 1000:>12.1f} ms (mediana de {medicao['execucoes']})")
+
+    return {
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'commit': commit_atual(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'semente': semente,
+        'resultados': resultados,
+    }
+
+
+def ler_historico(caminho=HISTORICO):
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return []
+    with open(caminho, encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def acrescentar_historico(relatorio, caminho=HISTORICO):
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(relatorio, ensure_ascii=False) + '\n')
+
+
+def _nome_caminho(resultado, relatorio):
+    """Nome do caminho com a grade: execuções antigas gravavam ``train_model`` e a grade no relatório."""
+    if resultado['caminho'] == 'train_model':
+        return f"train_model_{relatorio.get('grade', 'minima')}"
+    return resultado['caminho']
+
+
+def comparar(relatorio, anterior):
+    """Razão entre as medianas atuais e as da execução anterior (> 1 = mais lento).
+
+    O treino só é comparado com a mesma grade: o nome do caminho inclui a grade.
+    """
+    referencia = {(_nome_caminho(r, anterior), r['linhas']): r['mediana_s'] for r in anterior['resultados']}
+    comparacao = []
+    for resultado in relatorio['resultados']:
+        antes = referencia.get((resultado['caminho'], resultado['linhas']))
+        if antes:
+            comparacao.append({'caminho': resultado['caminho'], 'linhas': resultado['linhas'],
+                               'razao': resultado['mediana_s'] / antes})
+    return comparacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=list(TAMANHOS))
+    parser.add_argument('--caminhos', nargs='+', choices=list(CAMINHOS),
+                        help='Padrão: todos menos train_model_completa')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--tempo-max', type=float, default=30.0,
+                        help='Segundos por caminho e tamanho a partir dos quais não se repete mais')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--historico', default=str(HISTORICO))
+    args = parser.parse_args()
+
+    anteriores = ler_historico(args.historico)
+    relatorio = executar_benchmark(args.tamanhos, args.caminhos, args.repeticoes, args.tempo_max, args.semente)
+    acrescentar_historico(relatorio, args.historico)
+
+    tabela = pd.DataFrame(relatorio['resultados']).pivot(index='caminho', columns='linhas', values='mediana_s')
+    print("\nMediana (ms) por caminho e número de linhas")
+    print((tabela * 1000).to_string(float_format=lambda v: f"{v:.1f}"))
+
+    if anteriores:
+        comparacao = comparar(relatorio, anteriores[-1])
+        if comparacao:
+            print(f"\nRazão em relação à execução de {anteriores[-1]['gerado_em']}"
+                  f" ({anteriores[-1].get('commit')})")
+            tabela = pd.DataFrame(comparacao).pivot(index='caminho', columns='linhas', values='razao')
+            print(tabela.to_string(float_format=lambda v: f"{v:.2f}x"))
+    print(f"\nResultados acrescentados a {args.historico}")
+
+
+if __name__ == '__main__':
+    main()
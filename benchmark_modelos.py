@@ -0,0 +1,126 @@
+"""Benchmark dos classificadores candidatos sob o mesmo protocolo SMOTE + validação cruzada.
+
+Uso:
+    python benchmark_modelos.py --dados pns2019_IA.csv --saida benchmark_modelos.json
+    python benchmark_modelos.py --estrategias smote class_weight undersampling
+
+Para cada modelo (e estratégia de balanceamento) são registrados ROC-AUC
+(validação cruzada e teste), acurácia, tempo de treino, latência de predição e
+tamanho do modelo serializado. O JSON gerado serve de referência para
+acompanhar regressões entre versões.
+"""
+import argparse
+import io
+import json
+import time
+from datetime import datetime, timezone
+
+import joblib
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import cross_validate, train_test_split
+
+from modelo import (ESTRATEGIAS_BALANCEAMENTO, candidatos_modelos, construir_pipeline,
+                    preparar_dados_modelo)
+
+
+def medir_latencia(modelo, X, repeticoes=50):
+    """Retorna a latência mediana (ms) de uma predição de linha única e por linha em lote."""
+    linha = X.iloc[[0]]
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        modelo.predict_proba(linha)
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+
+    inicio = time.perf_counter()
+    modelo.predict_proba(X)
+    tempo_lote = time.perf_counter() - inicio
+
+    return tempos[len(tempos) // 2] * 1000, tempo_lote / len(X) * 1000
+
+
+def tamanho_modelo(modelo):
+    """Tamanho em bytes do modelo serializado com joblib."""
+    buffer = io.BytesIO()
+    joblib.dump(modelo, buffer)
+    return buffer.getbuffer().nbytes
+
+
+def avaliar_modelo(classificador, X_train, X_test, y_train, y_test, cv=5, estrategia='smote'):
+    pipeline = construir_pipeline(classificador, estrategia)
+
+    # Mesmo protocolo do dashboard: balanceamento dentro de cada dobra da validação cruzada
+    resultados_cv = cross_validate(pipeline, X_train, y_train, cv=cv,
+                                   scoring=['roc_auc', 'accuracy'], n_jobs=-1)
+
+    inicio = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    tempo_treino = time.perf_counter() - inicio
+
+    probabilidades = pipeline.predict_proba(X_test)[:, 1]
+    y_pred = pipeline.predict(X_test)
+    latencia_unitaria, latencia_lote = medir_latencia(pipeline, X_test)
+
+    return {
+        'roc_auc_cv': float(resultados_cv['test_roc_auc'].mean()),
+        'roc_auc_cv_desvio': float(resultados_cv['test_roc_auc'].std()),
+        'roc_auc_teste': float(roc_auc_score(y_test, probabilidades)),
+        'acuracia_teste': float(accuracy_score(y_test, y_pred)),
+        'tempo_treino_s': tempo_treino,
+        'latencia_unitaria_ms': latencia_unitaria,
+        'latencia_por_linha_lote_ms': latencia_lote,
+        'tamanho_modelo_bytes': tamanho_modelo(pipeline),
+    }
+
+
+def executar_benchmark(df, modelos=None, cv=5, estrategias=('smote',)):
+    X, y = preparar_dados_modelo(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    nomes = modelos or list(candidatos_modelos())
+
+    resultados = []
+    for estrategia in estrategias:
+        for nome in nomes:
+            print(f"Avaliando {nome} ({estrategia})...")
+            # Instância nova a cada rodada: class_weight altera os parâmetros do classificador
+            classificador = candidatos_modelos()[nome]
+            metricas = avaliar_modelo(classificador, X_train, X_test, y_train, y_test,
+                                      cv=cv, estrategia=estrategia)
+            resultados.append({'modelo': nome, 'estrategia': estrategia, **metricas})
+
+    return {
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'amostras_treino': int(X_train.shape[0]),
+        'amostras_teste': int(X_test.shape[0]),
+        'cv': cv,
+        'resultados': resultados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dados', default='pns2019_IA.csv')
+    parser.add_argument('--saida', default='benchmark_modelos.json')
+    parser.add_argument('--modelos', nargs='*', help='Subconjunto de modelos a avaliar')
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--estrategias', nargs='*', default=['smote'],
+                        choices=ESTRATEGIAS_BALANCEAMENTO,
+                        help='Estratégias de balanceamento a comparar')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.dados, sep=';', encoding='utf-8')
+    relatorio = executar_benchmark(df, args.modelos, args.cv, args.estrategias)
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    tabela = pd.DataFrame(relatorio['resultados']).set_index(['estrategia', 'modelo'])
+    print(tabela.to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"\nResultados salvos em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
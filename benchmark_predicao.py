@@ -0,0 +1,101 @@
+"""Gerador de carga para o serviço de predição em micro-lotes.
+
+Uso:
+    python benchmark_predicao.py --requisicoes 5000 --concorrencia 200
+    python benchmark_predicao.py --lotes 1 16 64 --espera-ms 2 --saida benchmark_predicao.json
+
+Dispara requisições concorrentes contra ``ServicoPredicao`` com o modelo
+treinado (``modelo_depressao.joblib``) e registra latência p50/p99, vazão e
+tamanho médio dos lotes para cada configuração. ``--lotes 1`` equivale a uma
+chamada ao sklearn por requisição e serve de linha de base.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from avaliacao import ARQUIVO_MODELO, carregar_modelo
+from modelo import CODIFICACAO_SINTOMAS, VARIAVEIS_SINTOMAS
+from servico_predicao import ServicoPredicao
+
+
+def respostas_aleatorias(n, semente=42):
+    gerador = random.Random(semente)
+    codigos = list(CODIFICACAO_SINTOMAS)
+    return [{sintoma: gerador.choice(codigos) for sintoma in VARIAVEIS_SINTOMAS} for _ in range(n)]
+
+
+async def gerar_carga(servico, respostas, concorrencia):
+    """Envia todas as respostas com no máximo ``concorrencia`` requisições em voo."""
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias = []
+
+    async def requisicao(resposta):
+        async with semaforo:
+            inicio = time.perf_counter()
+            await servico.prever(resposta)
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(requisicao(resposta) for resposta in respostas))
+    return latencias, time.perf_counter() - inicio
+
+
+async def medir(modelo, respostas, concorrencia, max_lote, espera_max):
+    async with ServicoPredicao(modelo, max_lote=max_lote, espera_max=espera_max) as servico:
+        latencias, duracao = await gerar_carga(servico, respostas, concorrencia)
+    latencias_ms = np.array(latencias) * 1000
+    return {
+        'max_lote': max_lote,
+        'espera_max_ms': espera_max * 1000,
+        'concorrencia': concorrencia,
+        'requisicoes': len(respostas),
+        'latencia_p50_ms': float(np.percentile(latencias_ms, 50)),
+        'latencia_p99_ms': float(np.percentile(latencias_ms, 99)),
+        'vazao_rps': len(respostas) / duracao,
+        'lote_medio': servico.lote_medio,
+        'maior_lote': servico.maior_lote,
+    }
+
+
+def executar_benchmark(modelo, requisicoes=2000, concorrencia=100, lotes=(1, 64), espera_max=0.005):
+    respostas = respostas_aleatorias(requisicoes)
+    resultados = []
+    for max_lote in lotes:
+        print(f"Medindo max_lote={max_lote}...")
+        resultados.append(asyncio.run(medir(modelo, respostas, concorrencia, max_lote, espera_max)))
+    return {
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'resultados': resultados,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modelo', default=ARQUIVO_MODELO)
+    parser.add_argument('--saida', default='benchmark_predicao.json')
+    parser.add_argument('--requisicoes', type=int, default=2000)
+    parser.add_argument('--concorrencia', type=int, default=100)
+    parser.add_argument('--lotes', type=int, nargs='*', default=[1, 16, 64],
+                        help='Tamanhos máximos de lote a comparar')
+    parser.add_argument('--espera-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    relatorio = executar_benchmark(carregar_modelo(args.modelo), args.requisicoes, args.concorrencia,
+                                   args.lotes, args.espera_ms / 1000)
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    tabela = pd.DataFrame(relatorio['resultados']).set_index('max_lote')
+    print(tabela.to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"\nResultados salvos em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Faixas configuráveis de variáveis contínuas a partir de histogramas unitários.
+
+Uso:
+    horas = histograma_unitario(df, 'Horas_Trabalho_Semana')     # colunas: Sim / Não
+    rebinar(horas, limites_por_largura(0, 120, 10))
+    depressao_por_faixas(horas, dados.BINS_HORAS, dados.LABELS_HORAS)
+
+O histograma unitário (uma linha por valor inteiro, uma coluna por grupo, por
+padrão o diagnóstico) é calculado uma vez por versão dos dados. Qualquer
+escolha de faixas é respondida somando linhas dele pela soma acumulada, em
+tempo proporcional ao número de faixas, sem ``pd.cut`` sobre os microdados.
+As faixas seguem a convenção de ``dados.BINS_HORAS``: fechadas à esquerda e
+abertas à direita, com o último limite acima do máximo do domínio, para que o
+valor máximo (120 horas) entre na última faixa.
+"""
+import numpy as np
+import pandas as pd
+
+# Domínio (inteiro) de cada variável contínua dos dashboards
+DOMINIOS = {
+    'Horas_Trabalho_Semana': (0, 120),
+    'Idade_Morador': (0, 130),
+}
+
+
+def histograma_unitario(df, coluna, grupos=('Diagnostico_Depressao',), dominio=None):
+    """Contagem por valor inteiro de ``coluna`` (índice) e combinação de ``grupos`` (colunas).
+
+    Valores fora do domínio ou ausentes não entram.
+    """
+    minimo, maximo = dominio or DOMINIOS[coluna]
+    valores = df[coluna].to_numpy(dtype='float64', na_value=np.nan)
+    validos = (valores >= minimo) & (valores <= maximo)
+    base = df.loc[validos, list(grupos)].assign(**{coluna: np.floor(valores[validos]).astype('int64')})
+    contagens = base.groupby([coluna, *grupos], observed=True).size()
+    histograma = contagens.unstack(list(grupos), fill_value=0) if grupos else contagens.to_frame('Quantidade')
+    return histograma.reindex(pd.RangeIndex(minimo, maximo + 1, name=coluna), fill_value=0)
+
+
+def limites_por_largura(minimo, maximo, largura):
+    """Limites de faixas de ``largura`` que cobrem de ``minimo`` a ``maximo`` (inclusive).
+
+    Como as faixas são abertas à direita, se a largura dividir o intervalo o último limite é
+    ``maximo + 1`` e a última faixa inclui ``maximo`` (``limites_por_largura(0, 120, 20) == BINS_HORAS``,
+    com 100-120 na última faixa); senão, é o primeiro múltiplo da largura acima de ``maximo``.
+    """
+    inicios = list(range(minimo, max(maximo, minimo + 1), largura))
+    return inicios + [max(inicios[-1] + largura, maximo + 1)]
+
+
+def limites_observados(histograma, largura):
+    """Limites de faixas de ``largura`` do menor ao maior valor com contagem no histograma."""
+    observados = histograma.index[np.asarray(histograma).reshape(len(histograma), -1).sum(axis=1) > 0]
+    if observados.empty:
+        return [int(histograma.index[0]), int(histograma.index[0]) + largura]
+    return limites_por_largura(int(observados.min()), int(observados.max()), largura)
+
+
+def rotulos_padrao(limites):
+    return [f"{inicio}-{fim - 1}" for inicio, fim in zip(limites[:-1], limites[1:])]
+
+
+def rebinar(histograma, limites, rotulos=None):
+    """Soma do histograma unitário em faixas ``[limites[i], limites[i + 1])``."""
+    limites = np.asarray(limites)
+    acumulado = np.vstack([np.zeros((1, histograma.shape[1]), dtype='int64'),
+                           histograma.to_numpy().cumsum(axis=0)])
+    posicoes = np.clip(limites - histograma.index[0], 0, len(histograma))
+    contagens = acumulado[posicoes[1:]] - acumulado[posicoes[:-1]]
+    indice = pd.Index(rotulos or rotulos_padrao(limites.tolist()), name=histograma.index.name)
+    return pd.DataFrame(contagens, index=indice, columns=histograma.columns)
+
+
+def depressao_por_faixas(histograma, limites, rotulos=None):
+    """Casos com depressão por faixa e % com depressão em cada faixa (entrada de ``calculos.figura_faixas_horas``)."""
+    faixas = rebinar(histograma, limites, rotulos)
+    contagem = faixas['Sim']
+    porcentagem = (contagem / faixas.sum(axis=1) * 100).fillna(0)
+    return contagem, porcentagem
+
+
+def estatisticas(histograma):
+    """Média, mediana e desvio padrão (amostral) da variável a partir das contagens por valor."""
+    pesos = np.asarray(histograma, dtype='float64')
+    valores = np.asarray(histograma.index, dtype='float64')
+    total = pesos.sum()
+    if total == 0:
+        return {'media': np.nan, 'mediana': np.nan, 'desvio_padrao': np.nan}
+    media = (valores * pesos).sum() / total
+    variancia = (((valores - media) ** 2) * pesos).sum() / (total - 1) if total > 1 else np.nan
+    # Mediana: média dos valores nas posições centrais da amostra ordenada
+    acumulado = pesos.cumsum()
+    centro = valores[np.searchsorted(acumulado, [(total - 1) // 2 + 1, total // 2 + 1])]
+    return {'media': media, 'mediana': centro.mean(), 'desvio_padrao': np.sqrt(variancia)}
@@ -0,0 +1,263 @@
+"""Cache de resultados em disco compartilhado pelos processos da máquina.
+
+Uso:
+    from cache_disco import em_disco
+
+    @em_disco()
+    def faixas_horas(versao): ...
+
+    @em_disco(dependencias=(binagem, dados), versao='2')
+    def histogramas(versao): ...
+
+    python cache_disco.py estatisticas
+    python cache_disco.py limpar            # remove versões antigas e entradas expiradas
+    python cache_disco.py esvaziar
+
+O ``st.cache_data`` vive dentro de um processo e se perde a cada reinício; com
+várias réplicas, cada uma recalcula tudo. Aqui o resultado de uma função fica
+num banco SQLite (modo WAL, vários leitores e um escritor por vez entre
+processos) em ``cache_pns.sqlite`` (``PNS_CACHE_DISCO``). A chave é o nome da
+função, os argumentos, a versão dos dados (``dados.versao_dados``) e a versão
+do código (``versao_codigo``: o fonte da função, os arquivos dos módulos de que
+ela depende e uma ``versao`` explícita), de modo que uma nova ingestão ou uma
+nova versão do código invalida as entradas sem apagar nada; ``limpar`` remove
+as de versões antigas dos dados. Cada entrada pode ter validade (TTL) e o banco tem um
+tamanho máximo (``PNS_CACHE_DISCO_MB``), acima do qual as entradas usadas há
+mais tempo são descartadas. Um processo novo encontra os resultados já
+calculados pelos demais (ou pelo ``aquecimento.py``). ``CACHE_DISCO=0``
+desativa o cache.
+"""
+import argparse
+import functools
+import hashlib
+import inspect
+import marshal
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import dados
+
+ARQUIVO_CACHE = Path(os.environ.get('PNS_CACHE_DISCO', 'cache_pns.sqlite'))
+TAMANHO_MAX = int(os.environ.get('PNS_CACHE_DISCO_MB', '256')) * 1024 ** 2
+TTL_PADRAO = 24 * 3600
+ATIVO = os.environ.get('CACHE_DISCO') != '0'
+# Intervalo mínimo entre atualizações do último acesso de uma entrada (evita uma escrita por leitura)
+INTERVALO_ACESSO = 60
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    chave TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    versao TEXT NOT NULL,
+    valor BLOB NOT NULL,
+    tamanho INTEGER NOT NULL,
+    criado_em REAL NOT NULL,
+    expira_em REAL,
+    acessado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_acesso ON resultados (acessado_em);
+"""
+
+
+def _normalizar(valor):
+    """Forma estável entre processos (conjuntos e dicionários ordenados) para compor a chave."""
+    if isinstance(valor, dict):
+        return tuple(sorted((repr(k), _normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(repr(_normalizar(v)) for v in valor))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    return valor
+
+
+def chave(nome, versao, args=(), kwargs=None, codigo=''):
+    texto = repr((nome, versao, codigo, _normalizar(args), _normalizar(kwargs or {})))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def versao_codigo(funcao, dependencias=(), versao=None):
+    """Impressão digital do código que produz o resultado.
+
+    Combina o fonte de ``funcao`` (ou o bytecode, se o fonte não estiver disponível), o
+    conteúdo dos arquivos dos módulos em ``dependencias`` e ``versao``. Constantes e funções
+    de outros módulos (ex.: ``dados.BINS_HORAS``) só entram se o módulo for listado.
+    """
+    resumo = hashlib.sha256(repr(versao).encode('utf-8'))
+    try:
+        resumo.update(inspect.getsource(funcao).encode('utf-8'))
+    except (OSError, TypeError):
+        resumo.update(marshal.dumps(funcao.__code__))
+    for modulo in dependencias:
+        resumo.update(Path(inspect.getfile(modulo)).read_bytes())
+    return resumo.hexdigest()[:16]
+
+
+class CacheDisco:
+    """Tabela chave -> resultado serializado, com validade e limite de tamanho (LRU)."""
+
+    def __init__(self, caminho=ARQUIVO_CACHE, tamanho_max=TAMANHO_MAX):
+        self.caminho = Path(caminho)
+        self.tamanho_max = tamanho_max
+        self._local = threading.local()
+
+    def _conexao(self):
+        # Uma conexão por thread e por processo: conexões SQLite não sobrevivem a um fork
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None or self._local.pid != os.getpid():
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            conexao.executescript(ESQUEMA)
+            self._local.conexao, self._local.pid = conexao, os.getpid()
+        return conexao
+
+    def obter(self, chave_entrada):
+        """(encontrado, valor); entradas expiradas contam como ausentes."""
+        conexao = self._conexao()
+        agora = time.time()
+        linha = conexao.execute('SELECT valor, expira_em, acessado_em FROM resultados WHERE chave = ?',
+                                (chave_entrada,)).fetchone()
+        if linha is None or (linha[1] is not None and linha[1] < agora):
+            return False, None
+        if agora - linha[2] > INTERVALO_ACESSO:
+            try:
+                conexao.execute('UPDATE resultados SET acessado_em = ? WHERE chave = ?', (agora, chave_entrada))
+            except sqlite3.OperationalError:
+                pass  # banco ocupado: a ordem de descarte fica um pouco desatualizada
+        try:
+            return True, pickle.loads(linha[0])
+        except Exception:
+            # Entrada gravada com outra versão de pandas/pyarrow ou de uma classe que mudou:
+            # qualquer erro do unpickle (UnpicklingError, AttributeError, ModuleNotFoundError...)
+            # descarta a entrada para que seja recalculada
+            self.remover(chave_entrada)
+            return False, None
+
+    def remover(self, chave_entrada):
+        try:
+            self._conexao().execute('DELETE FROM resultados WHERE chave = ?', (chave_entrada,))
+        except sqlite3.OperationalError:
+            pass  # banco ocupado: a entrada é sobrescrita pelo próximo guardar
+
+    def guardar(self, chave_entrada, nome, versao, valor, ttl=TTL_PADRAO):
+        blob = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.tamanho_max:
+            return
+        agora = time.time()
+        conexao = self._conexao()
+        conexao.execute('BEGIN IMMEDIATE')
+        try:
+            conexao.execute('INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                            (chave_entrada, nome, versao, blob, len(blob), agora,
+                             agora + ttl if ttl else None, agora))
+            self._descartar(conexao, agora)
+            conexao.execute('COMMIT')
+        except BaseException:
+            conexao.execute('ROLLBACK')
+            raise
+
+    def _descartar(self, conexao, agora):
+        """Remove as expiradas e, acima do limite, as usadas há mais tempo."""
+        conexao.execute('DELETE FROM resultados WHERE expira_em < ?', (agora,))
+        excesso = conexao.execute('SELECT coalesce(sum(tamanho), 0) FROM resultados').fetchone()[0] \
+            - self.tamanho_max
+        if excesso <= 0:
+            return
+        removidas = []
+        for chave_entrada, tamanho in conexao.execute(
+                'SELECT chave, tamanho FROM resultados ORDER BY acessado_em').fetchall():
+            if excesso <= 0:
+                break
+            removidas.append((chave_entrada,))
+            excesso -= tamanho
+        conexao.executemany('DELETE FROM resultados WHERE chave = ?', removidas)
+
+    def limpar(self, versao_atual=None):
+        """Remove entradas expiradas e de outras versões dos dados; retorna quantas."""
+        conexao = self._conexao()
+        cursor = conexao.execute('DELETE FROM resultados WHERE versao != ? OR expira_em < ?',
+                                 (versao_atual or dados.versao_dados(), time.time()))
+        return cursor.rowcount
+
+    def esvaziar(self):
+        self._conexao().execute('DELETE FROM resultados')
+        self._conexao().execute('VACUUM')
+
+    def estatisticas(self):
+        linhas = self._conexao().execute(
+            'SELECT nome, versao, count(*), sum(tamanho) FROM resultados GROUP BY nome, versao ORDER BY nome'
+        ).fetchall()
+        return [{'nome': nome, 'versao': versao, 'entradas': entradas, 'bytes': tamanho}
+                for nome, versao, entradas, tamanho in linhas]
+
+
+CACHE = CacheDisco()
+
+
+def em_disco(nome=None, ttl=TTL_PADRAO, cache=None, dependencias=(), versao=None):
+    """Decorador: guarda o resultado no cache em disco, por argumentos, versão dos dados e do código.
+
+    Os argumentos devem identificar o resultado por inteiro (não passar DataFrames).
+    Se a função recebe ``diretorio``, a versão é a do armazém nesse diretório.
+    ``dependencias`` (módulos) e ``versao`` compõem a versão do código (``versao_codigo``):
+    listar os módulos cujo código altera o resultado, ou mudar ``versao`` quando
+    a mudança estiver fora deles.
+    Falhas do SQLite, resultados que não se serializam e entradas que não se
+    desserializam não interrompem a chamada: a função é executada sem cache (e a
+    entrada ilegível é apagada).
+    """
+    def decorador(funcao):
+        nome_funcao = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+        codigo = versao_codigo(funcao, dependencias, versao)
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not ATIVO:
+                return funcao(*args, **kwargs)
+            destino = cache or CACHE
+            versao_dados = dados.versao_dados(kwargs.get('diretorio'))
+            chave_entrada = chave(nome_funcao, versao_dados, args, kwargs, codigo)
+            try:
+                encontrado, valor = destino.obter(chave_entrada)
+            except sqlite3.Error:
+                return funcao(*args, **kwargs)
+            if encontrado:
+                return valor
+            valor = funcao(*args, **kwargs)
+            try:
+                destino.guardar(chave_entrada, nome_funcao, versao_dados, valor, ttl)
+            except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+                pass  # resultado que não se serializa (ex.: objetos locais, conexões) fica sem cache
+            return valor
+        envolvida.versao_codigo = codigo
+        return envolvida
+    return decorador
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('acao', choices=['estatisticas', 'limpar', 'esvaziar'])
+    parser.add_argument('--arquivo', type=Path, default=ARQUIVO_CACHE)
+    args = parser.parse_args()
+
+    cache = CacheDisco(args.arquivo)
+    if args.acao == 'limpar':
+        print(f"{cache.limpar()} entradas removidas")
+    elif args.acao == 'esvaziar':
+        cache.esvaziar()
+    else:
+        total = 0
+        for linha in cache.estatisticas():
+            total += linha['bytes']
+            print(f"{linha['nome']:<50}{linha['versao']:>24}{linha['entradas']:>6}"
+                  f"{linha['bytes'] / 1024:>10.1f} KB")
+        print(f"Total: {total / 1024 ** 2:.1f} MB de {cache.tamanho_max / 1024 ** 2:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
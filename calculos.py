@@ -0,0 +1,56 @@
+"""Cálculos das páginas do dashboard, separados da renderização.
+
+As funções recebem os DataFrames preparados (``dados.preparar``) e não dependem
+do Streamlit, de modo que o benchmark (``benchmark_caminhos.py``) mede o mesmo
+código que roda a cada interação.
+"""
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+def figura_faixas_horas(contagem, porcentagem):
+    fig_faixas = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # Adicionar barras (contagem absoluta)
+    fig_faixas.add_trace(
+        go.Bar(
+            x=contagem.index,
+            y=contagem.values,
+            name="Número de Pessoas",
+            marker_color='#3498db',
+            opacity=0.7,
+            marker_line=dict(color='#ffffff', width=1)
+        ),
+        secondary_y=False
+    )
+
+    # Adicionar linha (porcentagem com depressão)
+    fig_faixas.add_trace(
+        go.Scatter(
+            x=porcentagem.index,
+            y=porcentagem.values,
+            name="% com Depressão",
+            line=dict(color='#e74c3c', width=3),
+            mode='lines+markers',
+            marker=dict(size=8, color='#ffffff', line=dict(width=1, color='#e74c3c'))
+        ),
+        secondary_y=True
+    )
+
+    fig_faixas.update_layout(
+        title="Prevalência de Depressão por Faixa de Horas Trabalhadas",
+        xaxis_title="Faixa de Horas Semanais",
+        yaxis_title="Número de Pessoas",
+        yaxis2_title="% com Depressão",
+        hovermode="x unified",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig_faixas
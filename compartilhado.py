@@ -0,0 +1,128 @@
+"""Conjunto de dados preparado compartilhado entre processos via memória mapeada.
+
+Uso:
+    python compartilhado.py publicar          # publica a versão atual dos dados
+    python compartilhado.py limpar            # remove versões antigas publicadas
+    DADOS_COMPARTILHADOS=1 streamlit run dashboard_depressao_backup.py
+
+O DataFrame de ``dados.preparar`` é gravado uma vez como arquivo Arrow IPC sem
+compressão em ``/dev/shm/pns`` (configurável por ``PNS_MEMORIA_COMPARTILHADA``).
+Cada processo do Streamlit mapeia o arquivo em memória e monta um DataFrame com
+colunas ``pd.ArrowDtype`` que apontam diretamente para as páginas mapeadas: não
+há desserialização nem cópia, e o sistema operacional mantém uma única cópia
+física por máquina, qualquer que seja o número de processos. Os arrays Arrow são
+imutáveis, então nenhum processo consegue alterar os dados dos demais.
+"""
+import argparse
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+import dados
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos (ver _trava)
+    fcntl = None
+
+DIRETORIO_COMPARTILHADO = Path(os.environ.get('PNS_MEMORIA_COMPARTILHADA', '/dev/shm/pns'))
+# Os dashboards usam o conjunto compartilhado quando DADOS_COMPARTILHADOS=1
+ATIVO = os.environ.get('DADOS_COMPARTILHADOS') == '1'
+
+
+def caminho_publicado(versao, diretorio=None):
+    return Path(diretorio or DIRETORIO_COMPARTILHADO) / f"preparado-{versao}.arrow"
+
+
+def publicar(df, versao, diretorio=None):
+    """Grava ``df`` como Arrow IPC (troca atômica) e retorna o caminho."""
+    destino = caminho_publicado(versao, diretorio)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    temporario = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(temporario), 'wb') as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    os.replace(temporario, destino)
+    return destino
+
+
+def _tipo_pandas(tipo):
+    # Colunas categóricas (dicionário) viram Categorical: o ArrowDtype não as ordena, e só os
+    # códigos (1 byte por linha) são copiados
+    return None if pa.types.is_dictionary(tipo) else pd.ArrowDtype(tipo)
+
+
+def somente_leitura(df):
+    """Versão de ``df`` com colunas Arrow, cujos valores não podem ser alterados no lugar."""
+    return pa.Table.from_pandas(df, preserve_index=False).to_pandas(types_mapper=_tipo_pandas)
+
+
+def anexar(versao, diretorio=None):
+    """DataFrame somente leitura sobre o arquivo publicado (None se não houver)."""
+    caminho = caminho_publicado(versao, diretorio)
+    if not caminho.exists():
+        return None
+    tabela = pa.ipc.open_file(pa.memory_map(str(caminho), 'r')).read_all()
+    return tabela.to_pandas(types_mapper=_tipo_pandas)
+
+
+@contextmanager
+def _trava(versao, diretorio=None):
+    # Sem fcntl, dois processos podem publicar a mesma versão; a troca atômica de publicar
+    # mantém o arquivo íntegro, só o trabalho é repetido
+    if fcntl is None:
+        yield
+        return
+    caminho = caminho_publicado(versao, diretorio).with_suffix('.lock')
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, 'w') as arquivo:
+        fcntl.flock(arquivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+def carregar_compartilhado(versao, diretorio=None):
+    """Anexa a versão publicada; se ainda não existir, um único processo a publica."""
+    df = anexar(versao, diretorio)
+    if df is not None:
+        return df
+    with _trava(versao, diretorio):
+        # Outro processo pode ter publicado enquanto este esperava a trava
+        if not caminho_publicado(versao, diretorio).exists():
+            publicar(dados.preparar(dados.carregar_dataset()), versao, diretorio)
+    return anexar(versao, diretorio)
+
+
+def limpar(versao_atual, diretorio=None):
+    """Remove arquivos de versões antigas (processos que ainda os mapeiam não são afetados)."""
+    removidos = []
+    for caminho in Path(diretorio or DIRETORIO_COMPARTILHADO).glob('preparado-*'):
+        if caminho != caminho_publicado(versao_atual, diretorio) and caminho.suffix != '.lock':
+            caminho.unlink(missing_ok=True)
+            removidos.append(caminho)
+    return removidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica o conjunto preparado em memória compartilhada.")
+    parser.add_argument('acao', choices=['publicar', 'limpar'])
+    parser.add_argument('--diretorio', type=Path, default=DIRETORIO_COMPARTILHADO)
+    args = parser.parse_args()
+
+    versao = dados.versao_dados()
+    if args.acao == 'publicar':
+        caminho = publicar(dados.preparar(dados.carregar_dataset()), versao, args.diretorio)
+        print(f"{caminho} ({caminho.stat().st_size / 1024 ** 2:.1f} MB)")
+    else:
+        for caminho in limpar(versao, args.diretorio):
+            print(f"removido {caminho}")
+
+
+if __name__ == '__main__':
+    main()
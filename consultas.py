@@ -0,0 +1,178 @@
+"""Consultas de contagem (group-by e tabelas cruzadas) direto sobre o armazém colunar.
+
+Uso:
+    from consultas import contar, tabela_cruzada
+    contar(['Medicamento_Depressao'], {'Diagnostico_Depressao': 1})
+    tabela_cruzada('Violencia_Verbal', 'Diagnostico_Depressao')
+    contar(['Sexo'], {'Idade_Morador': (30, 39)}, edicoes=(2013, 2019), motor='pandas')
+    depressao_por_violencia('Violencia_Verbal')      # consultas das páginas do dashboard
+    media('Frequencia_Problemas_Sono', 'Violencia_Verbal', {'Violencia_Verbal': [1, 2]})
+
+Em vez de materializar o DataFrame inteiro e agrupar em pandas, a consulta é
+enviada a um motor que lê só as colunas usadas (projeção) e descarta as linhas
+fora dos filtros na leitura (predicado), com execução vetorizada e em várias
+threads:
+
+- ``duckdb``: SQL sobre os Parquet do armazém (ou sobre o CSV), se o pacote
+  ``duckdb`` estiver instalado;
+- ``arrow``: ``pyarrow.dataset`` + ``group_by`` do Acero, sempre disponível;
+- ``pandas``: ``carregar_dataset`` + ``groupby``, o caminho de referência.
+
+O motor padrão é o ``arrow``, que não depende de pacote opcional;
+``CONSULTAS_MOTOR`` ou o argumento ``motor`` escolhem outro. Os três motores
+dão o mesmo resultado (``tests/test_consultas.py``). Filtros: valor único
+(igualdade), lista/conjunto (pertence) ou tupla ``(mínimo, máximo)`` (intervalo
+fechado). Como em ``agregados.py``, o resultado
+tem as dimensões codificadas e ``Quantidade``; linhas com dimensão ausente
+("Não aplicável") não são contadas.
+
+As páginas Fatores Associados (violência, sintomas, atividades sociais) e
+Tratamento e Saúde usam estas consultas em vez de agrupar o DataFrame em memória.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from dados import (CAMINHO_CSV, DIRETORIO_ARMAZEM, EDICAO_ATUAL, ROTULOS, carregar_dataset, ler_manifesto,
+                   normalizar_tipos)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+def _fontes(edicao, diretorio=None):
+    """(arquivos, formato) de uma edição: partes Parquet do armazém ou o CSV original."""
+    manifesto = ler_manifesto(diretorio)
+    if manifesto is None:
+        if edicao != EDICAO_ATUAL:
+            raise FileNotFoundError("Edições anteriores exigem o armazém de dados (ingestao.py)")
+        return [str(CAMINHO_CSV)], 'csv'
+    particao = manifesto['edicoes'].get(str(edicao))
+    if particao is None:
+        raise KeyError(f"Edição {edicao} não está no armazém")
+    base = Path(diretorio or DIRETORIO_ARMAZEM)
+    return [str(base / parte) for parte in particao['partes']], 'parquet'
+
+
+def _contar_duckdb(edicao, dimensoes, filtros, diretorio):
+    arquivos, formato = _fontes(edicao, diretorio)
+    if formato == 'parquet':
+        origem = f"read_parquet([{', '.join('?' for _ in arquivos)}])"
+    else:
+        origem = "read_csv(?, delim = ';', header = true)"
+    parametros = list(arquivos)
+    condicoes = [f'"{dimensao}" IS NOT NULL' for dimensao in dimensoes]
+    for coluna, valor in filtros.items():
+        if isinstance(valor, tuple):
+            condicoes.append(f'"{coluna}" BETWEEN ? AND ?')
+            parametros += list(valor)
+        elif isinstance(valor, (list, set, frozenset)):
+            condicoes.append(f'"{coluna}" IN ({", ".join("?" for _ in valor)})')
+            parametros += list(valor)
+        else:
+            condicoes.append(f'"{coluna}" = ?')
+            parametros.append(valor)
+    colunas = ', '.join(f'"{dimensao}"' for dimensao in dimensoes)
+    sql = (f"SELECT {colunas}, count(*) AS Quantidade FROM {origem} "
+           f"WHERE {' AND '.join(condicoes)} GROUP BY {colunas}")
+    with duckdb.connect() as conexao:
+        return conexao.execute(sql, parametros).df()
+
+
+def _filtro_arrow(dimensoes, filtros):
+    import pyarrow.compute as pc
+
+    condicoes = [pc.field(dimensao).is_valid() for dimensao in dimensoes]
+    for coluna, valor in filtros.items():
+        campo = pc.field(coluna)
+        if isinstance(valor, tuple):
+            condicoes.append((campo >= valor[0]) & (campo <= valor[1]))
+        elif isinstance(valor, (list, set, frozenset)):
+            condicoes.append(campo.isin(list(valor)))
+        else:
+            condicoes.append(campo == valor)
+    filtro = condicoes[0]
+    for condicao in condicoes[1:]:
+        filtro = filtro & condicao
+    return filtro
+
+
+def _contar_arrow(edicao, dimensoes, filtros, diretorio):
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+
+    arquivos, formato = _fontes(edicao, diretorio)
+    if formato == 'csv':
+        formato = ds.CsvFileFormat(parse_options=pa_csv.ParseOptions(delimiter=';'))
+    conjunto = ds.dataset(arquivos, format=formato)
+    # Só as colunas das dimensões e as linhas que passam nos filtros saem da leitura
+    tabela = conjunto.to_table(columns=list(dimensoes), filter=_filtro_arrow(dimensoes, filtros))
+    contagens = tabela.group_by(list(dimensoes), use_threads=True).aggregate([([], 'count_all')])
+    return contagens.to_pandas().rename(columns={'count_all': 'Quantidade'})
+
+
+def _contar_pandas(edicao, dimensoes, filtros, diretorio):
+    df = carregar_dataset(colunas=list(dict.fromkeys([*dimensoes, *filtros])), edicoes=(edicao,),
+                          diretorio=diretorio)
+    mascara = pd.Series(True, index=df.index)
+    for coluna, valor in filtros.items():
+        if isinstance(valor, tuple):
+            mascara &= df[coluna].between(*valor)
+        elif isinstance(valor, (list, set, frozenset)):
+            mascara &= df[coluna].isin(list(valor))
+        else:
+            mascara &= df[coluna] == valor
+    return df[mascara].groupby(list(dimensoes)).size().rename('Quantidade').reset_index()
+
+
+MOTORES = {'duckdb': _contar_duckdb, 'arrow': _contar_arrow, 'pandas': _contar_pandas}
+MOTORES_DISPONIVEIS = [motor for motor in MOTORES if motor != 'duckdb' or duckdb is not None]
+MOTOR_PADRAO = os.environ.get('CONSULTAS_MOTOR', 'arrow')
+
+
+def contar(dimensoes, filtros=None, edicoes=(EDICAO_ATUAL,), diretorio=None, motor=None):
+    """Contagem de respondentes por combinação de ``dimensoes`` entre os que passam em ``filtros``.
+
+    Com mais de uma edição, a coluna ``Edicao`` identifica a origem de cada contagem.
+    """
+    motor = motor or MOTOR_PADRAO
+    if motor not in MOTORES_DISPONIVEIS:
+        raise ValueError(f"Motor de consulta indisponível: {motor} (disponíveis: {MOTORES_DISPONIVEIS})")
+    dimensoes = [dimensoes] if isinstance(dimensoes, str) else list(dimensoes)
+    quadros = []
+    for edicao in edicoes:
+        resultado = MOTORES[motor](edicao, dimensoes, filtros or {}, diretorio)
+        resultado = normalizar_tipos(resultado[dimensoes + ['Quantidade']]).astype({'Quantidade': 'int64'})
+        if len(edicoes) > 1:
+            resultado['Edicao'] = edicao
+        quadros.append(resultado)
+    ordem = dimensoes if len(edicoes) == 1 else ['Edicao'] + dimensoes
+    return pd.concat(quadros, ignore_index=True).sort_values(ordem, ignore_index=True)
+
+
+def tabela_cruzada(linhas, colunas, filtros=None, normalizar=True, **kwargs):
+    """Tabela ``linhas`` x ``colunas``; com ``normalizar``, % de cada coluna dentro da linha."""
+    contagens = contar([linhas, colunas], filtros, **kwargs)
+    tabela = contagens.pivot_table(index=linhas, columns=colunas, values='Quantidade', aggfunc='sum')
+    if normalizar:
+        tabela = tabela.div(tabela.sum(axis=1), axis=0) * 100
+    return tabela
+
+
+def depressao_por_violencia(violencia_col, **kwargs):
+    """% de Sim e Não no diagnóstico por resposta ao quesito de violência.
+
+    Só entram os diagnósticos Sim (1) e Não (2), como no ``value_counts`` sobre ``dados.preparar``.
+    """
+    tabela = tabela_cruzada(violencia_col, 'Diagnostico_Depressao', {'Diagnostico_Depressao': [1, 2]}, **kwargs)
+    return tabela.rename(columns=ROTULOS['Diagnostico_Depressao'])
+
+
+def media(coluna, por, filtros=None, **kwargs):
+    """Média de ``coluna`` (codificada) por valor de ``por``, calculada das contagens por valor."""
+    contagens = contar([por, coluna], filtros, **kwargs)
+    soma = (contagens[coluna] * contagens['Quantidade']).groupby(contagens[por]).sum()
+    return soma / contagens.groupby(por)['Quantidade'].sum()
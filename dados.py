@@ -0,0 +1,325 @@
+"""Camada de dados da PNS: mapeamentos, esquema e armazenamento colunar.
+
+Os dados ficam em um diretório Parquet (``armazem_pns/``) particionado por
+edição da pesquisa (``dados/edicao=2019/``, ``dados/edicao=2013/``...), com um
+manifesto que registra a versão atual do conjunto. Cada ingestão de arquivo
+delta grava uma nova parte e incrementa a versão; os caches dos dashboards usam
+essa versão como chave, de modo que uma atualização dos dados invalida os caches
+sem reiniciar o processo. Sem armazém, os dados de 2019 são lidos do CSV original.
+"""
+import json
+import os
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+CAMINHO_CSV = Path("pns2019_IA.csv")
+DIRETORIO_ARMAZEM = Path(os.environ.get("ARMAZEM_PNS", "armazem_pns"))
+CAMINHO_DICIONARIO = Path(__file__).with_name("Dicionário.xlsx")
+
+# Edição exibida por padrão e edições conhecidas da pesquisa
+EDICAO_ATUAL = 2019
+EDICOES = (2013, 2019)
+
+ESTADOS = {
+    11: 'Rondônia', 12: 'Acre', 13: 'Amazonas', 14: 'Roraima', 15: 'Pará',
+    16: 'Amapá', 17: 'Tocantins', 21: 'Maranhão', 22: 'Piauí', 23: 'Ceará',
+    24: 'Rio Grande do Norte', 25: 'Paraíba', 26: 'Pernambuco', 27: 'Alagoas',
+    28: 'Sergipe', 29: 'Bahia', 31: 'Minas Gerais', 32: 'Espírito Santo',
+    33: 'Rio de Janeiro', 35: 'São Paulo', 41: 'Paraná', 42: 'Santa Catarina',
+    43: 'Rio Grande do Sul', 50: 'Mato Grosso do Sul', 51: 'Mato Grosso',
+    52: 'Goiás', 53: 'Distrito Federal'
+}
+
+ESTADO_CIVIL = {
+    1: 'Casado(a)',
+    2: 'Divorciado(a)/Separado(a)',
+    3: 'Viúvo(a)',
+    4: 'Solteiro(a)',
+}
+
+RACA = {
+    1: 'Branca',
+    2: 'Preta',
+    3: 'Amarela',
+    4: 'Parda',
+    5: 'Indígena',
+}
+
+SEXO = {1: 'Masculino', 2: 'Feminino'}
+
+# Faixas de horas de trabalho semanais (fechadas à esquerda; o último limite é 121 para incluir 120 horas)
+BINS_HORAS = [0, 20, 40, 60, 80, 100, 121]
+LABELS_HORAS = ['0-20h', '21-40h', '41-60h', '61-80h', '81-100h', '101-120h']
+
+# Faixas etárias usadas no filtro do Panorama Nacional
+FAIXAS_ETARIAS = {
+    "18-29 anos": (18, 29),
+    "30-39 anos": (30, 39),
+    "40-49 anos": (40, 49),
+    "50-59 anos": (50, 59),
+    "60+ anos": (60, 120)
+}
+
+
+def faixa_etaria(idades):
+    """Classifica uma série de idades nas faixas de FAIXAS_ETARIAS (NaN fora delas)."""
+    limites = [minimo for minimo, _ in FAIXAS_ETARIAS.values()]
+    limites.append(max(maximo for _, maximo in FAIXAS_ETARIAS.values()) + 1)
+    return pd.cut(idades, bins=limites, labels=list(FAIXAS_ETARIAS), right=False)
+
+
+# Domínio de cada coluna segundo o Dicionário.xlsx (valores ausentes = "Não aplicável")
+SINTOMAS = [
+    'Frequencia_Problemas_Sono', 'Frequencia_Problemas_Concentracao',
+    'Frequencia_Problemas_Interesse', 'Frequencia_Problemas_Alimentacao',
+    'Frequencia_Sentimento_Deprimido', 'Frequencia_Sentimento_Fracasso',
+    'Frequencia_Pensamentos_Suicidio',
+]
+ESQUEMA = {
+    'Unidade_Federacao': set(ESTADOS),
+    'Sexo': {1, 2},
+    'Idade_Morador': set(range(0, 131)),
+    'Cor_Raca': {1, 2, 3, 4, 5, 9},
+    'Estado_Civil': {1, 2, 3, 4, 9},
+    'Horas_Trabalho_Semana': set(range(0, 121)),
+    'Diagnostico_Depressao': {1, 2, 9},
+    'Medicamento_Depressao': {1, 2, 3},
+    'Uso_Medicamento_Depressao_Ultimas_Semanas': {1, 2, 3, 4},
+    'Frequencia_Visita_Medico_Depressao': {1, 2, 3, 9},
+    'Motivo_Nao_Visitar_Medico_Depressao': set(range(1, 10)) | {99},
+    'Avaliacao_Geral_Saude': {1, 2, 3, 4, 5, 9},
+    'Frequencia_Esporte_Seman': set(range(0, 8)) | {9},
+    'Rede_apoio_familia': {0, 1, 2, 3},
+    'Frequencia_atividades_sociais': {1, 2, 3, 4, 5, 6},
+    'Violencia_Verbal': {1, 2},
+    'Violencia_Fisica_Tapa': {1, 2},
+    'Violencia_Psicologica': {1, 2},
+    **{sintoma: {1, 2, 3, 4, 9} for sintoma in SINTOMAS},
+}
+COLUNAS_OBRIGATORIAS = ['Unidade_Federacao', 'Diagnostico_Depressao', 'Sexo', 'Idade_Morador']
+
+
+def validar_esquema(df, colunas_esperadas=None):
+    """Retorna a lista de problemas encontrados (vazia se o arquivo é válido)."""
+    erros = []
+    for col in COLUNAS_OBRIGATORIAS:
+        if col not in df.columns:
+            erros.append(f"Coluna obrigatória '{col}' ausente")
+    if colunas_esperadas is not None:
+        faltando = set(colunas_esperadas) - set(df.columns)
+        sobrando = set(df.columns) - set(colunas_esperadas)
+        if faltando:
+            erros.append(f"Colunas ausentes em relação ao armazém: {sorted(faltando)}")
+        if sobrando:
+            erros.append(f"Colunas que não existem no armazém: {sorted(sobrando)}")
+
+    for col, dominio in ESQUEMA.items():
+        if col not in df.columns:
+            continue
+        valores = pd.to_numeric(df[col], errors='coerce')
+        nao_numericos = valores.isna() & df[col].notna()
+        if nao_numericos.any():
+            erros.append(f"'{col}': {int(nao_numericos.sum())} valores não numéricos")
+        fora = valores.notna() & ~valores.isin(dominio)
+        if fora.any():
+            exemplos = sorted(valores[fora].unique().tolist())[:5]
+            erros.append(f"'{col}': {int(fora.sum())} valores fora do domínio (ex.: {exemplos})")
+    return erros
+
+
+def normalizar_tipos(df):
+    """Converte as colunas codificadas para float64 (NaN = não aplicável).
+
+    Garante o mesmo esquema Parquet em todas as partes do armazém, tenham elas
+    valores ausentes ou não.
+    """
+    return df.astype({col: 'float64' for col in df.columns if col in ESQUEMA})
+
+
+# --- Esquema comum entre edições ---
+
+# Códigos do dicionário que não trazem o nome da variável ao lado
+CODIGOS_SEM_NOME = {
+    'V0001': 'Unidade_Federacao',
+    'V00201': 'Violencia_Verbal',
+    'V00202': 'Violencia_Psicologica',
+    'V01401': 'Violencia_Fisica_Tapa',
+}
+
+# Códigos de 2013 que diferem dos de 2019 (código 2013 -> nome no esquema comum).
+# Para as colunas do esquema não há nenhum: os quesitos de identificação, de
+# diagnóstico e do PHQ-9 (V0001, C006, C008, C009, C011, Q092, N001, N010 a N018)
+# têm o mesmo código e as mesmas categorias nas duas edições, e o módulo de
+# violência (V00201, V00202, V01401) só existe em 2019, então essas colunas ficam
+# ausentes na partição de 2013 em vez de serem renomeadas.
+CODIGOS_POR_EDICAO = {
+    2013: {},
+}
+
+
+@lru_cache(maxsize=1)
+def ler_dicionario(caminho=CAMINHO_DICIONARIO):
+    """Lê o Dicionário.xlsx e retorna {código IBGE: nome da coluna no esquema comum}."""
+    planilha = pd.read_excel(caminho, header=None, usecols=[2])
+    codigos = dict(CODIGOS_SEM_NOME)
+    for celula in planilha[2].dropna().astype(str):
+        encontrado = re.match(r"\s*([A-Z]+\d+)\s*=\s*(\S.*)", celula.replace("\n", " "))
+        if encontrado:
+            codigo, nome = encontrado.groups()
+            codigos[codigo] = re.sub(r"\s+", "", nome)
+    return codigos
+
+
+@lru_cache(maxsize=1)
+def ler_categorias(caminho=CAMINHO_DICIONARIO):
+    """Lê as categorias de resposta do Dicionário.xlsx: {nome da coluna: {código: descrição}}.
+
+    Faixas como "001 a 120" são expandidas; categorias sem código ("Não aplicável",
+    valores em reais) são ignoradas.
+    """
+    planilha = pd.read_excel(caminho, header=None, usecols=[2, 5, 6])
+    nomes = ler_dicionario(caminho)
+    categorias = {}
+    atual = None
+    for variavel, codigo, descricao in planilha.itertuples(index=False):
+        if pd.notna(variavel):
+            encontrado = re.match(r"\s*([A-Z]+\d+)", str(variavel))
+            nome = nomes.get(encontrado.group(1)) if encontrado else None
+            atual = categorias.setdefault(nome, {}) if nome else None
+        if atual is None or pd.isna(codigo):
+            continue
+        texto = str(codigo).strip()
+        descricao = str(descricao).strip()
+        faixa = re.fullmatch(r"(\d+)\s*a\s*(\d+)", texto)
+        if faixa:
+            for valor in range(int(faixa.group(1)), int(faixa.group(2)) + 1):
+                atual[valor] = descricao
+        elif texto.isdigit():
+            atual[int(texto)] = descricao
+    return categorias
+
+
+def nomes_padronizados(colunas, edicao=EDICAO_ATUAL):
+    """{coluna original: nome no esquema comum} para códigos IBGE conhecidos do dicionário."""
+    # Só lê o dicionário se houver colunas com cara de código IBGE
+    if not any(re.fullmatch(r"[A-Z]+\d+", str(col)) for col in colunas):
+        return {}
+    codigos = {**ler_dicionario(), **CODIGOS_POR_EDICAO.get(edicao, {})}
+    return {col: codigos[col] for col in colunas if col in codigos}
+
+
+def padronizar_colunas(df, edicao=EDICAO_ATUAL):
+    """Renomeia colunas com códigos IBGE para os nomes do esquema comum.
+
+    Colunas que já usam os nomes do esquema (como no pns2019_IA.csv) são mantidas.
+    """
+    nomes = nomes_padronizados(df.columns, edicao)
+    return df.rename(columns=nomes) if nomes else df
+
+
+@lru_cache(maxsize=1)
+def ler_posicoes(caminho=CAMINHO_DICIONARIO):
+    """Posição inicial (1 = primeiro caractere) e tamanho de cada código IBGE no arquivo de largura fixa."""
+    planilha = pd.read_excel(caminho, header=None, usecols=[0, 1, 2])
+    posicoes = {}
+    for inicio, tamanho, variavel in planilha.dropna().itertuples(index=False):
+        encontrado = re.match(r"\s*([A-Z]+\d+)", str(variavel))
+        if encontrado and str(inicio).strip().isdigit() and str(tamanho).strip().isdigit():
+            posicoes[encontrado.group(1)] = (int(inicio), int(tamanho))
+    return posicoes
+
+
+# --- Armazém colunar versionado ---
+
+def _caminho_manifesto(diretorio=None):
+    return Path(diretorio or DIRETORIO_ARMAZEM) / "manifesto.json"
+
+
+def ler_manifesto(diretorio=None):
+    """Manifesto do armazém (None se o armazém ainda não foi criado)."""
+    caminho = _caminho_manifesto(diretorio)
+    if not caminho.exists():
+        return None
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def gravar_manifesto(manifesto, diretorio=None):
+    """Grava o manifesto de forma atômica (escreve em arquivo temporário e renomeia)."""
+    caminho = _caminho_manifesto(diretorio)
+    temporario = caminho.with_suffix('.tmp')
+    manifesto = {**manifesto, 'atualizado_em': datetime.now(timezone.utc).isoformat()}
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def versao_dados(diretorio=None):
+    """Identificador da versão atual dos dados, usado como chave dos caches."""
+    manifesto = ler_manifesto(diretorio)
+    if manifesto is not None:
+        return f"v{manifesto['versao']}"
+    if CAMINHO_CSV.exists():
+        return f"csv-{CAMINHO_CSV.stat().st_mtime_ns}"
+    return "sem-dados"
+
+
+def edicoes_disponiveis(diretorio=None):
+    """Edições presentes no armazém (só a atual quando se usa o CSV)."""
+    manifesto = ler_manifesto(diretorio)
+    if manifesto is None:
+        return [EDICAO_ATUAL] if CAMINHO_CSV.exists() else []
+    return sorted(int(edicao) for edicao in manifesto['edicoes'])
+
+
+def carregar_dataset(colunas=None, edicoes=(EDICAO_ATUAL,), diretorio=None):
+    """Lê os dados codificados das edições pedidas (só as partições necessárias).
+
+    Com mais de uma edição, a coluna ``Edicao`` identifica a origem de cada linha.
+    """
+    manifesto = ler_manifesto(diretorio)
+    if manifesto is None:
+        if list(edicoes) != [EDICAO_ATUAL]:
+            raise FileNotFoundError("Edições anteriores exigem o armazém de dados (ingestao.py)")
+        return pd.read_csv(CAMINHO_CSV, sep=';', encoding='utf-8', usecols=colunas)
+
+    base = Path(diretorio or DIRETORIO_ARMAZEM)
+    quadros = []
+    for edicao in edicoes:
+        particao = manifesto['edicoes'].get(str(edicao))
+        if particao is None:
+            raise KeyError(f"Edição {edicao} não está no armazém")
+        existentes = colunas and [col for col in colunas if col in particao['colunas']]
+        partes = [pd.read_parquet(base / parte, columns=existentes or None) for parte in particao['partes']]
+        df = pd.concat(partes, ignore_index=True)
+        if len(edicoes) > 1:
+            df['Edicao'] = edicao
+        quadros.append(df)
+    return pd.concat(quadros, ignore_index=True)
+
+
+# Colunas codificadas -> rótulos exibidos nos dashboards
+ROTULOS = {
+    'Unidade_Federacao': ESTADOS,
+    'Estado_Civil': ESTADO_CIVIL,
+    'Cor_Raca': RACA,
+    'Sexo': SEXO,
+    'Diagnostico_Depressao': {1: 'Sim', 2: 'Não'},
+}
+
+
+def rotular(df):
+    """Cópia de ``df`` com os rótulos de ``ROTULOS`` nas colunas presentes (códigos sem rótulo viram NaN)."""
+    return df.assign(**{col: df[col].map(rotulos) for col, rotulos in ROTULOS.items() if col in df.columns})
+
+
+def preparar(df):
+    """Aplica os rótulos usados pelos dashboards e cria as faixas de horas de trabalho."""
+    df = rotular(df)
+    df['Faixa_Horas_Trabalho'] = pd.cut(df['Horas_Trabalho_Semana'], bins=BINS_HORAS,
+                                        labels=LABELS_HORAS, right=False)
+    return df
@@ -0,0 +1,175 @@
+"""Gerador de dados sintéticos no formato do pns2019_IA.csv.
+
+Uso:
+    python dados_sinteticos.py 100000 --saida pns_sintetico.csv
+    python dados_sinteticos.py 20000000 --saida pns_sintetico.parquet --tamanho-parte 1000000
+    python dados_sinteticos.py 1000000 --semente 7 --prevalencia 0.12
+
+Os códigos de cada coluna de ``dados.ESQUEMA`` vêm das categorias do
+Dicionário.xlsx (UF 11 a 53, sexo 1/2, frequências 1 a 4 e 9...), e os códigos
+de "Ignorado"/"Não sabe" recebem só uma pequena fração das respostas. O
+diagnóstico segue a prevalência pedida; as perguntas de tratamento só são
+respondidas por quem tem diagnóstico e os sintomas são mais frequentes nesse
+grupo, de modo que filtros, agregações e o treino do modelo encontram a mesma
+estrutura dos dados reais. Os valores não têm relação com as respostas da PNS.
+
+As linhas são geradas e gravadas em partes de ``--tamanho-parte`` linhas (CSV
+ou Parquet, conforme a extensão da saída), com memória limitada ao tamanho de
+uma parte qualquer que seja o total. Parquet pode ir direto para o armazém:
+``python ingestao.py inicializar pns_sintetico.parquet``.
+"""
+import argparse
+import math
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dados import ESQUEMA, SINTOMAS, ler_categorias
+
+# PNS 2019: 10,2% dos adultos com diagnóstico de depressão
+PREVALENCIA_DEPRESSAO = 0.102
+# Fração das respostas com códigos de "Ignorado"/"Não sabe" em cada quesito
+FRACAO_IGNORADO = 0.01
+TAMANHO_PARTE = 500_000
+
+# Colunas do CSV cujo nome difere do Dicionário.xlsx
+NOMES_NO_DICIONARIO = {'Frequencia_Esporte_Seman': 'Frequencia_Esporte_Semana'}
+
+# Perguntas respondidas só por quem tem diagnóstico (demais linhas ficam "Não aplicável")
+COLUNAS_SO_DIAGNOSTICO = [
+    'Medicamento_Depressao', 'Uso_Medicamento_Depressao_Ultimas_Semanas',
+    'Frequencia_Visita_Medico_Depressao', 'Motivo_Nao_Visitar_Medico_Depressao',
+]
+
+# Proporção de "Não aplicável" em quesitos que dependem de outras respostas
+AUSENTES = {'Horas_Trabalho_Semana': 0.4, 'Violencia_Psicologica': 0.1}
+
+# Distribuição dos códigos 1 a 4 dos sintomas com e sem diagnóstico
+SINTOMAS_COM_DIAGNOSTICO = [0.2, 0.5, 0.2, 0.1]
+SINTOMAS_SEM_DIAGNOSTICO = [0.6, 0.3, 0.05, 0.05]
+
+# Os quesitos de saúde mental são respondidos pelo morador de 15 anos ou mais
+IDADES = (15, 99)
+
+FORMATO_CSV = {'sep': ';', 'index': False, 'encoding': 'utf-8', 'float_format': '%.0f'}
+
+
+def dominios():
+    """{coluna: (códigos válidos, códigos de ignorado)} segundo o Dicionário.xlsx.
+
+    Os códigos são restritos ao ``dados.ESQUEMA``, que a ingestão valida; colunas
+    ausentes do dicionário usam o domínio do esquema.
+    """
+    categorias = ler_categorias()
+    resultado = {}
+    for coluna, dominio in ESQUEMA.items():
+        descricoes = categorias.get(NOMES_NO_DICIONARIO.get(coluna, coluna), dict.fromkeys(dominio, ''))
+        codigos = sorted(set(descricoes) & dominio)
+        ignorados = [codigo for codigo in codigos if re.search(r"Ignorado|Não sabe", descricoes[codigo])]
+        resultado[coluna] = ([codigo for codigo in codigos if codigo not in ignorados], ignorados)
+    return resultado
+
+
+def _sortear(gerador, validos, ignorados, n, probabilidades=None):
+    """Sorteia códigos válidos (uniforme ou com ``probabilidades``) e uma fração de ignorados."""
+    pesos = np.full(len(validos), 1 / len(validos)) if probabilidades is None else np.asarray(probabilidades)
+    if ignorados:
+        pesos = np.concatenate([pesos * (1 - FRACAO_IGNORADO),
+                                np.full(len(ignorados), FRACAO_IGNORADO / len(ignorados))])
+    return gerador.choice(np.asarray(validos + ignorados, dtype='float64'), n, p=pesos)
+
+
+def _gerar_parte(n, gerador, prevalencia, dominios_colunas):
+    com_diagnostico = gerador.random(n) < prevalencia
+    colunas = {}
+    for coluna, (validos, ignorados) in dominios_colunas.items():
+        if coluna == 'Diagnostico_Depressao':
+            valores = np.where(com_diagnostico, 1.0, 2.0)
+            valores[gerador.random(n) < FRACAO_IGNORADO] = ignorados[0] if ignorados else np.nan
+        elif coluna == 'Idade_Morador':
+            valores = gerador.integers(IDADES[0], IDADES[1] + 1, n).astype('float64')
+        elif coluna in SINTOMAS:
+            valores = np.where(com_diagnostico,
+                               _sortear(gerador, validos, ignorados, n, SINTOMAS_COM_DIAGNOSTICO),
+                               _sortear(gerador, validos, ignorados, n, SINTOMAS_SEM_DIAGNOSTICO))
+        else:
+            valores = _sortear(gerador, validos, ignorados, n)
+        if coluna in COLUNAS_SO_DIAGNOSTICO:
+            valores[~com_diagnostico] = np.nan
+        if coluna in AUSENTES:
+            valores[gerador.random(n) < AUSENTES[coluna]] = np.nan
+        colunas[coluna] = valores
+    return pd.DataFrame(colunas)
+
+
+def gerar_partes(n, semente=42, prevalencia=PREVALENCIA_DEPRESSAO, tamanho_parte=TAMANHO_PARTE):
+    """Gera ``n`` linhas codificadas (float64, NaN = não aplicável) em DataFrames de até ``tamanho_parte``.
+
+    Cada parte tem sua própria semente derivada de ``semente``: o resultado é
+    reprodutível para o mesmo tamanho de parte.
+    """
+    dominios_colunas = dominios()
+    sementes = np.random.SeedSequence(semente).spawn(max(1, math.ceil(n / tamanho_parte)))
+    for i, semente_parte in enumerate(sementes):
+        linhas = min(tamanho_parte, n - i * tamanho_parte)
+        yield _gerar_parte(linhas, np.random.default_rng(semente_parte), prevalencia, dominios_colunas)
+
+
+def gerar(n, semente=42, prevalencia=PREVALENCIA_DEPRESSAO):
+    """DataFrame com ``n`` linhas codificadas, gerado de uma vez (para tamanhos que cabem em memória)."""
+    return pd.concat(gerar_partes(n, semente, prevalencia), ignore_index=True)
+
+
+def gravar_csv(df, caminho):
+    """Grava no mesmo formato do CSV original (``;``, códigos inteiros, vazio = ausente)."""
+    df.to_csv(caminho, **FORMATO_CSV)
+
+
+def gravar(caminho, n, semente=42, prevalencia=PREVALENCIA_DEPRESSAO, tamanho_parte=TAMANHO_PARTE):
+    """Gera e grava ``n`` linhas parte a parte em CSV ou Parquet (pela extensão); troca atômica."""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(f"{caminho.name}.{os.getpid()}.tmp")
+    partes = gerar_partes(n, semente, prevalencia, tamanho_parte)
+    try:
+        if caminho.suffix == '.parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            escritor = None
+            try:
+                for parte in partes:
+                    tabela = pa.Table.from_pandas(parte, preserve_index=False)
+                    if escritor is None:
+                        escritor = pq.ParquetWriter(temporario, tabela.schema)
+                    escritor.write_table(tabela)
+            finally:
+                if escritor is not None:
+                    escritor.close()
+        else:
+            for i, parte in enumerate(partes):
+                parte.to_csv(temporario, header=i == 0, mode='w' if i == 0 else 'a', **FORMATO_CSV)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('linhas', type=int)
+    parser.add_argument('--saida', default='pns_sintetico.csv', help='Extensão .csv ou .parquet')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--prevalencia', type=float, default=PREVALENCIA_DEPRESSAO)
+    parser.add_argument('--tamanho-parte', type=int, default=TAMANHO_PARTE)
+    args = parser.parse_args()
+
+    caminho = gravar(args.saida, args.linhas, args.semente, args.prevalencia, args.tamanho_parte)
+    print(f"{args.linhas} linhas gravadas em {caminho} ({caminho.stat().st_size / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import joblib
-from collections import Counter
+import dados
 
 # Configurações da página
 st.set_page_config(
@@ -39,52 +37,24 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Carregar dados
+# Carregar dados (a versão dos dados faz parte da chave do cache)
 @st.cache_data
-def load_data():
-    caminho_arquivo = r"pns2019_IA.csv" 
-    df = pd.read_csv(caminho_arquivo, sep=';', encoding='utf-8')
-    
-    # Mapeamentos
-    estados = {
-        11: 'Rondônia', 12: 'Acre', 13: 'Amazonas', 14: 'Roraima', 15: 'Pará',
-        16: 'Amapá', 17: 'Tocantins', 21: 'Maranhão', 22: 'Piauí', 23: 'Ceará',
-        24: 'Rio Grande do Norte', 25: 'Paraíba', 26: 'Pernambuco', 27: 'Alagoas',
-        28: 'Sergipe', 29: 'Bahia', 31: 'Minas Gerais', 32: 'Espírito Santo',
-        33: 'Rio de Janeiro', 35: 'São Paulo', 41: 'Paraná', 42: 'Santa Catarina',
-        43: 'Rio Grande do Sul', 50: 'Mato Grosso do Sul', 51: 'Mato Grosso',
-        52: 'Goiás', 53: 'Distrito Federal'
-    }
+def load_data(versao):
+    df = dados.carregar_dataset()
     
-    estado_civil_map = {
-        1: 'Casado(a)',
-        2: 'Divorciado(a)/Separado(a)',
-        3: 'Viúvo(a)',
-        4: 'Solteiro(a)',
-    }
-
-    raca_map = {
-        1: 'Branca',
-        2: 'Preta',
-        3: 'Amarela',
-        4: 'Parda',
-        5: 'Indígena',
-    }
-
     # Aplicar transformações
-    df['Unidade_Federacao'] = df['Unidade_Federacao'].map(estados)
-    df['Estado_Civil'] = df['Estado_Civil'].map(estado_civil_map)
-    df['Cor_Raca'] = df['Cor_Raca'].map(raca_map)
-    df['Sexo'] = df['Sexo'].map({1: 'Masculino', 2: 'Feminino'})
+    df['Unidade_Federacao'] = df['Unidade_Federacao'].map(dados.ESTADOS)
+    df['Estado_Civil'] = df['Estado_Civil'].map(dados.ESTADO_CIVIL)
+    df['Cor_Raca'] = df['Cor_Raca'].map(dados.RACA)
+    df['Sexo'] = df['Sexo'].map(dados.SEXO)
     
     # Criar faixas de horas de trabalho
-    bins = [0, 20, 40, 60, 80, 100, 120]
-    labels = ['0-20h', '21-40h', '41-60h', '61-80h', '81-100h', '101-120h']
-    df['Faixa_Horas_Trabalho'] = pd.cut(df['Horas_Trabalho_Semana'], bins=bins, labels=labels, right=False)
+    df['Faixa_Horas_Trabalho'] = pd.cut(df['Horas_Trabalho_Semana'], bins=dados.BINS_HORAS,
+                                        labels=dados.LABELS_HORAS, right=False)
     
     return df
 
-df = load_data()
+df = load_data(dados.versao_dados())
 df_depressao = df[df['Diagnostico_Depressao'] == 1]
 total_depressao = df_depressao.shape[0]
 
@@ -0,0 +1,77 @@
+"""Filtro cruzado entre os gráficos do Panorama Nacional.
+
+Uso:
+    filtro = FiltroCruzado()
+    filtro.selecionar('Cor_Raca', ['Parda'])
+    tabelas = filtro.tabelas(indice, 18, 65)     # um DataFrame por gráfico
+    filtro.alterados                              # gráficos que precisam ser redesenhados
+    filtro.niveis(indice, 18, 65)                 # país, regiões e estados (geografia.consolidar)
+
+Cada gráfico mostra os casos de depressão por uma dimensão, filtrados pelas
+seleções feitas nos outros gráficos (a própria seleção só destaca as barras).
+As tabelas vêm do ``IndiceIdade``, sem percorrer os microdados, e ficam
+guardadas com a chave dos filtros que as afetam: ao mudar a seleção de uma
+dimensão, só os gráficos das outras dimensões são recalculados, e um gráfico
+só é redesenhado se a sua tabela ou o seu destaque mudaram.
+"""
+import geografia
+
+# Gráfico -> dimensão do índice que ele mostra (e que as seleções nele filtram)
+GRAFICOS = {'sexo': 'Sexo', 'raca': 'Cor_Raca', 'estados': 'Unidade_Federacao'}
+
+
+class FiltroCruzado:
+    def __init__(self, graficos=GRAFICOS):
+        self.graficos = dict(graficos)
+        self.selecoes = {}
+        self.alterados = []
+        self._tabelas = {}
+        self._chaves_graficos = {}
+
+    def selecionar(self, dimensao, valores):
+        """Substitui a seleção da dimensão; uma seleção vazia a remove."""
+        valores = tuple(sorted(valores))
+        if valores:
+            self.selecoes[dimensao] = valores
+        else:
+            self.selecoes.pop(dimensao, None)
+
+    def limpar(self):
+        self.selecoes = {}
+
+    def filtros(self, grafico):
+        """Seleções que filtram ``grafico``: as de todas as outras dimensões."""
+        dimensao = self.graficos[grafico]
+        return {nome: valores for nome, valores in sorted(self.selecoes.items()) if nome != dimensao}
+
+    def selecao(self, grafico):
+        return self.selecoes.get(self.graficos[grafico], ())
+
+    def tabelas(self, indice, idade_min=None, idade_max=None):
+        """Casos por dimensão de cada gráfico, recalculando só as tabelas cujos filtros mudaram."""
+        self.alterados = []
+        for grafico, dimensao in self.graficos.items():
+            filtros = self.filtros(grafico)
+            chave = (indice, idade_min, idade_max, tuple(filtros.items()))
+            anterior = self._tabelas.get(grafico)
+            if anterior is None or anterior[0] != chave:
+                tabela = indice.tabela(dimensao, idade_min, idade_max, Diagnostico_Depressao='Sim', **filtros)
+                self._tabelas[grafico] = (chave, tabela)
+            # Redesenho: tabela nova ou destaque (seleção no próprio gráfico) diferente
+            chave_grafico = (chave, self.selecao(grafico))
+            if self._chaves_graficos.get(grafico) != chave_grafico:
+                self._chaves_graficos[grafico] = chave_grafico
+                self.alterados.append(grafico)
+        return {grafico: tabela for grafico, (_, tabela) in self._tabelas.items()}
+
+    def niveis(self, indice, idade_min=None, idade_max=None):
+        """Casos e entrevistados por país, região e estado (``geografia.consolidar``) com os filtros do mapa.
+
+        Usa a tabela de casos por estado já calculada por ``tabelas``. O total conta só quem
+        respondeu Sim ou Não ao diagnóstico, como em ``agregados.prevalencia_por_edicao``.
+        """
+        casos = self._tabelas['estados'][1].rename(columns={'Unidade_Federacao': 'Estado'})
+        totais = indice.tabela('Unidade_Federacao', idade_min, idade_max,
+                               Diagnostico_Depressao=['Sim', 'Não'], **self.filtros('estados'))
+        totais = totais.rename(columns={'Unidade_Federacao': 'Estado', 'Quantidade': 'Total'})
+        return geografia.consolidar(totais.merge(casos, on='Estado', how='left').fillna({'Quantidade': 0}))
@@ -0,0 +1,61 @@
+"""Níveis geográficos (país, região, estado) a partir das contagens por estado.
+
+Uso:
+    niveis = consolidar(tabela_estados)          # colunas Estado (nome ou código UF) + contagens
+    niveis['regiao'], niveis['pais']
+    detalhar(niveis, 'Nordeste')                 # estados de uma região
+
+O primeiro dígito do código da UF no IBGE é a região (1 Norte, 2 Nordeste,
+3 Sudeste, 4 Sul, 5 Centro-Oeste). As contagens são calculadas uma vez por
+estado e somadas para região e país, sem nova passada pelos microdados; taxas
+(``Prevalencia``) são recalculadas em cada nível a partir das somas, nunca como
+média das taxas dos estados.
+"""
+import pandas as pd
+
+from dados import ESTADOS
+
+REGIOES = {1: 'Norte', 2: 'Nordeste', 3: 'Sudeste', 4: 'Sul', 5: 'Centro-Oeste'}
+PAIS = 'Brasil'
+
+CODIGO_ESTADO = {nome: codigo for codigo, nome in ESTADOS.items()}
+
+
+def regiao(estado):
+    """Nome da região de um estado, dado pelo nome ou pelo código da UF."""
+    codigo = CODIGO_ESTADO.get(estado) if isinstance(estado, str) else int(estado)
+    return REGIOES.get(codigo // 10) if codigo is not None else None
+
+
+def _com_prevalencia(tabela):
+    if 'Total' in tabela.columns:
+        tabela = tabela.assign(Prevalencia=(tabela['Quantidade'] / tabela['Total'] * 100).fillna(0))
+    return tabela
+
+
+def consolidar(tabela_estados, coluna='Estado'):
+    """Tabelas por estado, região e país a partir das contagens por estado.
+
+    ``tabela_estados`` tem ``coluna`` e colunas de contagem (``Quantidade`` e, se houver,
+    ``Total``, que dá a ``Prevalencia`` em %).
+    """
+    estados = tabela_estados.rename(columns={coluna: 'Estado'})
+    medidas = [col for col in ('Quantidade', 'Total') if col in estados.columns]
+    estados = estados[['Estado', *medidas]].assign(
+        Regiao=[regiao(estado) for estado in estados['Estado']])
+    regioes = (estados.groupby('Regiao')[medidas].sum()
+               .reindex(list(REGIOES.values()), fill_value=0).reset_index())
+    pais = regioes[medidas].sum().to_frame().T.assign(Pais=PAIS)[['Pais', *medidas]]
+    return {
+        'pais': _com_prevalencia(pais),
+        'regiao': _com_prevalencia(regioes),
+        'estado': _com_prevalencia(estados[['Regiao', 'Estado', *medidas]]),
+    }
+
+
+def detalhar(niveis, regiao_escolhida=None):
+    """Nível abaixo da seleção: regiões do país (sem seleção) ou estados da região."""
+    if regiao_escolhida is None:
+        return niveis['regiao']
+    estados = niveis['estado']
+    return estados[estados['Regiao'] == regiao_escolhida].reset_index(drop=True)
@@ -0,0 +1,74 @@
+"""Índice de somas acumuladas por idade para consultas de faixa etária arbitrária.
+
+Uso:
+    indice = IndiceIdade(dados.preparar(dados.carregar_dataset()))
+    indice = IndiceIdade(dados.rotular(obter_agregados()['cubo_panorama']), contagem='Quantidade')
+    indice.tabela('Unidade_Federacao', 30, 39, Diagnostico_Depressao='Sim')
+    indice.tabela('Cor_Raca', 23, 41, Diagnostico_Depressao='Sim', Sexo=['Feminino'])
+
+O índice é montado uma vez: contagens por (idade, sexo, estado, raça,
+diagnóstico) num array e a soma acumulada ao longo das idades. A contagem de
+qualquer faixa ``[mínimo, máximo]`` é a diferença de duas linhas do acumulado,
+sem percorrer os microdados, de modo que o filtro de idade do Panorama pode ser
+um slider contínuo. O índice pode ser montado dos microdados ou do agregado
+``cubo_panorama``, com as mesmas contagens. Cada dimensão tem uma posição extra para valores ausentes,
+que entram nos totais mas não aparecem nas tabelas (como no ``value_counts``).
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSOES = ('Sexo', 'Unidade_Federacao', 'Cor_Raca', 'Diagnostico_Depressao')
+
+
+class IndiceIdade:
+    def __init__(self, df, dimensoes=DIMENSOES, contagem=None):
+        """Uma linha de ``df`` por entrevistado ou, com ``contagem``, a coluna com quantos cada linha vale."""
+        self.dimensoes = tuple(dimensoes)
+        colunas = ['Idade_Morador', *self.dimensoes, *([contagem] if contagem else [])]
+        df = df.loc[df['Idade_Morador'].notna(), colunas]
+        idades = df['Idade_Morador'].to_numpy(dtype='float64').astype('int64')
+        self.idade_min = int(idades.min()) if len(idades) else 0
+        self.idade_max = int(idades.max()) if len(idades) else 0
+
+        # Categorias de cada dimensão; o código -1 (ausente) vai para a última posição
+        self.categorias, codigos = {}, []
+        for dimensao in self.dimensoes:
+            codigo, categorias = pd.factorize(df[dimensao], sort=True)
+            self.categorias[dimensao] = pd.Index(categorias)
+            codigos.append(np.where(codigo < 0, len(categorias), codigo))
+        formato = (self.idade_max - self.idade_min + 1,
+                   *(len(self.categorias[dimensao]) + 1 for dimensao in self.dimensoes))
+        posicao = np.ravel_multi_index((idades - self.idade_min, *codigos), formato)
+        pesos = df[contagem].to_numpy(dtype='float64') if contagem else None
+        contagens = np.bincount(posicao, weights=pesos, minlength=int(np.prod(formato))).astype('int64')
+        contagens = contagens.reshape(formato)
+
+        # Linha inicial de zeros: a faixa [a, b] é acumulado[b + 1] - acumulado[a]
+        self.acumulado = np.zeros((formato[0] + 1, *formato[1:]), dtype='int64')
+        np.cumsum(contagens, axis=0, out=self.acumulado[1:])
+
+    def contar(self, idade_min=None, idade_max=None):
+        """Contagens por combinação das dimensões entre as idades dadas (inclusive)."""
+        inicio = 0 if idade_min is None else int(np.clip(idade_min - self.idade_min, 0, len(self.acumulado) - 1))
+        fim = (len(self.acumulado) - 1 if idade_max is None
+               else int(np.clip(idade_max - self.idade_min + 1, 0, len(self.acumulado) - 1)))
+        return self.acumulado[max(fim, inicio)] - self.acumulado[inicio]
+
+    def tabela(self, dimensao, idade_min=None, idade_max=None, **filtros):
+        """``dimensao`` e ``Quantidade`` na faixa de idades, filtrando as demais dimensões.
+
+        Cada filtro é um valor ou uma lista/tupla/conjunto de valores aceitos.
+        """
+        contagens = self.contar(idade_min, idade_max)
+        for nome, valor in filtros.items():
+            # Zera as posições fora dos valores aceitos no eixo da dimensão filtrada
+            eixo = self.dimensoes.index(nome)
+            valores = list(valor) if isinstance(valor, (list, tuple, set, frozenset)) else [valor]
+            posicoes = self.categorias[nome].get_indexer(valores)
+            mascara = np.zeros(contagens.shape[eixo], dtype=bool)
+            mascara[posicoes[posicoes >= 0]] = True
+            contagens = contagens * mascara.reshape([-1 if i == eixo else 1 for i in range(contagens.ndim)])
+        eixo = self.dimensoes.index(dimensao)
+        totais = contagens.sum(axis=tuple(i for i in range(contagens.ndim) if i != eixo))[:-1]
+        tabela = pd.DataFrame({dimensao: self.categorias[dimensao], 'Quantidade': totais})
+        return tabela[tabela['Quantidade'] > 0].reset_index(drop=True)
@@ -0,0 +1,251 @@
+"""Ingestão incremental de dados da PNS no armazém colunar.
+
+Uso:
+    python ingestao.py inicializar pns2019_IA.csv                 # cria a partição de 2019
+    python ingestao.py inicializar pns2013.csv --edicao 2013      # cria a partição de 2013
+    python ingestao.py anexar novos_registros.csv                 # valida e anexa um arquivo delta
+    python ingestao.py limpar --carencia 0                        # apaga já os arquivos substituídos
+
+Colunas com códigos IBGE (``C006``, ``Q092``...) são renomeadas para o esquema
+comum a partir do Dicionário.xlsx. Cada arquivo anexado é validado contra o
+esquema, gravado como uma nova parte Parquet da partição da sua edição e tem seus
+agregados somados aos existentes; por fim a versão do manifesto é incrementada,
+o que invalida os caches dos dashboards. Partes e agregados novos vão para
+arquivos novos, que só passam a ser lidos com a troca do manifesto. Uma correção que altera registros já
+ingeridos exige ``inicializar`` da edição com o extrato corrigido.
+
+Os arquivos que o manifesto deixa de usar não são apagados na troca: um leitor em
+outro processo (réplica do dashboard, API) que leu o manifesto anterior ainda pode
+abri-los. Eles ficam registrados em ``obsoletos`` no manifesto e só são apagados
+depois da carência (``PNS_CARENCIA_LIMPEZA``, em segundos; 1 hora por padrão), pela
+próxima ingestão ou por ``python ingestao.py limpar``.
+"""
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from agregados import (agregados_da_particao, calcular_agregados, carregar_agregados, remover_agregados,
+                       salvar_agregados, somar_agregados)
+from dados import (DIRETORIO_ARMAZEM, EDICAO_ATUAL, gravar_manifesto, ler_manifesto, normalizar_tipos,
+                   padronizar_colunas, validar_esquema)
+
+try:
+    import fcntl
+except ImportError:  # Windows: a ingestão recusa rodar sem a trava (ver trava)
+    fcntl = None
+
+
+# Tempo mínimo (s) entre a troca do manifesto e a remoção dos arquivos que ele deixou de usar
+CARENCIA_LIMPEZA = int(os.environ.get('PNS_CARENCIA_LIMPEZA', '3600'))
+
+
+class ErroIngestao(Exception):
+    pass
+
+
+@contextmanager
+def trava(diretorio):
+    """Impede duas ingestões simultâneas no mesmo armazém.
+
+    A trava é um ``flock`` no arquivo ``.ingestao.lock``, liberado pelo sistema quando o
+    processo termina: um processo que caiu no meio da ingestão não bloqueia as seguintes.
+    O arquivo guarda o PID de quem a detém, para a mensagem de erro.
+    """
+    if fcntl is None:
+        raise ErroIngestao("A ingestão exige a trava de arquivo (fcntl), disponível só em Linux e macOS")
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / ".ingestao.lock"
+    with open(caminho, 'a+', encoding='utf-8') as arquivo:
+        try:
+            fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            arquivo.seek(0)
+            dono = arquivo.read().strip() or '?'
+            raise ErroIngestao(f"Outra ingestão está em andamento (PID {dono}, {caminho})")
+        try:
+            arquivo.truncate(0)
+            arquivo.write(str(os.getpid()))
+            arquivo.flush()
+            yield
+        finally:
+            arquivo.truncate(0)
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+def ler_arquivo(caminho, edicao=EDICAO_ATUAL):
+    caminho = Path(caminho)
+    if caminho.suffix == '.parquet':
+        df = pd.read_parquet(caminho)
+    else:
+        df = pd.read_csv(caminho, sep=';', encoding='utf-8')
+    return padronizar_colunas(df, edicao)
+
+
+def gravar_parte(df, diretorio, edicao, versao, numero):
+    # A versão no nome garante que uma parte nova nunca sobrescreve uma parte em uso
+    nome = f"dados/edicao={edicao}/parte-v{versao:05d}-{numero:05d}.parquet"
+    destino = diretorio / nome
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix('.tmp')
+    df.to_parquet(temporario, index=False)
+    temporario.replace(destino)
+    return nome
+
+
+def _separar_vencidos(obsoletos, carencia):
+    """(mantidos, vencidos): vencidos são os substituídos há mais de ``carencia`` segundos."""
+    agora = datetime.now(timezone.utc)
+    mantidos, vencidos = [], []
+    for obsoleto in obsoletos:
+        idade = (agora - datetime.fromisoformat(obsoleto['substituido_em'])).total_seconds()
+        (vencidos if idade >= carencia else mantidos).append(obsoleto)
+    return mantidos, vencidos
+
+
+def _apagar(obsoletos, diretorio):
+    for obsoleto in obsoletos:
+        for parte in obsoleto['partes']:
+            (diretorio / parte).unlink(missing_ok=True)
+        for nome in obsoleto['agregados']:
+            remover_agregados(nome, diretorio)
+
+
+def trocar_manifesto(manifesto, diretorio, partes=(), agregados=None):
+    """Grava ``manifesto`` registrando em ``obsoletos`` as ``partes`` e os ``agregados`` que ele deixou de usar.
+
+    Deve ser chamada com a ``trava``. Os obsoletos que já passaram da carência são apagados
+    depois da troca; os recentes ficam para leitores que ainda usam o manifesto anterior.
+    """
+    obsoletos = manifesto.get('obsoletos', [])
+    if partes or agregados:
+        obsoletos = [*obsoletos, {
+            'versao': manifesto['versao'],
+            'substituido_em': datetime.now(timezone.utc).isoformat(),
+            'partes': list(partes),
+            'agregados': [agregados] if agregados else [],
+        }]
+    mantidos, vencidos = _separar_vencidos(obsoletos, CARENCIA_LIMPEZA)
+    gravar_manifesto({**manifesto, 'obsoletos': mantidos}, diretorio)
+    _apagar(vencidos, diretorio)
+    return vencidos
+
+
+def limpar(diretorio=DIRETORIO_ARMAZEM, carencia=None):
+    """Apaga os arquivos substituídos há mais de ``carencia`` segundos; retorna os registros apagados."""
+    diretorio = Path(diretorio)
+    carencia = CARENCIA_LIMPEZA if carencia is None else carencia
+    with trava(diretorio):
+        manifesto = ler_manifesto(diretorio)
+        if not (manifesto or {}).get('obsoletos'):
+            return []
+        mantidos, vencidos = _separar_vencidos(manifesto['obsoletos'], carencia)
+        gravar_manifesto({**manifesto, 'obsoletos': mantidos}, diretorio)
+        _apagar(vencidos, diretorio)
+    return vencidos
+
+
+def inicializar(caminho, edicao=EDICAO_ATUAL, diretorio=DIRETORIO_ARMAZEM):
+    """Recria a partição de uma edição a partir de um extrato completo.
+
+    A partição nova é gravada ao lado da antiga e passa a valer com a troca do
+    manifesto; os arquivos antigos ficam em ``obsoletos`` até o fim da carência.
+    """
+    diretorio = Path(diretorio)
+    df = ler_arquivo(caminho, edicao)
+    erros = validar_esquema(df)
+    if erros:
+        raise ErroIngestao("\n".join(erros))
+    df = normalizar_tipos(df)
+
+    with trava(diretorio):
+        manifesto = ler_manifesto(diretorio) or {'versao': 0, 'edicoes': {}}
+        versao = manifesto['versao'] + 1
+        anterior = manifesto['edicoes'].get(str(edicao))
+        particao = {
+            'colunas': list(df.columns),
+            'partes': [gravar_parte(df, diretorio, edicao, versao, 0)],
+            'linhas': len(df),
+            'agregados': salvar_agregados(calcular_agregados(df), edicao, diretorio, versao),
+        }
+        trocar_manifesto({
+            **manifesto,
+            'versao': versao,
+            'edicoes': {**manifesto['edicoes'], str(edicao): particao},
+        }, diretorio, partes=anterior['partes'] if anterior else (),
+            agregados=agregados_da_particao(anterior, edicao) if anterior else None)
+    return len(df)
+
+
+def anexar(caminho, edicao=EDICAO_ATUAL, diretorio=DIRETORIO_ARMAZEM):
+    """Valida um arquivo delta, anexa-o à partição da edição e atualiza os agregados."""
+    diretorio = Path(diretorio)
+    delta = ler_arquivo(caminho, edicao)
+
+    with trava(diretorio):
+        # Manifesto lido só depois da trava: outra ingestão pode ter terminado enquanto o delta era lido
+        manifesto = ler_manifesto(diretorio)
+        particao = (manifesto or {}).get('edicoes', {}).get(str(edicao))
+        if particao is None:
+            raise ErroIngestao(f"Edição {edicao} não inicializada. Use 'inicializar' primeiro.")
+        erros = validar_esquema(delta, particao['colunas'])
+        if erros:
+            raise ErroIngestao("\n".join(erros))
+        delta = normalizar_tipos(delta[particao['colunas']])
+
+        versao = manifesto['versao'] + 1
+        parte = gravar_parte(delta, diretorio, edicao, versao, len(particao['partes']))
+        agregados = somar_agregados(carregar_agregados(edicao=edicao, diretorio=diretorio),
+                                    calcular_agregados(delta))
+        trocar_manifesto({
+            **manifesto,
+            'versao': versao,
+            'edicoes': {
+                **manifesto['edicoes'],
+                str(edicao): {
+                    **particao,
+                    'partes': particao['partes'] + [parte],
+                    'linhas': particao['linhas'] + len(delta),
+                    'agregados': salvar_agregados(agregados, edicao, diretorio, versao),
+                },
+            },
+        }, diretorio, agregados=agregados_da_particao(particao, edicao))
+    return len(delta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão incremental de dados da PNS.")
+    parser.add_argument('acao', choices=['inicializar', 'anexar', 'limpar'])
+    parser.add_argument('arquivo', nargs='?', help='Arquivo CSV (separado por ;) ou Parquet')
+    parser.add_argument('--edicao', default=EDICAO_ATUAL, type=int, help='Ano da edição da PNS')
+    parser.add_argument('--armazem', default=DIRETORIO_ARMAZEM, type=Path)
+    parser.add_argument('--carencia', type=int, default=CARENCIA_LIMPEZA,
+                        help='Segundos desde a substituição para apagar um arquivo (limpar)')
+    args = parser.parse_args()
+    if args.acao != 'limpar' and args.arquivo is None:
+        parser.error(f"'{args.acao}' exige o arquivo")
+
+    try:
+        if args.acao == 'limpar':
+            vencidos = limpar(args.armazem, args.carencia)
+            print(f"{sum(len(o['partes']) + len(o['agregados']) for o in vencidos)} arquivos/diretórios apagados")
+            return
+        if args.acao == 'inicializar':
+            linhas = inicializar(args.arquivo, args.edicao, args.armazem)
+        else:
+            linhas = anexar(args.arquivo, args.edicao, args.armazem)
+    except ErroIngestao as e:
+        print(f"Erro na ingestão:\n{e}", file=sys.stderr)
+        sys.exit(1)
+
+    manifesto = ler_manifesto(args.armazem)
+    print(f"{linhas} linhas ingeridas na edição {args.edicao} | versão {manifesto['versao']} | "
+          f"{manifesto['edicoes'][str(args.edicao)]['linhas']} linhas na partição")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Instrumentação leve por seção: tempo de parede e memória alocada.
+
+Uso:
+    with secao('filtros'):
+        ...
+
+    @instrumentar('load_data')
+    def load_data(versao):
+        ...
+
+Cada seção encerrada é acumulada por nome no processo (todas as sessões),
+emitida como uma linha JSON no logger ``instrumentacao`` e exportada no formato
+texto do Prometheus por ``exportar_prometheus()``. ``painel_desempenho()``
+mostra o resumo em um painel na barra lateral quando a página é aberta com
+``?admin=1``.
+
+A memória (tracemalloc) só é medida com ``INSTRUMENTACAO_MEMORIA=1``, pois o
+rastreamento deixa todas as alocações do processo mais lentas. Como o
+tracemalloc é global, sob sessões concorrentes os valores de memória incluem
+alocações de outras threads e devem ser lidos como aproximação.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+MEDIR_MEMORIA = os.environ.get('INSTRUMENTACAO_MEMORIA') == '1'
+# Amostras de duração guardadas por seção para os percentis
+AMOSTRAS_POR_SECAO = 500
+
+logger = logging.getLogger('instrumentacao')
+
+_trava = threading.Lock()
+_estatisticas = {}
+_profundidade = contextvars.ContextVar('profundidade_secao', default=0)
+
+if MEDIR_MEMORIA and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+class Secao:
+    """Mede uma seção; use como gerenciador de contexto ou com ``iniciar``/``encerrar``."""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self._token = None
+
+    def iniciar(self):
+        profundidade = _profundidade.get()
+        self._token = _profundidade.set(profundidade + 1)
+        self._externa = profundidade == 0
+        self._memoria_inicio = None
+        if tracemalloc.is_tracing():
+            if self._externa:
+                tracemalloc.reset_peak()
+            self._memoria_inicio = tracemalloc.get_traced_memory()[0]
+        self._inicio = time.perf_counter()
+        return self
+
+    def encerrar(self):
+        if self._token is None:
+            return
+        duracao = time.perf_counter() - self._inicio
+        memoria = pico = None
+        if self._memoria_inicio is not None:
+            atual, maximo = tracemalloc.get_traced_memory()
+            memoria = atual - self._memoria_inicio
+            # O pico é zerado só pela seção mais externa; nas internas não teria significado
+            if self._externa:
+                pico = maximo - self._memoria_inicio
+        _profundidade.reset(self._token)
+        self._token = None
+        registrar(self.nome, duracao, memoria, pico)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+
+def secao(nome):
+    return Secao(nome)
+
+
+def instrumentar(nome=None):
+    """Decorador que mede cada chamada da função como uma seção."""
+    def decorador(funcao):
+        rotulo = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with Secao(rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def registrar(nome, duracao, memoria=None, pico=None):
+    with _trava:
+        estatistica = _estatisticas.get(nome)
+        if estatistica is None:
+            estatistica = _estatisticas[nome] = {
+                'execucoes': 0, 'soma_s': 0.0, 'max_s': 0.0, 'memoria_soma': 0, 'memoria_execucoes': 0,
+                'duracoes': deque(maxlen=AMOSTRAS_POR_SECAO),
+            }
+        estatistica['execucoes'] += 1
+        estatistica['soma_s'] += duracao
+        estatistica['max_s'] = max(estatistica['max_s'], duracao)
+        estatistica['duracoes'].append(duracao)
+        if memoria is not None:
+            estatistica['memoria_soma'] += memoria
+            estatistica['memoria_execucoes'] += 1
+    logger.info(json.dumps({'secao': nome, 'segundos': round(duracao, 6), 'memoria_bytes': memoria,
+                            'pico_bytes': pico}, ensure_ascii=False))
+
+
+def resumo():
+    """Estatísticas acumuladas por seção, da mais lenta (tempo total) para a mais rápida."""
+    with _trava:
+        copia = {nome: {**est, 'duracoes': list(est['duracoes'])} for nome, est in _estatisticas.items()}
+    linhas = []
+    for nome, est in copia.items():
+        p50, p95 = np.percentile(est['duracoes'], [50, 95])
+        linhas.append({
+            'secao': nome,
+            'execucoes': est['execucoes'],
+            'total_s': est['soma_s'],
+            'media_ms': est['soma_s'] / est['execucoes'] * 1000,
+            'p50_ms': p50 * 1000,
+            'p95_ms': p95 * 1000,
+            'max_ms': est['max_s'] * 1000,
+            'memoria_media_kb': (est['memoria_soma'] / est['memoria_execucoes'] / 1024
+                                 if est['memoria_execucoes'] else None),
+        })
+    return sorted(linhas, key=lambda linha: linha['total_s'], reverse=True)
+
+
+def limpar():
+    with _trava:
+        _estatisticas.clear()
+
+
+def _rotulo(valor):
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def exportar_prometheus():
+    """Estatísticas no formato de exposição em texto do Prometheus."""
+    with _trava:
+        copia = {nome: {**est, 'duracoes': list(est['duracoes'])} for nome, est in _estatisticas.items()}
+    linhas = [
+        '# HELP pns_secao_segundos Tempo de parede por seção instrumentada.',
+        '# TYPE pns_secao_segundos summary',
+    ]
+    for nome, est in sorted(copia.items()):
+        rotulo = f'secao="{_rotulo(nome)}"'
+        for quantil in (0.5, 0.95, 0.99):
+            valor = float(np.quantile(est['duracoes'], quantil))
+            linhas.append(f'pns_secao_segundos{{{rotulo},quantile="{quantil}"}} {valor:.6f}')
+        linhas.append(f'pns_secao_segundos_sum{{{rotulo}}} {est["soma_s"]:.6f}')
+        linhas.append(f'pns_secao_segundos_count{{{rotulo}}} {est["execucoes"]}')
+    com_memoria = {nome: est for nome, est in copia.items() if est['memoria_execucoes']}
+    if com_memoria:
+        linhas += [
+            '# HELP pns_secao_memoria_bytes Memória líquida alocada por seção (tracemalloc).',
+            '# TYPE pns_secao_memoria_bytes summary',
+        ]
+        for nome, est in sorted(com_memoria.items()):
+            rotulo = f'secao="{_rotulo(nome)}"'
+            linhas.append(f'pns_secao_memoria_bytes_sum{{{rotulo}}} {est["memoria_soma"]}')
+            linhas.append(f'pns_secao_memoria_bytes_count{{{rotulo}}} {est["memoria_execucoes"]}')
+    return '\n'.join(linhas) + '\n'
+
+
+def painel_desempenho():
+    """Painel de administração na barra lateral, visível só com ``?admin=1`` na URL."""
+    import pandas as pd
+    import streamlit as st
+
+    if st.query_params.get('admin') != '1':
+        return
+    with st.sidebar.expander("⏱️ Desempenho", expanded=True):
+        linhas = resumo()
+        if not linhas:
+            st.caption("Nenhuma seção medida ainda.")
+            return
+        st.dataframe(pd.DataFrame(linhas).drop(columns='total_s'), hide_index=True,
+                     use_container_width=True)
+        if not MEDIR_MEMORIA:
+            st.caption("Memória não medida (defina INSTRUMENTACAO_MEMORIA=1).")
+        st.download_button("Exportar (Prometheus)", exportar_prometheus(), file_name="desempenho.prom",
+                           mime="text/plain")
@@ -0,0 +1,287 @@
+"""Contabilidade de memória dos objetos em cache dos dashboards.
+
+Uso:
+    python memoria.py
+    python memoria.py --paginas --saida memoria.json
+
+Executa cada página do dashboard principal (AppTest) e lê o que ficou nos
+caches: as entradas de ``st.cache_resource`` e ``st.cache_data`` do processo,
+o ``session_state`` da sessão e os agregados em ``lru_cache``. Um objeto novo
+em cache entra no relatório sem mudar este arquivo. Para cada um, mede o
+tamanho profundo e o serializado, que é o que ``st.cache_data`` guarda: a cada
+chamada ele devolve uma cópia nova do objeto, de modo que cada execução de
+página em andamento mantém mais uma cópia (``st.cache_resource`` compartilha o
+mesmo objeto entre as sessões; o ``session_state`` existe uma vez por sessão).
+Colunas de conteúdo idêntico em objetos diferentes são apontadas como
+duplicatas, a menos que leiam os mesmos buffers (Arrow ou NumPy).
+
+Com ``--paginas``, as páginas são executadas com tracemalloc ligado,
+registrando o pico e a memória retida por execução, o tamanho das figuras
+enviadas ao navegador e os bytes que o próprio Streamlit contabiliza em cada
+cache.
+"""
+import argparse
+import json
+import pickle
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from numpy.lib.array_utils import byte_bounds
+
+import agregados
+
+
+def tamanho_profundo(obj):
+    """Bytes ocupados pelo objeto, incluindo strings de colunas object."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        uso = obj.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(obj, pd.DataFrame) else uso)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(tamanho_profundo(valor) for valor in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(tamanho_profundo(valor) for valor in obj)
+    # Modelos e demais objetos: o serializado é dominado pelos mesmos arrays que ficam em memória
+    return tamanho_serializado(obj)
+
+
+def tamanho_serializado(obj):
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _colunas(nome, obj):
+    """(rótulo, Series) de cada coluna dos DataFrames/Series contidos em ``obj``."""
+    if isinstance(obj, pd.DataFrame):
+        for coluna in obj.columns:
+            yield f"{nome}[{coluna}]", obj[coluna]
+    elif isinstance(obj, pd.Series):
+        yield f"{nome}[{obj.name}]", obj
+    elif isinstance(obj, dict):
+        for chave, valor in obj.items():
+            yield from _colunas(f"{nome}.{chave}", valor)
+    elif isinstance(obj, (list, tuple)):
+        for i, valor in enumerate(obj):
+            yield from _colunas(f"{nome}[{i}]", valor)
+
+
+def _regioes(serie):
+    """Intervalos de endereços [início, fim) dos buffers com os valores da coluna.
+
+    ``to_numpy()`` de uma coluna Arrow devolve uma cópia nova; os endereços vêm
+    dos buffers Arrow (o arquivo mapeado de ``compartilhado.py``, por exemplo).
+    """
+    array = serie.array
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        return [(buffer.address, buffer.address + buffer.size)
+                for pedaco in array.__arrow_array__().chunks for buffer in pedaco.buffers()
+                if buffer is not None and buffer.size]
+    valores = array.codes if isinstance(array, pd.Categorical) else np.asarray(array)
+    return [byte_bounds(valores)] if valores.nbytes else []
+
+
+def _compartilham(serie, outra):
+    """Se as duas colunas leem ao menos um buffer em comum."""
+    return any(inicio < fim_outra and inicio_outra < fim
+               for inicio, fim in _regioes(serie) for inicio_outra, fim_outra in _regioes(outra))
+
+
+def duplicatas(objetos, minimo_bytes=64 * 1024):
+    """Grupos de colunas com o mesmo conteúdo (valores e índice) em objetos diferentes.
+
+    Colunas menores que ``minimo_bytes`` (tabelas de contagem, por exemplo) são ignoradas.
+    """
+    por_conteudo = defaultdict(list)
+    for nome, obj in objetos.items():
+        for rotulo, serie in _colunas(nome, obj):
+            if tamanho_profundo(serie) < minimo_bytes:
+                continue
+            assinatura = (len(serie), str(serie.dtype), int(pd.util.hash_pandas_object(serie).sum()))
+            por_conteudo[assinatura].append((rotulo, serie))
+    grupos = []
+    for colunas in por_conteudo.values():
+        if len(colunas) < 2:
+            continue
+        # Mesma área de memória não é duplicata: é uma visão dos mesmos buffers
+        compartilhada = all(_compartilham(colunas[0][1], serie) for _, serie in colunas[1:])
+        grupos.append({
+            'colunas': [rotulo for rotulo, _ in colunas],
+            'bytes_por_copia': tamanho_profundo(colunas[0][1]),
+            'memoria_compartilhada': bool(compartilhada),
+        })
+    return sorted(grupos, key=lambda g: g['bytes_por_copia'] * (len(g['colunas']) - 1), reverse=True)
+
+
+def _nome_livre(objetos, nome):
+    if nome not in objetos:
+        return nome
+    i = 2
+    while f"{nome}#{i}" in objetos:
+        i += 1
+    return f"{nome}#{i}"
+
+
+def _caches_streamlit():
+    """(tipo de cache, função, valor) de cada entrada dos caches do Streamlit neste processo."""
+    from streamlit.runtime.caching import cache_data_api, cache_resource_api
+
+    # Os registros não têm API pública para listar valores: lê os mesmos dicionários que o get_stats percorre
+    for caches in list(cache_resource_api._resource_caches._function_caches.values()):
+        for cache in list(caches.values()):
+            for resultado in list(cache._mem_cache.values()):
+                yield 'st.cache_resource', cache.display_name, resultado.value
+    for caches in list(cache_data_api._data_caches._function_caches.values()):
+        for cache in list(caches.values()):
+            # Só a camada em memória; o que estiver apenas em persist="disk" não ocupa memória
+            for chave in list(getattr(cache.storage, '_mem_cache', {})):
+                yield 'st.cache_data', cache.display_name, cache.read_result(chave).value
+
+
+def objetos_em_cache(app=None):
+    """Objetos que estão nos caches depois das execuções, nome -> (tipo de cache, objeto).
+
+    Lê os registros do Streamlit, o ``session_state`` de ``app`` (AppTest) e o
+    ``lru_cache`` dos agregados, em vez de uma lista fixa de objetos.
+    """
+    objetos = {}
+    for cache, funcao, valor in _caches_streamlit():
+        objetos[_nome_livre(objetos, funcao.rsplit('.', 1)[-1])] = (cache, valor)
+    if app is not None:
+        for chave, valor in app.session_state.to_dict().items():
+            # Valores de widgets e demais escalares não pesam no relatório
+            if valor is None or isinstance(valor, (bool, int, float, str)):
+                continue
+            objetos[_nome_livre(objetos, f"session_state.{chave}")] = ('session_state', valor)
+    # lru_cache não expõe os valores: com a versão atual em cache, obter_agregados devolve o mesmo objeto
+    if agregados._agregados_da_versao.cache_info().currsize:
+        objetos[_nome_livre(objetos, 'obter_agregados')] = ('lru_cache', agregados.obter_agregados())
+    return objetos
+
+
+def medir_objetos(objetos):
+    linhas = []
+    for nome, (cache, obj) in objetos.items():
+        linhas.append({
+            'objeto': nome,
+            'cache': cache,
+            'tipo': type(obj).__name__,
+            'memoria_bytes': tamanho_profundo(obj),
+            'serializado_bytes': tamanho_serializado(obj),
+            # st.cache_data guarda o serializado e cada execução em andamento desserializa a sua cópia
+            'copia_por_execucao': cache == 'st.cache_data',
+        })
+    return linhas
+
+
+def abrir_dashboard():
+    from streamlit.testing.v1 import AppTest
+
+    from aquecimento import DASHBOARD
+
+    return AppTest.from_file(str(DASHBOARD), default_timeout=600)
+
+
+def percorrer_paginas(app, paginas=None):
+    """Executa cada página em ``app`` e devolve o nome de cada uma depois da execução."""
+    from aquecimento import PAGINAS
+
+    for i, pagina in enumerate(paginas or PAGINAS):
+        if i == 0:
+            # A primeira execução abre a página padrão e em seguida troca, se for outra
+            app.run()
+            if app.sidebar.radio[0].value != pagina:
+                app.sidebar.radio[0].set_value(pagina).run()
+        else:
+            app.sidebar.radio[0].set_value(pagina).run()
+        yield pagina
+
+
+def medir_paginas(app, paginas=None):
+    """Pico/retenção de memória, figuras e caches do Streamlit por página do dashboard principal."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+
+    iniciou = not tracemalloc.is_tracing()
+    if iniciou:
+        tracemalloc.start()
+    resultado = []
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for pagina in percorrer_paginas(app, paginas):
+            atual, pico = tracemalloc.get_traced_memory()
+            figuras = [len(grafico.proto.spec) for grafico in app.get('plotly_chart')]
+            resultado.append({
+                'pagina': pagina,
+                'pico_execucao_bytes': pico - base,
+                'retido_bytes': atual - base,
+                'graficos': len(figuras),
+                'figuras_bytes': sum(figuras),
+            })
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+    finally:
+        if iniciou:
+            tracemalloc.stop()
+
+    caches = []
+    for provedor in (get_data_cache_stats_provider(), get_resource_cache_stats_provider()):
+        for estatisticas in provedor.get_stats().values():
+            caches += [{'cache': e.category_name, 'funcao': e.cache_name, 'bytes': e.byte_length}
+                       for e in estatisticas]
+    return resultado, caches
+
+
+def _mb(valor):
+    return f"{valor / 1024 ** 2:9.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paginas', action='store_true', help='Executa as páginas e mede memória por execução')
+    parser.add_argument('--saida', help='Grava o relatório em JSON')
+    args = parser.parse_args()
+
+    app = abrir_dashboard()
+    if args.paginas:
+        paginas, caches_streamlit = medir_paginas(app)
+    else:
+        for _ in percorrer_paginas(app):
+            pass
+    objetos = objetos_em_cache(app)
+    relatorio = {
+        'objetos': medir_objetos(objetos),
+        'duplicatas': duplicatas({nome: obj for nome, (_, obj) in objetos.items()}),
+    }
+
+    print("Objetos em cache")
+    for linha in relatorio['objetos']:
+        copia = ' + 1 cópia por execução' if linha['copia_por_execucao'] else ''
+        print(f"  {linha['objeto']:<34}{linha['cache']:<19}{_mb(linha['memoria_bytes'])} em memória"
+              f"  {_mb(linha['serializado_bytes'])} serializado{copia}")
+    print("Duplicatas")
+    if not relatorio['duplicatas']:
+        print("  nenhuma")
+    for grupo in relatorio['duplicatas']:
+        extra = ' (mesma memória)' if grupo['memoria_compartilhada'] else ''
+        print(f"  {' = '.join(grupo['colunas'])}  {_mb(grupo['bytes_por_copia'])} por cópia{extra}")
+
+    if args.paginas:
+        relatorio['paginas'], relatorio['caches_streamlit'] = paginas, caches_streamlit
+        print("Por execução de página")
+        for linha in relatorio['paginas']:
+            print(f"  {linha['pagina']:<26}pico {_mb(linha['pico_execucao_bytes'])}"
+                  f"  retido {_mb(linha['retido_bytes'])}  {linha['graficos']:>2} gráficos"
+                  f" {_mb(linha['figuras_bytes'])}")
+        print("Caches do Streamlit")
+        for linha in relatorio['caches_streamlit']:
+            print(f"  {linha['funcao']:<40}{_mb(linha['bytes'])}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
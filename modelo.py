@@ -0,0 +1,106 @@
+"""Preparação dos dados e construção do classificador de depressão.
+
+Centraliza o pré-processamento e o pipeline (balanceamento + classificador) que antes
+estavam repetidos em cada dashboard, para que o treino e os benchmarks usem
+exatamente o mesmo protocolo.
+
+sklearn e imblearn são importados dentro das funções que os usam: juntos levam
+mais de um segundo para carregar e a maioria das páginas só precisa das constantes.
+"""
+import os
+
+from dados import SINTOMAS
+
+# Variáveis do questionário usadas como entrada do modelo
+VARIAVEIS_SINTOMAS = SINTOMAS
+
+# Códigos da PNS aceitos como resposta (1 = nenhum dia, 2 = menos da metade dos dias) -> valor de entrada do modelo
+CODIFICACAO_SINTOMAS = {1: 0, 2: 1}
+
+# Estratégias de tratamento do desbalanceamento entre as classes:
+# - smote: gera exemplos sintéticos da classe minoritária em cada treino
+# - class_weight: mantém os dados e pondera as classes no classificador
+# - undersampling: descarta aleatoriamente exemplos da classe majoritária
+ESTRATEGIAS_BALANCEAMENTO = ('smote', 'class_weight', 'undersampling')
+ESTRATEGIA_PADRAO = os.environ.get('ESTRATEGIA_BALANCEAMENTO', 'smote')
+
+# Grade de hiperparâmetros da árvore de decisão usada nos dashboards
+PARAM_GRID_ARVORE = {
+    'classifier__max_depth': [3, 4, 5, 6, None],
+    'classifier__min_samples_split': [2, 5, 10],
+    'classifier__min_samples_leaf': [1, 2, 4],
+    'classifier__criterion': ['gini', 'entropy']
+}
+
+
+def preparar_dados_modelo(df):
+    """Filtra respostas válidas e retorna (X, y) no formato esperado pelo modelo."""
+    X = df[VARIAVEIS_SINTOMAS]
+    y = df["Diagnostico_Depressao"]
+
+    # Filtros
+    valid_values_y = [1, 2]
+    y = y[y.isin(valid_values_y)]
+    valid_indices_x = X.isin(list(CODIFICACAO_SINTOMAS)).all(axis=1)
+    X = X[valid_indices_x & X.index.isin(y.index)]
+    y = y.loc[X.index]
+    X = X.apply(lambda col: col.map(CODIFICACAO_SINTOMAS))
+
+    return X, y
+
+
+def candidatos_modelos():
+    """Classificadores comparados pelo benchmark, com parâmetros padrão razoáveis."""
+    from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+
+    return {
+        'arvore_decisao': DecisionTreeClassifier(random_state=42),
+        'regressao_logistica': LogisticRegression(max_iter=1000),
+        'hist_gradient_boosting': HistGradientBoostingClassifier(random_state=42),
+        'random_forest': RandomForestClassifier(n_estimators=200, n_jobs=-1, random_state=42),
+    }
+
+
+def construir_pipeline(classificador=None, estrategia='smote'):
+    """Monta o pipeline de balanceamento + classificador (árvore de decisão por padrão)."""
+    from imblearn.over_sampling import SMOTE
+    from imblearn.pipeline import Pipeline as ImbPipeline
+    from imblearn.under_sampling import RandomUnderSampler
+    from sklearn.tree import DecisionTreeClassifier
+
+    if classificador is None:
+        classificador = DecisionTreeClassifier(random_state=42)
+
+    if estrategia == 'smote':
+        etapas = [('smote', SMOTE(random_state=42))]
+    elif estrategia == 'undersampling':
+        etapas = [('undersampling', RandomUnderSampler(random_state=42))]
+    elif estrategia == 'class_weight':
+        if 'class_weight' not in classificador.get_params():
+            raise ValueError(f"{type(classificador).__name__} não aceita class_weight")
+        classificador.set_params(class_weight='balanced')
+        etapas = []
+    else:
+        raise ValueError(f"Estratégia de balanceamento desconhecida: {estrategia}")
+
+    return ImbPipeline(etapas + [('classifier', classificador)])
+
+
+def buscar_arvore(X, y, estrategia=ESTRATEGIA_PADRAO, param_grid=PARAM_GRID_ARVORE, cv=5):
+    """Busca em grade da árvore do dashboard: retorna (modelo, acurácia no teste, melhores parâmetros)."""
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import GridSearchCV, train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Balanceamento configurável (smote, class_weight ou undersampling)
+    pipeline = construir_pipeline(estrategia=estrategia)
+
+    grid_search = GridSearchCV(pipeline, param_grid, cv=cv, scoring='roc_auc', n_jobs=-1)
+    grid_search.fit(X_train, y_train)
+
+    final_model = grid_search.best_estimator_
+    acuracia = accuracy_score(y_test, final_model.predict(X_test))
+    return final_model, acuracia, grid_search.best_params_
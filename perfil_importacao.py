@@ -0,0 +1,100 @@
+"""Relatório do custo de importação dos dashboards (``python -X importtime`` resumido).
+
+Uso:
+    python perfil_importacao.py dashboard_depressao_backup.py dashboard_esse.py
+    python perfil_importacao.py avaliacao_interativa.py --top 10 --saida perfil_importacao.json
+
+Para cada script, as importações de nível de módulo (as que rodam em toda
+inicialização do processo) são executadas em um interpretador novo com
+``-X importtime``. O tempo próprio de cada módulo é somado por pacote de
+primeiro nível, e o tempo acumulado é mostrado por importação do script, o que
+aponta quais importações vale a pena adiar para dentro das páginas que as usam.
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+LINHA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importacoes_do_script(caminho):
+    """Comandos ``import``/``from ... import`` executados no nível de módulo do script."""
+    fonte = Path(caminho).read_text(encoding='utf-8')
+    comandos = []
+    for no in ast.parse(fonte).body:
+        if isinstance(no, (ast.Import, ast.ImportFrom)):
+            comandos.append(ast.get_source_segment(fonte, no))
+    return comandos
+
+
+def medir_importacoes(comandos, diretorio='.'):
+    """Executa os comandos em um processo novo e retorna as linhas de ``-X importtime``."""
+    processo = subprocess.run([sys.executable, '-X', 'importtime', '-c', '\n'.join(comandos)],
+                              capture_output=True, text=True, cwd=diretorio)
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        encontrado = LINHA_IMPORTTIME.match(linha)
+        if encontrado:
+            proprio, acumulado, recuo, nome = encontrado.groups()
+            modulos.append({'modulo': nome, 'proprio_ms': int(proprio) / 1000,
+                            'acumulado_ms': int(acumulado) / 1000, 'nivel': len(recuo) // 2})
+    return modulos
+
+
+def resumir(modulos, top=15):
+    """Tempo total, tempo próprio somado por pacote e acumulado das importações diretas."""
+    por_pacote = defaultdict(lambda: {'ms': 0.0, 'modulos': 0})
+    for item in modulos:
+        pacote = por_pacote[item['modulo'].split('.')[0]]
+        pacote['ms'] += item['proprio_ms']
+        pacote['modulos'] += 1
+    pacotes = sorted(({'pacote': nome, **valores} for nome, valores in por_pacote.items()),
+                     key=lambda p: p['ms'], reverse=True)
+    diretas = sorted((item for item in modulos if item['nivel'] == 0),
+                     key=lambda item: item['acumulado_ms'], reverse=True)
+    return {
+        'total_ms': sum(item['acumulado_ms'] for item in modulos if item['nivel'] == 0),
+        'pacotes': pacotes[:top],
+        'importacoes_diretas': [{'modulo': item['modulo'], 'acumulado_ms': item['acumulado_ms']}
+                                for item in diretas[:top]],
+    }
+
+
+def perfil_script(caminho, top=15):
+    caminho = Path(caminho)
+    comandos = importacoes_do_script(caminho)
+    return {'script': caminho.name, 'importacoes': comandos,
+            **resumir(medir_importacoes(comandos, caminho.parent), top)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scripts', nargs='+')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--saida', help='Grava o relatório completo em JSON')
+    args = parser.parse_args()
+
+    relatorio = [perfil_script(script, args.top) for script in args.scripts]
+    for perfil in relatorio:
+        print(f"\n{perfil['script']}: {perfil['total_ms']:.0f} ms em importações de nível de módulo")
+        print(f"  {'pacote':<28}{'próprio (ms)':>14}{'módulos':>10}")
+        for pacote in perfil['pacotes']:
+            print(f"  {pacote['pacote']:<28}{pacote['ms']:>14.1f}{pacote['modulos']:>10}")
+        print(f"  {'importação direta':<28}{'acumulado (ms)':>14}")
+        for item in perfil['importacoes_diretas']:
+            print(f"  {item['modulo']:<28}{item['acumulado_ms']:>14.1f}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Serviço assíncrono de predição com agrupamento em micro-lotes.
+
+Requisições concorrentes são enfileiradas e agrupadas em lotes de até
+``max_lote`` linhas, esperando no máximo ``espera_max`` segundos depois da
+primeira, antes de uma única chamada a ``predict_proba``. Sob rajadas de
+tráfego o custo fixo de cada chamada ao sklearn é dividido pelo lote inteiro.
+
+Os limites padrão podem ser ajustados pelas variáveis de ambiente
+``PREDICAO_MAX_LOTE`` e ``PREDICAO_ESPERA_MAX_MS``.
+"""
+import asyncio
+import os
+
+import pandas as pd
+
+from avaliacao import probabilidade_depressao
+from instrumentacao import secao
+from modelo import CODIFICACAO_SINTOMAS, VARIAVEIS_SINTOMAS
+
+MAX_LOTE = int(os.environ.get('PREDICAO_MAX_LOTE', 64))
+ESPERA_MAX = float(os.environ.get('PREDICAO_ESPERA_MAX_MS', 5)) / 1000
+
+
+class RespostasInvalidas(ValueError):
+    pass
+
+
+def codificar_respostas(respostas):
+    """Converte ``{sintoma: código PNS}`` na linha de entrada do modelo."""
+    faltando = [sintoma for sintoma in VARIAVEIS_SINTOMAS if sintoma not in respostas]
+    if faltando:
+        raise RespostasInvalidas(f"Respostas ausentes: {', '.join(faltando)}")
+    linha = []
+    for sintoma in VARIAVEIS_SINTOMAS:
+        codigo = respostas[sintoma]
+        if codigo not in CODIFICACAO_SINTOMAS:
+            raise RespostasInvalidas(
+                f"{sintoma}: código {codigo!r} inválido (aceitos: {sorted(CODIFICACAO_SINTOMAS)})")
+        linha.append(CODIFICACAO_SINTOMAS[codigo])
+    return linha
+
+
+class ServicoPredicao:
+    """Agrupa predições concorrentes em micro-lotes para o mesmo modelo."""
+
+    def __init__(self, modelo, max_lote=MAX_LOTE, espera_max=ESPERA_MAX):
+        self.modelo = modelo
+        self.max_lote = max_lote
+        self.espera_max = espera_max
+        # Contadores em vez da lista dos tamanhos: o serviço roda indefinidamente na API
+        self.lotes = 0
+        self.linhas = 0
+        self.maior_lote = 0
+        self._fila = None
+        self._tarefa = None
+
+    @property
+    def lote_medio(self):
+        return self.linhas / self.lotes if self.lotes else 0.0
+
+    async def iniciar(self):
+        self._fila = asyncio.Queue()
+        self._tarefa = asyncio.create_task(self._processar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.parar()
+
+    async def prever(self, respostas):
+        """Probabilidade de depressão para um conjunto de respostas."""
+        linha = codificar_respostas(respostas)
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila.put((linha, futuro))
+        return await futuro
+
+    async def _montar_lote(self):
+        lote = [await self._fila.get()]
+        laco = asyncio.get_running_loop()
+        prazo = laco.time() + self.espera_max
+        while len(lote) < self.max_lote:
+            if not self._fila.empty():
+                lote.append(self._fila.get_nowait())
+                continue
+            restante = prazo - laco.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._fila.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _processar(self):
+        laco = asyncio.get_running_loop()
+        while True:
+            lote = await self._montar_lote()
+            X = pd.DataFrame([linha for linha, _ in lote], columns=VARIAVEIS_SINTOMAS)
+            self.lotes += 1
+            self.linhas += len(lote)
+            self.maior_lote = max(self.maior_lote, len(lote))
+            try:
+                # predict_proba libera o laço de eventos enquanto o próximo lote se forma
+                with secao('predicao lote'):
+                    probabilidades = await laco.run_in_executor(None, probabilidade_depressao, self.modelo, X)
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            for (_, futuro), probabilidade in zip(lote, probabilidades):
+                if not futuro.done():
+                    futuro.set_result(float(probabilidade))
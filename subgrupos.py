@@ -0,0 +1,115 @@
+"""Desempenho do classificador por subgrupo em uma única passada agrupada.
+
+Em vez de chamar ``roc_auc_score`` em um laço por grupo, as predições de todos
+os agrupamentos são empilhadas, ordenadas uma única vez por (grupo, score) e a
+AUC de cada grupo sai da estatística de Mann-Whitney:
+
+    AUC = (soma dos postos dos positivos - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+com postos médios para empates. TPR, FPR e demais contagens vêm de
+``np.bincount`` sobre os mesmos códigos de grupo.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _postos_por_grupo(codigos, scores):
+    """Ordena por (grupo, score) e retorna a ordem e o posto médio (1..n) dentro do grupo."""
+    ordem = np.lexsort((scores, codigos))
+    g = codigos[ordem]
+    s = scores[ordem]
+    n = len(g)
+
+    # Início de cada bloco de empate (mudança de grupo ou de score)
+    novo_bloco = np.ones(n, dtype=bool)
+    novo_bloco[1:] = (g[1:] != g[:-1]) | (s[1:] != s[:-1])
+    inicio_bloco = np.flatnonzero(novo_bloco)
+    fim_bloco = np.append(inicio_bloco[1:], n) - 1
+
+    # Posição em que cada grupo começa no vetor ordenado
+    novo_grupo = np.ones(n, dtype=bool)
+    novo_grupo[1:] = g[1:] != g[:-1]
+    inicio_grupo = np.maximum.accumulate(np.where(novo_grupo, np.arange(n), 0))
+
+    inicio_rel = inicio_bloco - inicio_grupo[inicio_bloco]
+    fim_rel = fim_bloco - inicio_grupo[inicio_bloco]
+    posto_bloco = (inicio_rel + fim_rel) / 2 + 1
+    postos = np.repeat(posto_bloco, fim_bloco - inicio_bloco + 1)
+    return ordem, postos
+
+
+def metricas_grupos(codigos, scores, reais, previstos, n_grupos):
+    """Métricas para grupos codificados como inteiros 0..n_grupos-1.
+
+    ``reais`` e ``previstos`` são booleanos (classe positiva = True).
+    Retorna um DataFrame indexado pelo código do grupo.
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    scores = np.asarray(scores, dtype=float)
+    reais = np.asarray(reais, dtype=bool)
+    previstos = np.asarray(previstos, dtype=bool)
+
+    ordem, postos = _postos_por_grupo(codigos, scores)
+    soma_postos_pos = np.bincount(codigos[ordem], weights=postos * reais[ordem], minlength=n_grupos)
+
+    n = np.bincount(codigos, minlength=n_grupos)
+    n_pos = np.bincount(codigos, weights=reais, minlength=n_grupos)
+    n_neg = n - n_pos
+    vp = np.bincount(codigos, weights=previstos & reais, minlength=n_grupos)
+    fp = np.bincount(codigos, weights=previstos & ~reais, minlength=n_grupos)
+    acertos = np.bincount(codigos, weights=previstos == reais, minlength=n_grupos)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        auc = (soma_postos_pos - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+        resultado = pd.DataFrame({
+            'n': n,
+            'positivos': n_pos.astype(int),
+            'prevalencia': n_pos / n,
+            'acuracia': acertos / n,
+            'auc': np.where((n_pos > 0) & (n_neg > 0), auc, np.nan),
+            'tpr': np.where(n_pos > 0, vp / n_pos, np.nan),
+            'fpr': np.where(n_neg > 0, fp / n_neg, np.nan),
+        })
+    return resultado
+
+
+def analisar_subgrupos(grupos, scores, reais, previstos, agrupamentos):
+    """Calcula as métricas de vários agrupamentos de uma só vez.
+
+    ``grupos`` é um DataFrame com as colunas demográficas alinhadas às predições e
+    ``agrupamentos`` é um dicionário nome -> lista de colunas (ex.:
+    ``{'Sexo': ['Sexo'], 'Estado x Sexo': ['Unidade_Federacao', 'Sexo']}``).
+    Todos os agrupamentos são empilhados em um único vetor de códigos, de modo que
+    a ordenação e as contagens são feitas uma vez só.
+    """
+    scores = np.asarray(scores, dtype=float)
+    reais = np.asarray(reais, dtype=bool)
+    previstos = np.asarray(previstos, dtype=bool)
+
+    blocos_codigos, rotulos, deslocamento = [], [], 0
+    for nome, colunas in agrupamentos.items():
+        agrupado = grupos.groupby(colunas, observed=True)
+        categorias = agrupado.size().index
+        # Linhas com alguma coluna ausente ficam sem grupo (código -1) e de fora do cálculo
+        codigos = agrupado.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        blocos_codigos.append(np.where(codigos >= 0, codigos + deslocamento, -1))
+        rotulos.append((nome, categorias))
+        deslocamento += len(categorias)
+
+    codigos = np.concatenate(blocos_codigos)
+    validos = codigos >= 0
+    repeticoes = len(agrupamentos)
+    tabela = metricas_grupos(
+        codigos[validos],
+        np.tile(scores, repeticoes)[validos],
+        np.tile(reais, repeticoes)[validos],
+        np.tile(previstos, repeticoes)[validos],
+        deslocamento,
+    )
+
+    resultado, inicio = {}, 0
+    for nome, categorias in rotulos:
+        parte = tabela.iloc[inicio:inicio + len(categorias)].set_axis(categorias)
+        resultado[nome] = parte.reset_index()
+        inicio += len(categorias)
+    return resultado
@@ -0,0 +1,351 @@
+"""Teste de carga do dashboard com sessões concorrentes via websocket.
+
+Uso:
+    python teste_carga.py --sessoes 50 --duracao 120
+    python teste_carga.py --processos 2 --sessoes 100 --saida teste_carga.json
+    python teste_carga.py --url ws://servidor:8501 --pids 1234 --sessoes 20
+
+Cada sessão é um cliente do protocolo do próprio Streamlit (o mesmo websocket
+``/_stcore/stream`` do navegador): abre o dashboard e repete um roteiro de
+navegação (troca de página no ``pagina``, filtros do Panorama), esperando um
+tempo de leitura aleatório entre os cliques. A latência de cada rerun vai do
+envio do clique até a mensagem ``script_finished``.
+
+Sem ``--url``, o teste sobe ``--processos`` servidores locais
+(``streamlit run``, um por porta) e distribui as sessões entre eles; as
+variáveis de ambiente são repassadas, então ``DADOS_COMPARTILHADOS=1`` vale
+também para os servidores. CPU e memória residente (RSS) de cada processo são
+amostradas em ``/proc`` durante o teste.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+DASHBOARD = Path(__file__).with_name('dashboard_depressao_backup.py')
+PORTA_INICIAL = 8601
+RADIO_PAGINA = "Selecione a página:"
+
+# Roteiros de navegação: passos (rótulo do widget, valor escolhido)
+ROTEIROS = {
+    'panorama': [
+        (RADIO_PAGINA, "🌎 Panorama Nacional"),
+        ("Faixa Etária", (30, 39)),
+        ("Sexo", "Feminino"),
+        ("Faixa Etária", (60, 99)),
+        ("Sexo", "Todos"),
+        ("Faixa Etária", (15, 99)),
+        ("Detalhar", "Nordeste"),
+        ("Detalhar", "Brasil"),
+    ],
+    'navegacao': [
+        (RADIO_PAGINA, "🌎 Panorama Nacional"),
+        (RADIO_PAGINA, "📊 Fatores Associados"),
+        (RADIO_PAGINA, "💊 Tratamento e Saúde"),
+        (RADIO_PAGINA, "🏠 Introdução"),
+    ],
+    'teste_pessoal': [
+        (RADIO_PAGINA, "📝 Teste Pessoal"),
+        (RADIO_PAGINA, "🏠 Introdução"),
+    ],
+}
+
+# Widgets cujo valor vai no campo string_value do protocolo; o slider de intervalo usa double_array_value
+WIDGETS_TEXTO = ('radio', 'selectbox')
+WIDGETS = (*WIDGETS_TEXTO, 'slider')
+
+
+class ErroSessao(RuntimeError):
+    pass
+
+
+class Sessao:
+    """Uma aba do navegador: mantém os valores escolhidos e os ids atuais dos widgets."""
+
+    def __init__(self, url, timeout=300):
+        self.url = url
+        self.timeout = timeout
+        self.valores = {}
+        self._widgets = {}
+        # Fragmento (st.fragment) de cada widget: mudar o valor reexecuta só o fragmento, como no navegador
+        self._fragmentos = {}
+        self._ws = None
+
+    async def __aenter__(self):
+        import websockets
+
+        self._ws = await websockets.connect(f"{self.url}/_stcore/stream", max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._ws.close()
+
+    async def rerun(self, fragmento=None):
+        """Envia o estado dos widgets, espera o fim da execução e retorna (segundos, exceções, bytes)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ''
+        if fragmento:
+            mensagem.rerun_script.fragment_id = fragmento
+        for rotulo, valor in self.valores.items():
+            if rotulo in self._widgets:
+                estado = mensagem.rerun_script.widget_states.widgets.add()
+                estado.id = self._widgets[rotulo]
+                if isinstance(valor, tuple):
+                    estado.double_array_value.data.extend(valor)
+                else:
+                    estado.string_value = valor
+        inicio = time.perf_counter()
+        await self._ws.send(mensagem.SerializeToString())
+        excecoes, recebidos = await asyncio.wait_for(self._receber_ate_fim(), self.timeout)
+        return time.perf_counter() - inicio, excecoes, recebidos
+
+    async def _receber_ate_fim(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        widgets, fragmentos = {}, {}
+        excecoes = recebidos = 0
+        while True:
+            mensagem = ForwardMsg()
+            dados_recebidos = await self._ws.recv()
+            recebidos += len(dados_recebidos)
+            mensagem.ParseFromString(dados_recebidos)
+            tipo = mensagem.WhichOneof('type')
+            if tipo == 'delta' and mensagem.delta.WhichOneof('type') == 'new_element':
+                elemento = mensagem.delta.new_element
+                tipo_elemento = elemento.WhichOneof('type')
+                if tipo_elemento in WIDGETS:
+                    widget = getattr(elemento, tipo_elemento)
+                    widgets[widget.label] = widget.id
+                    fragmentos[widget.label] = mensagem.delta.fragment_id
+                elif tipo_elemento == 'exception':
+                    excecoes += 1
+            elif tipo == 'script_finished':
+                if mensagem.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if mensagem.script_finished == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                    # Só o fragmento foi reexecutado: os widgets do resto da página continuam valendo
+                    self._widgets.update(widgets)
+                    self._fragmentos.update(fragmentos)
+                    return excecoes, recebidos
+                # Widgets que não apareceram nesta execução deixam de existir, como no navegador
+                self._widgets, self._fragmentos = widgets, fragmentos
+                self.valores = {rotulo: valor for rotulo, valor in self.valores.items() if rotulo in widgets}
+                return excecoes, recebidos
+
+    async def escolher(self, rotulo, valor):
+        if rotulo not in self._widgets:
+            raise ErroSessao(f"Widget '{rotulo}' não está na página atual")
+        self.valores[rotulo] = valor
+        return await self.rerun(self._fragmentos.get(rotulo))
+
+
+async def executar_sessao(url, roteiro, fim, pausa_media, registros, gerador):
+    """Abre uma sessão e repete o roteiro até o instante ``fim`` (relógio do laço)."""
+    laco = asyncio.get_running_loop()
+    async with Sessao(url) as sessao:
+        duracao, excecoes, recebidos = await sessao.rerun()
+        registros.append({'roteiro': roteiro, 'passo': 'abrir', 'segundos': duracao, 'excecoes': excecoes,
+                          'bytes': recebidos})
+        while laco.time() < fim:
+            for rotulo, valor in ROTEIROS[roteiro]:
+                # Tempo de leitura entre cliques (exponencial, como chegadas independentes)
+                await asyncio.sleep(gerador.expovariate(1 / pausa_media) if pausa_media else 0)
+                if laco.time() >= fim:
+                    return
+                try:
+                    duracao, excecoes, recebidos = await sessao.escolher(rotulo, valor)
+                except ErroSessao:
+                    registros.append({'roteiro': roteiro, 'passo': f"{rotulo}={valor}", 'segundos': None,
+                                      'excecoes': 1})
+                    continue
+                registros.append({'roteiro': roteiro, 'passo': f"{rotulo}={valor}", 'segundos': duracao,
+                                  'excecoes': excecoes, 'bytes': recebidos})
+
+
+def _amostrar_processo(pid):
+    """(segundos de CPU acumulados, RSS em bytes) lidos de /proc."""
+    with open(f"/proc/{pid}/stat") as f:
+        campos = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(campos[11]) + int(campos[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(linha.split()[1]) * 1024 for linha in f if linha.startswith('VmRSS:'))
+    return cpu, rss
+
+
+async def monitorar(pids, parar, intervalo=0.5):
+    """Amostra CPU (%) e RSS de cada processo até ``parar`` ser sinalizado."""
+    amostras = defaultdict(list)
+    anteriores = {pid: (_amostrar_processo(pid)[0], time.monotonic()) for pid in pids}
+    while not parar.is_set():
+        try:
+            await asyncio.wait_for(parar.wait(), intervalo)
+        except asyncio.TimeoutError:
+            pass
+        agora = time.monotonic()
+        for pid in pids:
+            try:
+                cpu, rss = _amostrar_processo(pid)
+            except (FileNotFoundError, ProcessLookupError):
+                continue
+            cpu_anterior, instante = anteriores[pid]
+            amostras[pid].append({'cpu_pct': (cpu - cpu_anterior) / (agora - instante) * 100, 'rss': rss})
+            anteriores[pid] = (cpu, agora)
+    return {
+        pid: {
+            'cpu_media_pct': float(np.mean([a['cpu_pct'] for a in lista])),
+            'cpu_max_pct': float(np.max([a['cpu_pct'] for a in lista])),
+            'rss_final_mb': lista[-1]['rss'] / 1024 ** 2,
+            'rss_max_mb': max(a['rss'] for a in lista) / 1024 ** 2,
+        }
+        for pid, lista in amostras.items() if lista
+    }
+
+
+def iniciar_servidores(processos, porta_inicial=PORTA_INICIAL, script=DASHBOARD, timeout=120):
+    """Sobe ``processos`` servidores do Streamlit e espera cada um responder ao health check."""
+    servidores = []
+    for i in range(processos):
+        porta = porta_inicial + i
+        processo = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', str(script), '--server.headless', 'true',
+             '--server.port', str(porta), '--browser.gatherUsageStats', 'false'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        servidores.append((processo, porta))
+    prazo = time.monotonic() + timeout
+    for processo, porta in servidores:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://localhost:{porta}/_stcore/health", timeout=2):
+                    break
+            except OSError:
+                if processo.poll() is not None or time.monotonic() > prazo:
+                    parar_servidores(servidores)
+                    raise RuntimeError(f"Servidor na porta {porta} não respondeu")
+                time.sleep(0.5)
+    return servidores
+
+
+def parar_servidores(servidores):
+    for processo, _ in servidores:
+        processo.terminate()
+    for processo, _ in servidores:
+        try:
+            processo.wait(10)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+
+def resumir(registros, duracao):
+    """Percentis de latência e bytes recebidos por passo e no total, vazão e erros."""
+    def percentis(grupo):
+        ms = np.array([r['segundos'] for r in grupo]) * 1000
+        return {
+            'reruns': len(ms),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p90_ms': float(np.percentile(ms, 90)),
+            'p99_ms': float(np.percentile(ms, 99)),
+            'max_ms': float(ms.max()),
+            'kb_medio': float(np.mean([r['bytes'] for r in grupo])) / 1024,
+        }
+
+    validos = [r for r in registros if r['segundos'] is not None]
+    por_passo = defaultdict(list)
+    for registro in validos:
+        por_passo[registro['passo']].append(registro)
+    return {
+        'total': percentis(validos) if validos else None,
+        'por_passo': {passo: percentis(grupo) for passo, grupo in sorted(por_passo.items())},
+        'reruns_por_segundo': len(validos) / duracao,
+        'erros': sum(r['excecoes'] for r in registros),
+    }
+
+
+async def executar_teste(urls, pids, sessoes, duracao, pausa_media, roteiros=None, semente=42):
+    gerador = random.Random(semente)
+    nomes = roteiros or list(ROTEIROS)
+    registros = []
+    parar = asyncio.Event()
+    monitor = asyncio.create_task(monitorar(pids, parar))
+    inicio = time.perf_counter()
+    fim = asyncio.get_running_loop().time() + duracao
+    # Sessões distribuídas entre servidores e roteiros em rodízio, como um balanceador
+    resultados = await asyncio.gather(*(
+        executar_sessao(urls[i % len(urls)], nomes[i % len(nomes)], fim, pausa_media, registros,
+                        random.Random(gerador.random()))
+        for i in range(sessoes)
+    ), return_exceptions=True)
+    decorrido = time.perf_counter() - inicio
+    parar.set()
+    processos = await monitor
+    return {
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'sessoes': sessoes,
+        'duracao_s': decorrido,
+        'pausa_media_s': pausa_media,
+        'servidores': urls,
+        'sessoes_com_falha': [repr(r) for r in resultados if isinstance(r, BaseException)],
+        **resumir(registros, decorrido),
+        'processos': {str(pid): valores for pid, valores in processos.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessoes', type=int, default=50)
+    parser.add_argument('--duracao', type=float, default=60, help='Segundos de teste')
+    parser.add_argument('--pausa', type=float, default=2.0, help='Tempo médio (s) entre cliques de uma sessão')
+    parser.add_argument('--roteiros', nargs='+', choices=list(ROTEIROS))
+    parser.add_argument('--url', action='append', help='Servidor já em execução (ws://host:porta)')
+    parser.add_argument('--pids', nargs='*', type=int, default=[], help='Processos a monitorar com --url')
+    parser.add_argument('--processos', type=int, default=1, help='Servidores locais a subir sem --url')
+    parser.add_argument('--porta', type=int, default=PORTA_INICIAL)
+    parser.add_argument('--saida', help='Grava o relatório em JSON')
+    args = parser.parse_args()
+
+    servidores = []
+    if args.url:
+        urls, pids = args.url, args.pids
+    else:
+        servidores = iniciar_servidores(args.processos, args.porta)
+        urls = [f"ws://localhost:{porta}" for _, porta in servidores]
+        pids = [processo.pid for processo, _ in servidores]
+    try:
+        relatorio = asyncio.run(executar_teste(urls, pids, args.sessoes, args.duracao, args.pausa,
+                                               args.roteiros))
+    finally:
+        parar_servidores(servidores)
+
+    print(f"{args.sessoes} sessões, {relatorio['duracao_s']:.0f} s, "
+          f"{relatorio['reruns_por_segundo']:.1f} reruns/s, {relatorio['erros']} erros")
+    if relatorio['sessoes_com_falha']:
+        print(f"  {len(relatorio['sessoes_com_falha'])} sessões falharam: {relatorio['sessoes_com_falha'][0]}")
+    print(f"  {'passo':<44}{'reruns':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'máx ms':>9}{'KB':>8}")
+    linhas = dict(relatorio['por_passo'])
+    if relatorio['total']:
+        linhas['total'] = relatorio['total']
+    for passo, p in linhas.items():
+        print(f"  {passo:<44}{p['reruns']:>7}{p['p50_ms']:>9.0f}{p['p90_ms']:>9.0f}{p['p99_ms']:>9.0f}"
+              f"{p['max_ms']:>9.0f}{p['kb_medio']:>8.0f}")
+    for pid, processo in relatorio['processos'].items():
+        print(f"  processo {pid}: CPU média {processo['cpu_media_pct']:.0f}% (máx {processo['cpu_max_pct']:.0f}%),"
+              f" RSS máx {processo['rss_max_mb']:.0f} MB")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
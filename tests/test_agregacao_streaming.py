@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import agregacao_streaming
+import agregados
+import dados
+import ingestao
+from dados_sinteticos import gerar, gravar_csv
+from indice_idade import IndiceIdade
+
+
+@pytest.fixture
+def microdados(tmp_path):
+    caminho = tmp_path / 'microdados.csv'
+    gravar_csv(gerar(5000, semente=3), caminho)
+    return caminho
+
+
+def test_sem_armazem_recusa_e_nao_grava(tmp_path, microdados):
+    armazem = tmp_path / 'armazem'
+    with pytest.raises(ingestao.ErroIngestao):
+        agregacao_streaming.ingerir(microdados, diretorio=armazem, tamanho_parte=1000)
+    assert not (armazem / 'agregados').exists()
+    assert not (armazem / 'dados').exists()
+
+
+def test_ingerir_publica_particao_e_agregados_das_mesmas_linhas(tmp_path, microdados):
+    armazem = tmp_path / 'armazem'
+    amostra = tmp_path / 'amostra.csv'
+    gravar_csv(gerar(500, semente=4), amostra)
+    ingestao.inicializar(amostra, diretorio=armazem)
+    antes = agregados.obter_agregados(diretorio=armazem)
+
+    _, linhas = agregacao_streaming.ingerir(microdados, diretorio=armazem, tamanho_parte=1000)
+
+    particao = dados.ler_manifesto(armazem)['edicoes']['2019']
+    assert dados.versao_dados(armazem) == 'v2'
+    assert linhas == particao['linhas'] == 5000
+    assert len(particao['partes']) == 5
+    depois = agregados.obter_agregados(diretorio=armazem)
+    assert depois is not antes
+
+    # Páginas que leem a partição e Panorama (cubo) contam as mesmas linhas
+    df = dados.carregar_dataset(diretorio=armazem)
+    assert list(df.columns) == particao['colunas']
+    assert depois['totais']['Quantidade'].sum() == len(df)
+    do_cubo = IndiceIdade(dados.rotular(depois['cubo_panorama']), contagem='Quantidade')
+    assert np.array_equal(do_cubo.acumulado, IndiceIdade(dados.preparar(df)).acumulado)
+
+    # Um delta anexado depois soma às duas
+    ingestao.anexar(amostra, diretorio=armazem)
+    particao = dados.ler_manifesto(armazem)['edicoes']['2019']
+    assert particao['linhas'] == 5500
+    assert agregados.carregar_agregados(['totais'], diretorio=armazem)['totais']['Quantidade'].sum() == 5500
+
+
+def test_parte_invalida_nao_publica_nada(tmp_path, microdados):
+    armazem = tmp_path / 'armazem'
+    ingestao.inicializar(microdados, diretorio=armazem)
+    manifesto = dados.ler_manifesto(armazem)
+    invalido = tmp_path / 'invalido.csv'
+    df = pd.read_csv(microdados, sep=';')
+    df.loc[4500, 'Idade_Morador'] = 300
+    df.to_csv(invalido, sep=';', index=False)
+
+    with pytest.raises(ingestao.ErroIngestao, match='Idade_Morador'):
+        agregacao_streaming.ingerir(invalido, diretorio=armazem, tamanho_parte=1000)
+    assert dados.ler_manifesto(armazem) == manifesto
+    arquivos = sorted(str(p.relative_to(armazem)) for p in (armazem / 'dados').rglob('*.parquet'))
+    assert arquivos == manifesto['edicoes']['2019']['partes']
+
+
+def test_panorama_do_cubo_igual_ao_dos_microdados(microdados):
+    resultado, _ = agregacao_streaming.agregar(microdados, tamanho_parte=700)
+    do_cubo = IndiceIdade(dados.rotular(resultado['cubo_panorama']), contagem='Quantidade')
+    dos_microdados = IndiceIdade(dados.preparar(dados.normalizar_tipos(pd.read_csv(microdados, sep=';'))))
+    assert np.array_equal(do_cubo.acumulado, dos_microdados.acumulado)
+    for dimensao in do_cubo.dimensoes:
+        assert do_cubo.categorias[dimensao].equals(dos_microdados.categorias[dimensao])
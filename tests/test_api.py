@@ -0,0 +1,83 @@
+import io
+
+import pyarrow as pa
+import pytest
+from starlette.testclient import TestClient
+
+import agregados
+import api
+import ingestao
+from dados_sinteticos import gerar, gravar_csv
+from modelo import VARIAVEIS_SINTOMAS
+from servico_predicao import ServicoPredicao
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    # Armazém e CSV padrão são caminhos relativos ao diretório de trabalho
+    monkeypatch.chdir(tmp_path)
+    gravar_csv(gerar(2000), tmp_path / 'extrato.csv')
+    ingestao.inicializar(tmp_path / 'extrato.csv')
+    agregados._agregados_da_versao.cache_clear()
+    api.app.state.servico = None
+    # Sem o "with", o ciclo de vida (aquecimento e treino do modelo) não roda
+    yield TestClient(api.app)
+    agregados._agregados_da_versao.cache_clear()
+
+
+def test_agregado_json_e_arrow(cliente):
+    resposta = cliente.get('/agregados/depressao_por_sexo')
+    assert resposta.status_code == 200
+    linhas = resposta.json()
+    assert {linha['Sexo'] for linha in linhas} == {1.0, 2.0}
+    assert resposta.headers['etag'] == '"v1-2019-depressao_por_sexo-json"'
+
+    resposta = cliente.get('/agregados/depressao_por_sexo', headers={'Accept': api.TIPO_ARROW})
+    tabela = pa.ipc.open_stream(io.BytesIO(resposta.content)).read_all().to_pandas()
+    assert tabela['Quantidade'].sum() == sum(linha['Quantidade'] for linha in linhas)
+
+
+def test_etag_forte_e_fraco_dao_304(cliente):
+    etag = cliente.get('/agregados/totais').headers['etag']
+    for enviado in (etag, f'W/{etag}', f'"outro", W/{etag}'):
+        resposta = cliente.get('/agregados/totais', headers={'If-None-Match': enviado})
+        assert resposta.status_code == 304
+        assert resposta.content == b''
+    assert cliente.get('/agregados/totais', headers={'If-None-Match': '"v0-2019-totais-json"'}).status_code == 200
+
+
+def test_inexistentes_dao_404_mesmo_com_if_none_match(cliente):
+    assert cliente.get('/agregados/nao_existe').status_code == 404
+    assert cliente.get('/agregados/totais?edicao=2013').status_code == 404
+    assert cliente.get('/agregados?edicao=2013').status_code == 404
+    assert cliente.get('/agregados/nao_existe', headers={'If-None-Match': '*'}).status_code == 404
+    etag = cliente.get('/agregados/totais').headers['etag']
+    assert cliente.get('/agregados/totais?edicao=2013', headers={'If-None-Match': etag}).status_code == 404
+
+
+def test_parametros_invalidos_dao_400(cliente):
+    resposta = cliente.get('/agregados/totais?edicao=abc')
+    assert resposta.status_code == 400
+    assert 'abc' in resposta.json()['erro']
+    assert cliente.get('/agregados?edicao=abc').status_code == 400
+    assert cliente.get('/agregados/totais?formato=xml').status_code == 400
+
+
+def test_listar_agregados(cliente):
+    resposta = cliente.get('/agregados')
+    assert resposta.status_code == 200
+    assert resposta.json()['versao'] == 'v1'
+    assert 'cubo_panorama' in resposta.json()['agregados']
+
+
+def test_prever_sem_modelo_e_corpo_invalido(cliente):
+    respostas = {sintoma: 1 for sintoma in VARIAVEIS_SINTOMAS}
+    assert cliente.post('/prever', json={'respostas': respostas}).status_code == 503
+
+    # Os erros de entrada são detectados antes de a predição entrar na fila
+    api.app.state.servico = ServicoPredicao(modelo=None)
+    assert cliente.post('/prever', content=b'{nao json').status_code == 400
+    assert cliente.post('/prever', json={'outra': {}}).status_code == 400
+    resposta = cliente.post('/prever', json={'respostas': {**respostas, VARIAVEIS_SINTOMAS[0]: 7}})
+    assert resposta.status_code == 422
+    assert VARIAVEIS_SINTOMAS[0] in resposta.json()['erro']
@@ -0,0 +1,37 @@
+import pytest
+
+import aquecimento
+
+
+@pytest.fixture
+def estado(monkeypatch):
+    monkeypatch.setattr(aquecimento, 'ESTADO', {})
+    monkeypatch.setattr(aquecimento.dados, 'versao_dados', lambda diretorio=None: 'v1')
+    return aquecimento.ESTADO
+
+
+def test_estado_gravado_so_fica_pronto_ao_concluir(tmp_path, estado, monkeypatch):
+    caminho = tmp_path / 'aquecimento.json'
+    assert aquecimento.estado_gravado(caminho) is None
+
+    # Um estado pronto de uma execução anterior deixa de valer quando o aquecimento recomeça
+    estado['agregados'] = {'pronto': True}
+    aquecimento.gravar_estado(caminho, ['agregados'])
+    assert aquecimento.estado_gravado(caminho)['pronto']
+    aquecimento.gravar_estado(caminho, ['agregados'], concluido=False)
+    assert not aquecimento.estado_gravado(caminho)['pronto']
+
+    estado['modelo'] = {'pronto': False}
+    aquecimento.gravar_estado(caminho, ['agregados', 'modelo'])
+    assert not aquecimento.estado_gravado(caminho)['pronto']
+
+    caminho.write_text('{incompleto')
+    assert aquecimento.estado_gravado(caminho) is None
+
+
+def test_dados_sem_memoria_compartilhada_nao_carrega(estado, monkeypatch):
+    monkeypatch.setattr(aquecimento.compartilhado, 'ATIVO', False)
+    monkeypatch.setattr(aquecimento.dados, 'carregar_dataset', lambda *a, **k: pytest.fail('carregou os dados'))
+    aquecimento.aquecer(['dados'])
+    assert estado['dados']['pronto']
+    assert estado['dados']['detalhe'].startswith('ignorado')
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import binagem
+import dados
+from dados_sinteticos import gerar
+
+
+@pytest.fixture(scope='module')
+def df():
+    df = dados.preparar(gerar(5000, semente=3))
+    # Valores nos extremos dos domínios, que as faixas abertas à direita deixariam de fora
+    df.loc[:9, 'Horas_Trabalho_Semana'] = 120
+    df.loc[:9, 'Diagnostico_Depressao'] = 'Sim'
+    df.loc[10:14, 'Idade_Morador'] = 125
+    return df
+
+
+@pytest.mark.parametrize('largura', [1, 5, 10, 20, 30, 40, 50, 60])
+def test_rebinar_igual_ao_np_histogram(df, largura):
+    horas = binagem.histograma_unitario(df, 'Horas_Trabalho_Semana')
+    limites = binagem.limites_por_largura(0, 120, largura)
+    faixas = binagem.rebinar(horas, limites)
+    for grupo in ('Sim', 'Não'):
+        valores = df.loc[df['Diagnostico_Depressao'] == grupo, 'Horas_Trabalho_Semana'].dropna()
+        esperado, _ = np.histogram(np.floor(valores), bins=limites)
+        assert faixas[grupo].tolist() == esperado.tolist()
+    # Quem trabalha 120 horas entra na última faixa, qualquer que seja a largura
+    assert faixas.to_numpy().sum() == df[['Horas_Trabalho_Semana', 'Diagnostico_Depressao']].notna().all(axis=1).sum()
+
+
+def test_faixas_padrao_iguais_ao_pd_cut(df):
+    horas = binagem.histograma_unitario(df, 'Horas_Trabalho_Semana')
+    assert binagem.limites_por_largura(0, 120, 20) == dados.BINS_HORAS
+    contagem, porcentagem = binagem.depressao_por_faixas(horas, dados.BINS_HORAS, dados.LABELS_HORAS)
+    faixas = pd.cut(df['Horas_Trabalho_Semana'], bins=dados.BINS_HORAS, labels=dados.LABELS_HORAS, right=False)
+    tabela = pd.crosstab(faixas, df['Diagnostico_Depressao'])
+    assert contagem.tolist() == tabela['Sim'].tolist()
+    assert porcentagem.to_numpy() == pytest.approx((tabela['Sim'] / tabela.sum(axis=1) * 100).to_numpy())
+    assert contagem.iloc[-1] >= 10
+
+
+@pytest.mark.parametrize('largura', [1, 5, 10, 15])
+def test_idades_observadas_incluem_o_maximo(df, largura):
+    idade = binagem.histograma_unitario(df, 'Idade_Morador', grupos=('Diagnostico_Depressao', 'Sexo'))
+    faixas = binagem.rebinar(idade, binagem.limites_observados(idade, largura))
+    colunas = ['Idade_Morador', 'Diagnostico_Depressao', 'Sexo']
+    assert faixas.to_numpy().sum() == df[colunas].notna().all(axis=1).sum()
+    assert idade.loc[125].sum() == df.loc[10:14, colunas].notna().all(axis=1).sum() > 0
+
+
+def test_limites_por_largura():
+    assert binagem.limites_por_largura(0, 120, 50) == [0, 50, 100, 150]
+    assert binagem.limites_por_largura(0, 120, 40) == [0, 40, 80, 121]
+    assert binagem.limites_por_largura(7, 7, 10) == [7, 17]
+
+
+def test_estatisticas_iguais_ao_pandas(df):
+    horas = binagem.histograma_unitario(df, 'Horas_Trabalho_Semana')
+    valores = np.floor(df.loc[df['Diagnostico_Depressao'] == 'Sim', 'Horas_Trabalho_Semana'].dropna())
+    resumo = binagem.estatisticas(horas['Sim'])
+    assert resumo['media'] == pytest.approx(valores.mean())
+    assert resumo['mediana'] == pytest.approx(valores.median())
+    assert resumo['desvio_padrao'] == pytest.approx(valores.std())
+    # Amostra de tamanho par e ímpar
+    for amostra in ([3, 8], [3, 8, 8], [40]):
+        histograma = pd.Series(np.bincount(amostra, minlength=121))
+        assert binagem.estatisticas(histograma)['mediana'] == np.median(amostra)
+    assert np.isnan(binagem.estatisticas(pd.Series(np.zeros(121)))['media'])
@@ -0,0 +1,95 @@
+import importlib
+import pickle
+import sys
+import threading
+
+import pytest
+
+import cache_disco
+from cache_disco import CacheDisco, chave, em_disco
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_disco, 'ATIVO', True)
+    monkeypatch.setattr(cache_disco.dados, 'versao_dados', lambda diretorio=None: 'v1')
+    return CacheDisco(tmp_path / 'cache.sqlite')
+
+
+def test_guarda_e_reaproveita(cache):
+    chamadas = []
+
+    @em_disco('teste.soma', cache=cache)
+    def soma(a, b):
+        chamadas.append((a, b))
+        return a + b
+
+    assert soma(1, 2) == 3
+    assert soma(1, 2) == 3
+    assert chamadas == [(1, 2)]
+
+
+def test_entrada_ilegivel_e_apagada_e_recalculada(cache):
+    chamadas = []
+
+    @em_disco('teste.tabela', cache=cache)
+    def tabela(n):
+        chamadas.append(n)
+        return list(range(n))
+
+    # Como um pickle de uma classe que não existe mais depois de uma atualização de biblioteca
+    blob = pickle.dumps(object()).replace(b'builtins', b'modulo_removido')
+    chave_entrada = chave('teste.tabela', 'v1', (3,), codigo=tabela.versao_codigo)
+    cache._conexao().execute('INSERT INTO resultados VALUES (?, ?, ?, ?, ?, 0, NULL, 0)',
+                             (chave_entrada, 'teste.tabela', 'v1', blob, len(blob)))
+
+    assert tabela(3) == [0, 1, 2]
+    assert chamadas == [3]
+    # A entrada ilegível deu lugar ao resultado novo
+    assert cache.obter(chave_entrada) == (True, [0, 1, 2])
+
+
+def test_resultado_que_nao_se_serializa_nao_interrompe(cache):
+    @em_disco('teste.trava', cache=cache)
+    def cria_trava(nome):
+        return threading.Lock()
+
+    @em_disco('teste.local', cache=cache)
+    def cria_funcao(nome):
+        return lambda: nome
+
+    assert cria_trava('a') is not None
+    assert cria_funcao('b')() == 'b'
+    assert cache.estatisticas() == []
+
+
+def test_nova_versao_do_codigo_nao_serve_resultados_antigos(cache, tmp_path, monkeypatch):
+    # Módulo de que o cálculo depende, como dados.py com BINS_HORAS
+    (tmp_path / 'faixas_teste.py').write_text('LIMITES = [0, 20, 120]\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'faixas_teste', raising=False)
+    faixas_teste = importlib.import_module('faixas_teste')
+
+    def decorar(dependencias=(), versao=None):
+        @em_disco('teste.faixas', cache=cache, dependencias=dependencias, versao=versao)
+        def faixas(n):
+            return list(faixas_teste.LIMITES)
+        return faixas
+
+    assert decorar(dependencias=(faixas_teste,))(1) == [0, 20, 120]
+
+    # Deploy que muda o módulo: a entrada antiga (mesmo nome, argumentos e dados) não é servida
+    (tmp_path / 'faixas_teste.py').write_text('LIMITES = [0, 20, 121]\n')
+    faixas_teste = importlib.reload(faixas_teste)
+    assert decorar(dependencias=(faixas_teste,))(1) == [0, 20, 121]
+
+    # Mudança fora das dependências listadas: a versão explícita invalida
+    assert decorar().versao_codigo == decorar().versao_codigo
+    assert decorar().versao_codigo != decorar(versao='2').versao_codigo
+
+    # O fonte da função também entra na chave
+    @em_disco('teste.faixas', cache=cache)
+    def faixas(n):
+        return 'fonte novo'
+
+    assert faixas(1) == 'fonte novo'
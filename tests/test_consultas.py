@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+import consultas
+import dados
+import ingestao
+from dados_sinteticos import gerar, gravar_csv
+
+MOTORES = ['arrow', 'pandas', pytest.param('duckdb', marks=pytest.mark.skipif(
+    consultas.duckdb is None, reason="duckdb não instalado"))]
+
+CONSULTAS = [
+    (['Sexo'], {}),
+    (['Medicamento_Depressao'], {'Diagnostico_Depressao': 1}),
+    (['Violencia_Verbal', 'Diagnostico_Depressao'], {}),
+    (['Unidade_Federacao', 'Sexo'], {'Idade_Morador': (30, 39), 'Cor_Raca': [1, 4]}),
+]
+
+
+@pytest.fixture(scope='module')
+def armazem(tmp_path_factory):
+    """Armazém com duas partes em 2019 (lista de arquivos no read_parquet) e uma edição de 2013."""
+    base = tmp_path_factory.mktemp('consultas')
+    for nome, linhas, semente in (('inicial', 3000, 1), ('delta', 800, 2), ('pns2013', 1000, 3)):
+        gravar_csv(gerar(linhas, semente=semente), base / f'{nome}.csv')
+    ingestao.inicializar(base / 'inicial.csv', diretorio=base / 'armazem')
+    ingestao.anexar(base / 'delta.csv', diretorio=base / 'armazem')
+    ingestao.inicializar(base / 'pns2013.csv', edicao=2013, diretorio=base / 'armazem')
+    return base
+
+
+def _referencia(base, dimensoes, filtros, arquivos=('inicial', 'delta')):
+    """Contagem direta em pandas sobre os CSV de origem."""
+    df = pd.concat([pd.read_csv(base / f'{nome}.csv', sep=';') for nome in arquivos], ignore_index=True)
+    for coluna, valor in filtros.items():
+        if isinstance(valor, tuple):
+            df = df[df[coluna].between(*valor)]
+        elif isinstance(valor, list):
+            df = df[df[coluna].isin(valor)]
+        else:
+            df = df[df[coluna] == valor]
+    contagem = df.groupby(dimensoes).size().rename('Quantidade').reset_index()
+    return contagem.astype({dimensao: 'float64' for dimensao in dimensoes}).sort_values(dimensoes, ignore_index=True)
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+@pytest.mark.parametrize('dimensoes, filtros', CONSULTAS)
+def test_motores_iguais_a_referencia_no_armazem(armazem, motor, dimensoes, filtros):
+    resultado = consultas.contar(dimensoes, filtros, diretorio=armazem / 'armazem', motor=motor)
+    pd.testing.assert_frame_equal(resultado, _referencia(armazem, dimensoes, filtros))
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+def test_motores_iguais_entre_edicoes(armazem, motor):
+    resultado = consultas.contar(['Sexo'], edicoes=(2013, 2019), diretorio=armazem / 'armazem', motor=motor)
+    esperado = pd.concat([_referencia(armazem, ['Sexo'], {}, ('pns2013',)).assign(Edicao=2013),
+                          _referencia(armazem, ['Sexo'], {}).assign(Edicao=2019)], ignore_index=True)
+    pd.testing.assert_frame_equal(resultado, esperado[resultado.columns])
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+def test_motores_iguais_no_csv(armazem, motor, monkeypatch):
+    # Sem armazém, a consulta vai ao CSV original
+    gravar_csv(pd.read_csv(armazem / 'inicial.csv', sep=';'), armazem / 'original.csv')
+    monkeypatch.setattr(consultas, 'CAMINHO_CSV', armazem / 'original.csv')
+    monkeypatch.setattr('dados.CAMINHO_CSV', armazem / 'original.csv')
+    dimensoes, filtros = CONSULTAS[3]
+    resultado = consultas.contar(dimensoes, filtros, diretorio=armazem / 'sem_armazem', motor=motor)
+    pd.testing.assert_frame_equal(resultado, _referencia(armazem, dimensoes, filtros, ('inicial',)))
+
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+def test_consultas_das_paginas_iguais_ao_dataframe_em_memoria(armazem, motor):
+    """O que Fatores Associados e Tratamento e Saúde calculavam sobre ``dados.preparar``."""
+    diretorio = armazem / 'armazem'
+    df = dados.preparar(dados.carregar_dataset(diretorio=diretorio))
+    df_depressao = df[df['Diagnostico_Depressao'] == 'Sim']
+
+    violencia = consultas.depressao_por_violencia('Violencia_Verbal', diretorio=diretorio, motor=motor)
+    esperado = df.groupby('Violencia_Verbal')['Diagnostico_Depressao'].value_counts(normalize=True).unstack() * 100
+    pd.testing.assert_frame_equal(violencia[esperado.columns], esperado, check_names=False)
+
+    medias = consultas.media('Frequencia_Problemas_Sono', 'Violencia_Verbal', {'Violencia_Verbal': [1, 2]},
+                             diretorio=diretorio, motor=motor)
+    for grupo in (1, 2):
+        assert medias[grupo] == pytest.approx(df[df['Violencia_Verbal'] == grupo]['Frequencia_Problemas_Sono'].mean())
+
+    contagem = consultas.contar(['Medicamento_Depressao'], {'Diagnostico_Depressao': 1},
+                                diretorio=diretorio, motor=motor)
+    assert contagem.set_index('Medicamento_Depressao')['Quantidade'].to_dict() == \
+        df_depressao['Medicamento_Depressao'].value_counts().to_dict()
@@ -0,0 +1,38 @@
+import pandas as pd
+
+import dados
+from ingestao import inicializar
+
+
+def _extrato_2013():
+    """Extrato com os códigos IBGE de 2013, sem o módulo de violência (que só existe em 2019)."""
+    return pd.DataFrame({
+        'V0001': [29, 35, 53],
+        'C006': [1, 2, 2],
+        'C008': [34, 61, 19],
+        'C009': [2, 4, 1],
+        'Q092': [1, 2, 1],
+        'N010': [4, 1, 9],
+    })
+
+
+def test_codigos_de_2013_viram_o_esquema_comum():
+    df = dados.padronizar_colunas(_extrato_2013(), edicao=2013)
+    assert list(df.columns) == ['Unidade_Federacao', 'Sexo', 'Idade_Morador', 'Cor_Raca',
+                                'Diagnostico_Depressao', 'Frequencia_Problemas_Sono']
+    assert dados.validar_esquema(df) == []
+
+
+def test_categorias_de_2013_decodificadas(tmp_path):
+    caminho = tmp_path / 'pns2013.csv'
+    _extrato_2013().to_csv(caminho, sep=';', index=False)
+    inicializar(caminho, edicao=2013, diretorio=tmp_path / 'armazem')
+
+    df = dados.carregar_dataset(edicoes=(2013,), diretorio=tmp_path / 'armazem')
+    categorias = dados.ler_categorias()
+    assert df['Sexo'].map(categorias['Sexo']).tolist() == ['Homem', 'Mulher', 'Mulher']
+    assert df['Diagnostico_Depressao'].map(categorias['Diagnostico_Depressao']).tolist() == ['Sim', 'Não', 'Sim']
+    assert df['Frequencia_Problemas_Sono'].map(categorias['Frequencia_Problemas_Sono']).tolist() == [
+        'Quase todos dias', 'Nenhum dia', 'Ignorado']
+    assert df['Unidade_Federacao'].map(dados.ESTADOS).tolist() == ['Bahia', 'São Paulo', 'Distrito Federal']
+    assert 'Violencia_Verbal' not in df.columns
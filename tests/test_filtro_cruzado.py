@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+
+import dados
+import geografia
+from dados_sinteticos import gerar
+from filtro_cruzado import GRAFICOS, FiltroCruzado
+from indice_idade import IndiceIdade
+
+
+@pytest.fixture(scope='module')
+def df():
+    return dados.preparar(gerar(6000, semente=11))
+
+
+@pytest.fixture(scope='module')
+def indice(df):
+    return IndiceIdade(df)
+
+
+def _filtrar(df, idade_min, idade_max, selecoes, excluir):
+    mascara = df['Idade_Morador'].between(idade_min, idade_max)
+    for dimensao, valores in selecoes.items():
+        if dimensao != excluir:
+            mascara &= df[dimensao].isin(valores)
+    return df[mascara]
+
+
+def _como_dict(tabela, dimensao):
+    return tabela.set_index(dimensao)['Quantidade'].to_dict()
+
+
+@pytest.mark.parametrize('selecoes', [
+    {},
+    {'Cor_Raca': ['Parda']},
+    {'Sexo': ['Feminino'], 'Cor_Raca': ['Preta', 'Parda']},
+    {'Sexo': ['Masculino'], 'Unidade_Federacao': ['Bahia', 'São Paulo']},
+])
+def test_tabelas_iguais_ao_filtro_por_mascara(df, indice, selecoes):
+    filtro = FiltroCruzado()
+    for dimensao, valores in selecoes.items():
+        filtro.selecionar(dimensao, valores)
+    tabelas = filtro.tabelas(indice, 25, 54)
+    for grafico, dimensao in GRAFICOS.items():
+        # A seleção no próprio gráfico não o filtra
+        filtrado = _filtrar(df, 25, 54, selecoes, excluir=dimensao)
+        esperado = filtrado.loc[filtrado['Diagnostico_Depressao'] == 'Sim', dimensao].value_counts()
+        assert _como_dict(tabelas[grafico], dimensao) == esperado.to_dict()
+
+
+def test_niveis_iguais_ao_filtro_por_mascara(df, indice):
+    filtro = FiltroCruzado()
+    filtro.selecionar('Sexo', ['Feminino'])
+    filtro.selecionar('Unidade_Federacao', ['Ceará'])
+    filtro.tabelas(indice, 18, 65)
+    niveis = filtro.niveis(indice, 18, 65)
+
+    # Denominador: quem respondeu Sim ou Não (sem Ignorado nem ausentes)
+    filtrado = _filtrar(df, 18, 65, filtro.selecoes, excluir='Unidade_Federacao')
+    filtrado = filtrado[filtrado['Diagnostico_Depressao'].isin(['Sim', 'Não'])]
+    esperado = geografia.consolidar(pd.DataFrame({
+        'Total': filtrado['Unidade_Federacao'].value_counts(),
+        'Quantidade': filtrado.loc[filtrado['Diagnostico_Depressao'] == 'Sim', 'Unidade_Federacao'].value_counts(),
+    }).fillna(0).rename_axis('Estado').reset_index())
+    for nivel, chave in (('pais', 'Pais'), ('regiao', 'Regiao'), ('estado', 'Estado')):
+        obtido = niveis[nivel].set_index(chave).sort_index()
+        referencia = esperado[nivel].set_index(chave).sort_index()
+        for coluna in ('Quantidade', 'Total', 'Prevalencia'):
+            assert obtido[coluna].to_numpy(dtype=float) == pytest.approx(referencia[coluna].to_numpy(dtype=float))
+
+
+def test_alterados(indice):
+    filtro = FiltroCruzado()
+    filtro.tabelas(indice, 18, 65)
+    assert filtro.alterados == list(GRAFICOS)
+
+    # Nada mudou: nenhum gráfico é redesenhado
+    filtro.tabelas(indice, 18, 65)
+    assert filtro.alterados == []
+
+    # Seleção em um gráfico: ele muda o destaque, os outros mudam a tabela
+    anteriores = filtro.tabelas(indice, 18, 65)
+    filtro.selecionar('Cor_Raca', ['Parda'])
+    tabelas = filtro.tabelas(indice, 18, 65)
+    assert filtro.alterados == list(GRAFICOS)
+    assert tabelas['raca'] is anteriores['raca']
+
+    # Mesma seleção em outra ordem: nada a redesenhar
+    filtro.selecionar('Cor_Raca', ['Preta', 'Parda'])
+    filtro.tabelas(indice, 18, 65)
+    filtro.selecionar('Cor_Raca', ['Parda', 'Preta'])
+    filtro.tabelas(indice, 18, 65)
+    assert filtro.alterados == []
+
+    # Mudança da faixa de idade recalcula todos; limpar volta às tabelas sem filtro
+    filtro.tabelas(indice, 30, 40)
+    assert filtro.alterados == list(GRAFICOS)
+    filtro.limpar()
+    filtro.tabelas(indice, 30, 40)
+    assert filtro.alterados == list(GRAFICOS)
+
+
+def test_selecao_vazia_remove_o_filtro():
+    filtro = FiltroCruzado()
+    filtro.selecionar('Sexo', ['Masculino', 'Feminino'])
+    assert filtro.selecao('sexo') == ('Feminino', 'Masculino')
+    assert filtro.filtros('raca') == {'Sexo': ('Feminino', 'Masculino')}
+    assert filtro.filtros('sexo') == {}
+    filtro.selecionar('Sexo', [])
+    assert filtro.selecoes == {}
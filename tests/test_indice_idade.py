@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import dados
+from dados_sinteticos import gerar
+from indice_idade import IndiceIdade
+
+
+@pytest.fixture(scope='module')
+def df():
+    df = dados.preparar(gerar(8000, semente=5))
+    # Ausentes em dimensões e idades: entram nos totais, mas não nas tabelas
+    df.loc[::97, 'Cor_Raca'] = np.nan
+    df.loc[::113, 'Idade_Morador'] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def indice(df):
+    return IndiceIdade(df)
+
+
+def _contagem_direta(df, dimensao, idade_min, idade_max, **filtros):
+    mascara = df['Idade_Morador'].between(idade_min, idade_max)
+    for nome, valores in filtros.items():
+        mascara &= df[nome].isin(valores if isinstance(valores, list) else [valores])
+    return df.loc[mascara, dimensao].value_counts()
+
+
+@pytest.mark.parametrize('idade_min, idade_max', [(0, 130), (18, 29), (23, 41), (60, 60), (90, 130)])
+@pytest.mark.parametrize('dimensao', ['Sexo', 'Unidade_Federacao', 'Cor_Raca'])
+def test_tabela_igual_ao_filtro_por_mascara(df, indice, dimensao, idade_min, idade_max):
+    tabela = indice.tabela(dimensao, idade_min, idade_max, Diagnostico_Depressao='Sim')
+    esperado = _contagem_direta(df, dimensao, idade_min, idade_max, Diagnostico_Depressao='Sim')
+    assert tabela.set_index(dimensao)['Quantidade'].to_dict() == esperado.to_dict()
+
+
+def test_filtros_com_varios_valores(df, indice):
+    filtros = {'Cor_Raca': ['Parda', 'Preta'], 'Sexo': 'Feminino'}
+    tabela = indice.tabela('Unidade_Federacao', 30, 49, **filtros)
+    esperado = _contagem_direta(df, 'Unidade_Federacao', 30, 49, **filtros)
+    assert tabela.set_index('Unidade_Federacao')['Quantidade'].to_dict() == esperado.to_dict()
+
+
+def test_contar_inclui_ausentes_e_limites_fora_do_intervalo(df, indice):
+    assert indice.contar().sum() == df['Idade_Morador'].notna().sum()
+    assert indice.contar(-10, 500).sum() == indice.contar().sum()
+    assert indice.contar(40, 30).sum() == 0
+    assert indice.contar(45, 45).sum() == (df['Idade_Morador'] == 45).sum()
+    assert indice.tabela('Sexo', 200, 300).empty
+
+
+def test_valor_de_filtro_desconhecido_zera_a_tabela(indice):
+    assert indice.tabela('Sexo', Cor_Raca='Inexistente').empty
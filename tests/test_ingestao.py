@@ -0,0 +1,148 @@
+import importlib
+import sys
+
+import pandas as pd
+import pytest
+
+import ingestao
+from agregados import calcular_agregados, carregar_agregados
+from dados import ler_manifesto
+from dados_sinteticos import gerar, gravar_csv
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    caminhos = []
+    for semente, linhas in enumerate((3000, 400, 300)):
+        caminho = tmp_path / f"parte{semente}.csv"
+        gravar_csv(gerar(linhas, semente=semente), caminho)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def _totais(tabela):
+    return tabela.set_index('Diagnostico_Depressao')['Quantidade'].sort_index()
+
+
+def _arquivos_de_dados(armazem):
+    return sorted(str(p.relative_to(armazem)) for p in (armazem / 'dados').rglob('*.parquet'))
+
+
+def test_anexar_soma_partes_e_agregados(tmp_path, arquivos):
+    armazem = tmp_path / 'armazem'
+    ingestao.inicializar(arquivos[0], diretorio=armazem)
+    ingestao.anexar(arquivos[1], diretorio=armazem)
+
+    particao = ler_manifesto(armazem)['edicoes']['2019']
+    assert particao['linhas'] == 3400
+    assert _arquivos_de_dados(armazem) == sorted(particao['partes'])
+    completo = pd.concat([pd.read_parquet(armazem / parte) for parte in particao['partes']])
+    esperado = calcular_agregados(completo)['totais']
+    assert _totais(carregar_agregados(edicao=2019, diretorio=armazem)['totais']).equals(_totais(esperado))
+
+
+def test_anexar_rele_manifesto_depois_da_trava(tmp_path, arquivos, monkeypatch):
+    """Uma ingestão que termina enquanto outra lê o delta não é sobrescrita por ela."""
+    armazem = tmp_path / 'armazem'
+    ingestao.inicializar(arquivos[0], diretorio=armazem)
+    ler_arquivo = ingestao.ler_arquivo
+
+    def ler_com_concorrente(caminho, edicao):
+        if caminho == arquivos[2]:
+            monkeypatch.setattr(ingestao, 'ler_arquivo', ler_arquivo)
+            ingestao.anexar(arquivos[1], diretorio=armazem)
+        return ler_arquivo(caminho, edicao)
+
+    monkeypatch.setattr(ingestao, 'ler_arquivo', ler_com_concorrente)
+    ingestao.anexar(arquivos[2], diretorio=armazem)
+
+    manifesto = ler_manifesto(armazem)
+    particao = manifesto['edicoes']['2019']
+    assert manifesto['versao'] == 3
+    assert len(particao['partes']) == 3
+    assert particao['linhas'] == 3700
+    assert sum(len(pd.read_parquet(armazem / parte)) for parte in particao['partes']) == 3700
+    totais = carregar_agregados(['totais'], edicao=2019, diretorio=armazem)['totais']
+    assert totais['Quantidade'].sum() == 3700
+
+
+def test_inicializar_mantem_arquivos_antigos_ate_limpar(tmp_path, arquivos, monkeypatch):
+    armazem = tmp_path / 'armazem'
+    ingestao.inicializar(arquivos[0], diretorio=armazem)
+    ingestao.anexar(arquivos[1], diretorio=armazem)
+    antigas = ler_manifesto(armazem)['edicoes']['2019']['partes']
+
+    gravar_manifesto = ingestao.gravar_manifesto
+
+    def gravar_conferindo(manifesto, diretorio):
+        # No momento da troca, as partes antigas e as novas existem
+        assert all((armazem / parte).exists() for parte in antigas)
+        assert all((armazem / parte).exists() for parte in manifesto['edicoes']['2019']['partes'])
+        gravar_manifesto(manifesto, diretorio)
+
+    monkeypatch.setattr(ingestao, 'gravar_manifesto', gravar_conferindo)
+    ingestao.inicializar(arquivos[2], diretorio=armazem)
+
+    manifesto = ler_manifesto(armazem)
+    particao = manifesto['edicoes']['2019']
+    assert particao['linhas'] == 300
+    # Um leitor que ainda usa o manifesto anterior encontra as partes antigas
+    assert _arquivos_de_dados(armazem) == sorted(antigas + particao['partes'])
+    assert sorted(p for obsoleto in manifesto['obsoletos'] for p in obsoleto['partes']) == antigas
+
+    # Dentro da carência, limpar não apaga nada
+    assert ingestao.limpar(armazem) == []
+    assert len(_arquivos_de_dados(armazem)) == 3
+
+    assert len(ingestao.limpar(armazem, carencia=0)) == 2
+    assert ler_manifesto(armazem)['obsoletos'] == []
+    assert _arquivos_de_dados(armazem) == particao['partes']
+    agregados = sorted(p.parent.name for p in (armazem / 'agregados').rglob('totais.parquet'))
+    assert agregados == [particao['agregados'].rsplit('/', 1)[-1]]
+
+
+def test_ingestao_apaga_obsoletos_vencidos(tmp_path, arquivos, monkeypatch):
+    armazem = tmp_path / 'armazem'
+    monkeypatch.setattr(ingestao, 'CARENCIA_LIMPEZA', 0)
+    ingestao.inicializar(arquivos[0], diretorio=armazem)
+    ingestao.anexar(arquivos[1], diretorio=armazem)
+    ingestao.anexar(arquivos[2], diretorio=armazem)
+
+    manifesto = ler_manifesto(armazem)
+    particao = manifesto['edicoes']['2019']
+    assert manifesto['obsoletos'] == []
+    assert _arquivos_de_dados(armazem) == sorted(particao['partes'])
+    agregados = sorted(p.parent.name for p in (armazem / 'agregados').rglob('totais.parquet'))
+    assert agregados == [particao['agregados'].rsplit('/', 1)[-1]]
+
+
+def test_trava_ocupada_e_trava_abandonada(tmp_path, arquivos):
+    fcntl = pytest.importorskip('fcntl')
+    armazem = tmp_path / 'armazem'
+    ingestao.inicializar(arquivos[0], diretorio=armazem)
+
+    with open(armazem / '.ingestao.lock', 'a+') as outro_processo:
+        fcntl.flock(outro_processo, fcntl.LOCK_EX)
+        with pytest.raises(ingestao.ErroIngestao):
+            ingestao.anexar(arquivos[1], diretorio=armazem)
+
+    # Arquivo de trava deixado por um processo que caiu: sem flock, não bloqueia
+    (armazem / '.ingestao.lock').write_text('999999')
+    assert ingestao.anexar(arquivos[1], diretorio=armazem) == 400
+
+
+def test_modulos_importam_sem_fcntl(tmp_path, monkeypatch):
+    # Como no Windows: o dashboard importa compartilhado; as ferramentas de ingestão recusam rodar
+    monkeypatch.setitem(sys.modules, 'fcntl', None)
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    for nome in ('compartilhado', 'ingestao', 'agregacao_streaming'):
+        monkeypatch.delitem(sys.modules, nome, raising=False)
+    compartilhado = importlib.import_module('compartilhado')
+    sem_trava = importlib.import_module('ingestao')
+    importlib.import_module('agregacao_streaming')
+
+    with compartilhado._trava(1, tmp_path):
+        pass
+    with pytest.raises(sem_trava.ErroIngestao, match='fcntl'):
+        with sem_trava.trava(tmp_path):
+            pass
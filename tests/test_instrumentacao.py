@@ -0,0 +1,23 @@
+import pytest
+
+import instrumentacao
+from instrumentacao import secao
+
+
+class Interrompida(Exception):
+    """Como o StopException/RerunException do Streamlit: sai do meio do script."""
+
+
+def test_secao_encerrada_em_interrupcao_nao_deixa_profundidade():
+    with pytest.raises(Interrompida):
+        with secao('teste pagina'):
+            with secao('teste interna'):
+                raise Interrompida
+
+    assert instrumentacao._profundidade.get() == 0
+    # A próxima seção volta a ser a externa (a que zera o pico do tracemalloc)
+    with secao('teste seguinte') as seguinte:
+        assert seguinte._externa
+    estatisticas = instrumentacao._estatisticas
+    assert estatisticas['teste pagina']['execucoes'] >= 1
+    assert estatisticas['teste interna']['execucoes'] >= 1
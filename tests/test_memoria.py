@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import memoria
+
+
+def _coluna_arrow(tamanho):
+    return pd.Series(pd.arrays.ArrowExtensionArray(pa.chunked_array([np.arange(tamanho, dtype='float64')])))
+
+
+def test_duplicatas_distinguem_buffers_arrow_compartilhados_de_copias():
+    original = _coluna_arrow(20_000)
+    # Mesmo ChunkedArray em outro DataFrame (como o conjunto mapeado por compartilhado.py) e uma cópia real
+    mesma_memoria = pd.Series(pd.arrays.ArrowExtensionArray(original.array.__arrow_array__()))
+    copia = _coluna_arrow(20_000)
+
+    grupos = memoria.duplicatas({'a': pd.DataFrame({'x': original}), 'b': pd.DataFrame({'x': mesma_memoria})},
+                                minimo_bytes=0)
+    assert [g['memoria_compartilhada'] for g in grupos] == [True]
+
+    grupos = memoria.duplicatas({'a': pd.DataFrame({'x': original}), 'b': pd.DataFrame({'x': copia})},
+                                minimo_bytes=0)
+    assert [g['memoria_compartilhada'] for g in grupos] == [False]
+
+
+def test_duplicatas_com_visao_numpy():
+    valores = np.arange(20_000, dtype='float64')
+    visao = pd.Series(valores, name='x', copy=False)
+    grupos = memoria.duplicatas({'a': visao, 'b': pd.Series(valores, name='x', copy=False)}, minimo_bytes=0)
+    assert [g['memoria_compartilhada'] for g in grupos] == [True]
+    assert memoria._compartilham(visao, visao[10:])
+
+    grupos = memoria.duplicatas({'a': visao, 'c': pd.Series(valores.copy(), name='x')}, minimo_bytes=0)
+    assert [g['memoria_compartilhada'] for g in grupos] == [False]
+
+
+def test_objetos_em_cache_vem_dos_registros_do_streamlit():
+    from streamlit.testing.v1 import AppTest
+
+    def pagina():
+        import pandas as pd
+        import streamlit as st
+
+        @st.cache_resource
+        def recurso_de_teste_memoria():
+            return pd.DataFrame({'x': range(10)})
+
+        @st.cache_data
+        def dados_de_teste_memoria(n):
+            return list(range(n))
+
+        recurso_de_teste_memoria()
+        dados_de_teste_memoria(3)
+        st.session_state.objeto_de_teste_memoria = {'tabela': pd.Series(range(5))}
+        st.session_state.escalar_de_teste_memoria = 1
+
+    app = AppTest.from_function(pagina)
+    app.run()
+    objetos = memoria.objetos_em_cache(app)
+
+    assert objetos['recurso_de_teste_memoria'][0] == 'st.cache_resource'
+    assert objetos['recurso_de_teste_memoria'][1].equals(pd.DataFrame({'x': range(10)}))
+    assert objetos['dados_de_teste_memoria'] == ('st.cache_data', [0, 1, 2])
+    assert objetos['session_state.objeto_de_teste_memoria'][0] == 'session_state'
+    assert 'session_state.escalar_de_teste_memoria' not in objetos
@@ -0,0 +1,33 @@
+import asyncio
+
+import numpy as np
+
+from modelo import VARIAVEIS_SINTOMAS
+from servico_predicao import ServicoPredicao
+
+
+class ModeloFixo:
+    """Probabilidade da classe 1 = fração de sintomas presentes."""
+    classes_ = np.array([1, 2])
+
+    def predict_proba(self, X):
+        positiva = X.to_numpy().mean(axis=1)
+        return np.column_stack([positiva, 1 - positiva])
+
+
+def test_lotes_contados_sem_guardar_cada_tamanho():
+    respostas = [{sintoma: 1 + (i + j) % 2 for j, sintoma in enumerate(VARIAVEIS_SINTOMAS)} for i in range(50)]
+
+    async def rodar():
+        async with ServicoPredicao(ModeloFixo(), max_lote=8, espera_max=0.01) as servico:
+            probabilidades = await asyncio.gather(*(servico.prever(resposta) for resposta in respostas))
+        return servico, probabilidades
+
+    servico, probabilidades = asyncio.run(rodar())
+    esperadas = [np.mean([valor - 1 for valor in resposta.values()]) for resposta in respostas]
+    assert probabilidades == esperadas
+    assert servico.linhas == 50
+    assert servico.maior_lote == 8
+    assert 50 / 8 <= servico.lotes < 50
+    assert servico.lote_medio == 50 / servico.lotes
+    assert not hasattr(servico, 'tamanhos_lote')
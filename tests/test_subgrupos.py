@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from subgrupos import analisar_subgrupos, metricas_grupos
+
+
+@pytest.fixture
+def predicoes():
+    rng = np.random.default_rng(0)
+    n = 2000
+    grupos = pd.DataFrame({
+        'Sexo': rng.choice(['Masculino', 'Feminino'], n),
+        'Cor_Raca': rng.choice(['Branca', 'Parda', 'Preta', None], n),
+    })
+    reais = rng.random(n) < 0.2
+    # Scores arredondados para haver empates dentro dos grupos
+    scores = np.round(np.clip(reais * 0.3 + rng.random(n) * 0.7, 0, 1), 2)
+    previstos = scores > 0.5
+    return grupos, scores, reais, previstos
+
+
+def test_metricas_grupos_iguais_ao_sklearn(predicoes):
+    grupos, scores, reais, previstos = predicoes
+    codigos = (grupos['Sexo'] == 'Feminino').to_numpy(dtype=int)
+    tabela = metricas_grupos(codigos, scores, reais, previstos, 2)
+    for codigo in (0, 1):
+        no_grupo = codigos == codigo
+        assert tabela.loc[codigo, 'auc'] == pytest.approx(roc_auc_score(reais[no_grupo], scores[no_grupo]))
+        assert tabela.loc[codigo, 'n'] == no_grupo.sum()
+        assert tabela.loc[codigo, 'tpr'] == pytest.approx(previstos[no_grupo & reais].mean())
+        assert tabela.loc[codigo, 'fpr'] == pytest.approx(previstos[no_grupo & ~reais].mean())
+
+
+def test_analisar_subgrupos_iguais_ao_laco_por_grupo(predicoes):
+    grupos, scores, reais, previstos = predicoes
+    agrupamentos = {'Sexo': ['Sexo'], 'Sexo x Raca': ['Sexo', 'Cor_Raca']}
+    resultado = analisar_subgrupos(grupos, scores, reais, previstos, agrupamentos)
+
+    for nome, colunas in agrupamentos.items():
+        tabela = resultado[nome].set_index(colunas)
+        # Linhas com a raça ausente ficam de fora, como no groupby
+        esperados = grupos.dropna(subset=colunas).groupby(colunas)
+        assert len(tabela) == esperados.ngroups
+        for chave, parte in esperados:
+            indices = parte.index.to_numpy()
+            linha = tabela.loc[chave if len(colunas) > 1 else chave[0]]
+            assert linha['n'] == len(indices)
+            assert linha['auc'] == pytest.approx(roc_auc_score(reais[indices], scores[indices]))
+            assert linha['acuracia'] == pytest.approx((previstos[indices] == reais[indices]).mean())
+
+
+def test_grupo_com_uma_classe_tem_auc_nula():
+    tabela = metricas_grupos([0, 0, 1, 1], [0.1, 0.9, 0.2, 0.8], [True, False, False, False],
+                             [False, True, False, True], 2)
+    assert tabela.loc[0, 'auc'] == 0.0
+    assert np.isnan(tabela.loc[1, 'auc'])
+    assert np.isnan(tabela.loc[1, 'tpr'])